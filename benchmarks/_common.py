@@ -0,0 +1,97 @@
+""" Shared helpers for running the benchmarks outside of the editor """
+
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Optional,
+)
+from unittest.mock import MagicMock
+import argparse
+import json
+import platform
+import sys
+import time
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+PYTHON_DIR = ROOT_DIR / "plugin_src" / "PyCharmDebug" / "Content" / "Python"
+
+
+def install_mock_unreal() -> MagicMock:
+    """Install a mocked unreal module, mirroring tests/unit/conftest.py, and
+    make the plugin package importable
+
+    Returns:
+        MagicMock: The mocked unreal module
+    """
+    unreal_mock = MagicMock()
+    sys.modules["unreal"] = unreal_mock
+    if PYTHON_DIR.as_posix() not in sys.path:
+        sys.path.insert(0, PYTHON_DIR.as_posix())
+    return unreal_mock
+
+
+def measure(
+    func: Callable[[], Any], repeat: int = 5, number: int = 1
+) -> Dict[str, float]:
+    """Time a callable
+
+    Args:
+        func (Callable): The callable to time
+        repeat (int): Number of timing samples, defaults to 5
+        number (int): Calls per sample, defaults to 1
+
+    Returns:
+        dict: best and mean wall time per call in seconds
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+
+    return {"best": min(samples), "mean": sum(samples) / len(samples)}
+
+
+def parse_args(description: str) -> argparse.Namespace:
+    """Parse the command line options shared by the benchmarks
+
+    Args:
+        description (str): Benchmark description for --help
+
+    Returns:
+        argparse.Namespace: output (path or None) and repeat
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--output", help="also write the JSON results to this file", default=None
+    )
+    parser.add_argument(
+        "--repeat", help="timing samples per measurement", type=int, default=5
+    )
+    return parser.parse_args()
+
+
+def report(name: str, results: Dict[str, Any], output: Optional[str] = None) -> None:
+    """Print benchmark results as a single JSON document
+
+    Args:
+        name (str): Benchmark name
+        results (dict): Benchmark results
+        output (str): Path to also write the document to, defaults to None
+    """
+    document = {
+        "benchmark": name,
+        "timestamp": time.time(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+    serialized = json.dumps(document, indent=4)
+    print(serialized)
+
+    if output is not None:
+        Path(output).write_text(serialized + "\n", encoding="utf-8")
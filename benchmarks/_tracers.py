@@ -0,0 +1,81 @@
+""" Stand-in debugger hooks, attached the way the plugin's backends attach """
+
+from contextlib import contextmanager
+from types import (
+    CodeType,
+    FrameType,
+)
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    Optional,
+    Set,
+)
+import sys
+
+
+TraceFunction = Callable[[FrameType, str, Any], Any]
+
+
+def line_tracer(frame: FrameType, event: str, arg: Any) -> Any:
+    """Trace every line, the cost of a frame the debugger steps through"""
+    return line_tracer
+
+
+def breakpoint_tracer(breakpoint_files: Set[str]) -> TraceFunction:
+    """Only trace frames of files with breakpoints, like pydevd does
+
+    Args:
+        breakpoint_files (set): File names with breakpoints
+    """
+
+    def tracer(frame: FrameType, event: str, arg: Any) -> Any:
+        if frame.f_code.co_filename in breakpoint_files:
+            return line_tracer
+        return None
+
+    return tracer
+
+
+@contextmanager
+def settrace_attached(trace_function: Optional[TraceFunction]) -> Iterator[None]:
+    """Run a block with a global trace function installed
+
+    Args:
+        trace_function (Callable): The trace function, None runs detached
+    """
+    previous = sys.gettrace()
+    sys.settrace(trace_function)
+    try:
+        yield
+    finally:
+        sys.settrace(previous)
+
+
+@contextmanager
+def monitoring_attached(breakpoint_files: Set[str]) -> Iterator[None]:
+    """Run a block with a sys.monitoring tool that disables its events for
+    every code object without breakpoints
+
+    Args:
+        breakpoint_files (set): File names with breakpoints
+    """
+    monitoring = sys.monitoring  # type: ignore[attr-defined]
+    tool_id = monitoring.DEBUGGER_ID
+
+    def on_start(code: CodeType, offset: int) -> Any:
+        if code.co_filename in breakpoint_files:
+            return None
+        return monitoring.DISABLE  # never called again for this code object
+
+    monitoring.use_tool_id(tool_id, "pycharmdebug_benchmarks")
+    monitoring.register_callback(tool_id, monitoring.events.PY_START, on_start)
+    monitoring.set_events(tool_id, monitoring.events.PY_START)
+    try:
+        yield
+    finally:
+        monitoring.set_events(tool_id, 0)
+        monitoring.register_callback(tool_id, monitoring.events.PY_START, None)
+        monitoring.free_tool_id(tool_id)
+        monitoring.restart_events()
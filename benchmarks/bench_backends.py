@@ -0,0 +1,72 @@
+""" Cost of an attached debugger with no breakpoints in the running code,
+sys.settrace hook vs PEP 669 sys.monitoring (Python 3.12+) """
+
+from _common import (
+    install_mock_unreal,
+    measure,
+    parse_args,
+    report,
+)
+from _tracers import (
+    breakpoint_tracer,
+    monitoring_attached,
+    settrace_attached,
+)
+
+
+CALLS = 200_000
+BREAKPOINT_FILES = {"/not/the/benchmark.py"}
+
+
+def work(value: int) -> int:
+    return value * 2 + 1
+
+
+def workload() -> None:
+    total = 0
+    for index in range(CALLS):
+        total += work(index)
+
+
+def run_settrace() -> None:
+    with settrace_attached(breakpoint_tracer(BREAKPOINT_FILES)):
+        workload()
+
+
+def run_monitoring() -> None:
+    with monitoring_attached(BREAKPOINT_FILES):
+        workload()
+
+
+def main() -> None:
+    args = parse_args(__doc__)
+    install_mock_unreal()
+
+    from pycharmdebug.backends import (
+        BACKEND_MONITORING,
+        BACKEND_SETTRACE,
+        resolve_backend,
+        supports_monitoring,
+    )
+
+    detached = measure(workload, repeat=args.repeat)
+    results = {
+        "calls": CALLS,
+        "auto_backend": resolve_backend("auto"),
+        "detached": detached,
+        BACKEND_SETTRACE: measure(run_settrace, repeat=args.repeat),
+        BACKEND_MONITORING: (
+            measure(run_monitoring, repeat=args.repeat)
+            if supports_monitoring()
+            else None
+        ),
+    }
+    for backend in (BACKEND_SETTRACE, BACKEND_MONITORING):
+        if results[backend] is not None:
+            results[f"{backend}_overhead"] = results[backend]["best"] / detached["best"]
+
+    report("backends", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+""" Repeated config lookups, cold (re-parsed on every call) vs cached, with
+the file opens and stat calls the cached lookups still make """
+
+from pathlib import Path
+from unittest.mock import patch
+import builtins
+import json
+import os
+import tempfile
+
+from _common import (
+    install_mock_unreal,
+    measure,
+    parse_args,
+    report,
+)
+
+
+LOOKUPS = 1000
+
+
+def main() -> None:
+    args = parse_args(__doc__)
+    unreal_mock = install_mock_unreal()
+
+    from pycharmdebug import utils
+
+    with tempfile.TemporaryDirectory() as plugin_root:
+        config = Path(plugin_root, utils.RELATIVE_CONFIG_PATH)
+        config.parent.mkdir(parents=True)
+        config.write_text(
+            json.dumps({"port_number": 5678, "debug_egg": ""}), encoding="utf-8"
+        )
+        plugin_library = unreal_mock.PluginBlueprintLibrary
+        plugin_library.get_plugin_base_dir.return_value = plugin_root
+
+        def lookups() -> None:
+            for _ in range(LOOKUPS):
+                utils.get_debug_port()
+                utils.get_debug_egg()
+
+        def cold_lookups() -> None:
+            for _ in range(LOOKUPS):
+                utils.clear_caches()
+                utils.get_debug_port()
+                utils.clear_caches()
+                utils.get_debug_egg()
+
+        cold = measure(cold_lookups, repeat=args.repeat)
+        utils.clear_caches()
+        cached = measure(lookups, repeat=args.repeat)
+
+        with patch.object(
+            builtins, "open", wraps=builtins.open
+        ) as spy_open, patch.object(os, "stat", wraps=os.stat) as spy_stat:
+            lookups()
+
+        report(
+            "config_store",
+            {
+                "lookups": LOOKUPS * 2,
+                "cold": cold,
+                "cached": cached,
+                "speedup": cold["best"] / cached["best"],
+                "file_opens_when_cached": spy_open.call_count,
+                # the cache is revalidated with a stat per settings layer
+                "stats_when_cached": spy_stat.call_count,
+                "stats_per_lookup": spy_stat.call_count / (LOOKUPS * 2),
+            },
+            args.output,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+""" Debugger overhead per workload, detached vs every trace mode the plugin
+offers, written as JSON for tracking regressions over time """
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+)
+
+from _common import (
+    install_mock_unreal,
+    measure,
+    parse_args,
+    report,
+)
+from _tracers import (
+    breakpoint_tracer,
+    line_tracer,
+    monitoring_attached,
+    settrace_attached,
+)
+import workloads
+
+
+def main() -> None:
+    args = parse_args(__doc__)
+    install_mock_unreal()
+
+    from pycharmdebug.backends import supports_monitoring
+
+    # the code under investigation lives elsewhere
+    other_file = "/project/Content/Python/mytools/other.py"
+
+    modes: Dict[str, Callable[[Callable[[], Any]], Any]] = {
+        "detached": lambda run: run(),
+        "settrace": lambda run: _traced(line_tracer, run),
+        "settrace_no_breakpoints": lambda run: _traced(
+            breakpoint_tracer({other_file}), run
+        ),
+    }
+    if supports_monitoring():
+        modes["sys_monitoring_no_breakpoints"] = lambda run: _monitored(
+            {other_file}, run
+        )
+
+    results: Dict[str, Any] = {}
+    for workload_name, workload in workloads.WORKLOADS.items():
+        timings = {
+            mode_name: measure(lambda: mode(workload), repeat=args.repeat)
+            for mode_name, mode in modes.items()
+        }
+        detached = timings["detached"]["best"]
+        for timing in timings.values():
+            timing["overhead"] = timing["best"] / detached
+        results[workload_name] = timings
+
+    report("overhead", results, args.output)
+
+
+def _traced(trace_function: Callable, run: Callable[[], Any]) -> Any:
+    with settrace_attached(trace_function):
+        return run()
+
+
+def _monitored(breakpoint_files: set, run: Callable[[], Any]) -> Any:
+    with monitoring_attached(breakpoint_files):
+        return run()
+
+
+if __name__ == "__main__":
+    main()
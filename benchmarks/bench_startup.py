@@ -0,0 +1,71 @@
+""" Editor startup cost of the plugin, running init_unreal.py the way the
+editor does (menu, exception hooks, watchdog and auto-attach), plus the menu
+install alone, lazy vs eager """
+
+from typing import (
+    Any,
+    Dict,
+)
+import runpy
+import sys
+import threading
+
+from _common import (
+    PYTHON_DIR,
+    install_mock_unreal,
+    measure,
+    parse_args,
+    report,
+)
+
+
+class ToolMenuEntryScript:
+    def __init__(self) -> None:
+        self.data = type("Data", (), {"advanced": type("Advanced", (), {})()})()
+
+
+def unload_plugin() -> None:
+    for name in [name for name in sys.modules if name.split(".")[0] == "pycharmdebug"]:
+        del sys.modules[name]
+
+
+def run_init_unreal() -> None:
+    unload_plugin()
+    runpy.run_path((PYTHON_DIR / "init_unreal.py").as_posix(), run_name="__main__")
+    # a fresh import would otherwise chain onto the previous run's hooks
+    sys.excepthook = sys.__excepthook__
+    threading.excepthook = threading.__excepthook__
+
+
+def startup(lazy: bool) -> None:
+    unload_plugin()
+    from pycharmdebug.menu import install
+
+    install(lazy=lazy)
+
+
+def main() -> None:
+    args = parse_args(__doc__)
+    unreal_mock = install_mock_unreal()
+    # real classes, so constructing an action costs what the Python side costs
+    unreal_mock.uclass.return_value = lambda cls: cls
+    unreal_mock.ufunction.return_value = lambda func: func
+    unreal_mock.ToolMenuEntryScript = ToolMenuEntryScript
+
+    results: Dict[str, Any] = {}
+    results["init_unreal"] = measure(run_init_unreal, repeat=args.repeat * 4)
+    results["init_unreal"]["modules_imported"] = sorted(
+        name for name in sys.modules if name.split(".")[0] == "pycharmdebug"
+    )
+    for mode, lazy in (("lazy", True), ("eager", False)):
+        results[mode] = measure(lambda: startup(lazy), repeat=args.repeat * 4)
+        results[mode]["modules_imported"] = sorted(
+            name for name in sys.modules if name.split(".")[0] == "pycharmdebug"
+        )
+    results["speedup"] = results["eager"]["best"] / results["lazy"]["best"]
+
+    report("startup", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
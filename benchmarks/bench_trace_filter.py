@@ -0,0 +1,82 @@
+""" Cost of pydevd's exclude filter lookup for the plugin's translated
+trace_include/trace_exclude patterns, per file pydevd decides on. Needs pydevd
+importable, e.g. from PYTHONPATH pointing at a debug egg with
+_pydevd_bundle.pydevd_filtering """
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+)
+import sys
+
+from _common import (
+    install_mock_unreal,
+    measure,
+    parse_args,
+    report,
+)
+
+
+# (filename, module) pairs pydevd decides on while an editor tool runs
+FRAMES: List[Tuple[str, str]] = [
+    ("/project/Content/Python/mytools/assets.py", "mytools.assets"),
+    ("/project/Content/Python/mytools/ui/widgets.py", "mytools.ui.widgets"),
+    ("/engine/Plugins/Python/unreal_helpers.py", "unreal_helpers"),
+    ("/python/Lib/site-packages/requests/api.py", "requests.api"),
+    ("/python/Lib/site-packages/requests/adapters/ssl.py", "requests.adapters.ssl"),
+    ("/python/Lib/json/decoder.py", "json.decoder"),
+]
+FILTERS = {
+    "exclude": {"exclude": ["unreal_helpers", "*/site-packages/*", "*/Lib/*"]},
+    "include": {"include": ["mytools.*", "*/MyTools/*.py"]},
+    "include_exclude": {
+        "include": ["mytools.*"],
+        "exclude": ["mytools.ui.*", "*/site-packages/*"],
+    },
+}
+
+
+def main() -> None:
+    args = parse_args(__doc__)
+    install_mock_unreal()
+
+    try:
+        from _pydevd_bundle.pydevd_filtering import (
+            ExcludeFilter,
+            FilesFiltering,
+        )
+    except ImportError:
+        sys.exit("pydevd with _pydevd_bundle.pydevd_filtering is not importable")
+
+    from pycharmdebug.trace_filter import TraceFilter
+
+    results: Dict[str, Any] = {"frames": len(FRAMES)}
+    for name, patterns in FILTERS.items():
+        pydevd_filters = TraceFilter(**patterns).to_pydevd_filters()
+        files_filtering = FilesFiltering()
+        files_filtering.set_exclude_filters(
+            [ExcludeFilter(*pydevd_filter) for pydevd_filter in pydevd_filters]
+        )
+
+        def lookups(files_filtering: Any = files_filtering) -> None:
+            for filename, module in FRAMES:
+                files_filtering.exclude_by_filter(filename, module)
+
+        timing = measure(lookups, repeat=args.repeat, number=1000)
+        timing["per_lookup"] = timing["best"] / len(FRAMES)
+        results[name] = {
+            "filters": pydevd_filters,
+            "excluded": {
+                filename: files_filtering.exclude_by_filter(filename, module)
+                for filename, module in FRAMES
+            },
+            **timing,
+        }
+
+    report("trace_filter", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
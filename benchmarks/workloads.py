@@ -0,0 +1,65 @@
+""" Workloads shaped like typical editor Python: asset loops, small helper
+calls, generator pipelines and exception driven control flow """
+
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+)
+
+
+SIZE = 50_000
+
+
+def tight_loop() -> int:
+    total = 0
+    for index in range(SIZE * 4):
+        total += index % 7
+    return total
+
+
+def _asset_name(index: int) -> str:
+    return f"SM_Asset_{index}"
+
+
+def _is_valid(name: str) -> bool:
+    return name.endswith(("0", "2", "4", "6", "8"))
+
+
+def small_calls() -> int:
+    return sum(1 for index in range(SIZE) if _is_valid(_asset_name(index)))
+
+
+def _scan_assets() -> Iterator[str]:
+    for index in range(SIZE):
+        yield _asset_name(index)
+
+
+def _only_valid(names: Iterator[str]) -> Iterator[str]:
+    for name in names:
+        if _is_valid(name):
+            yield name
+
+
+def generators() -> int:
+    return sum(1 for _ in _only_valid(_scan_assets()))
+
+
+def _lookup(table: Dict[int, int], key: int) -> int:
+    try:
+        return table[key]
+    except KeyError:
+        return -1
+
+
+def exceptions() -> int:
+    table = {index: index for index in range(0, SIZE, 2)}
+    return sum(_lookup(table, index) for index in range(SIZE))
+
+
+WORKLOADS: Dict[str, Callable[[], int]] = {
+    "tight_loop": tight_loop,
+    "small_calls": small_calls,
+    "generators": generators,
+    "exceptions": exceptions,
+}
@@ -1,8 +1,15 @@
 """ Plugin initialization script """
 
 try:
+    from pycharmdebug.excepthook import install as install_excepthook  # type: ignore
+    from pycharmdebug.headless import auto_attach  # type: ignore
     from pycharmdebug.menu import install  # type: ignore
+    from pycharmdebug.watchdog import install as install_watchdog  # type: ignore
 
     install()
+    install_excepthook()
+    install_watchdog()
+    # last, a strict auto-attach that fails raises once the menu is installed
+    auto_attach()
 except ImportError:
     pass
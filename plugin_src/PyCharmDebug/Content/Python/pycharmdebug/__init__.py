@@ -0,0 +1,16 @@
+from .breakpoints import (  # pylint: disable=redefined-builtin
+    breakpoint,
+    set_breakpoints_enabled,
+)
+from .excepthook import post_mortem
+from .threads import trace_threads
+from .tracing import traced
+
+
+__all__ = [
+    "breakpoint",
+    "post_mortem",
+    "set_breakpoints_enabled",
+    "trace_threads",
+    "traced",
+]
@@ -1,10 +1,55 @@
-from .connect import PyCharmDebugConnect
-from .disconnect import PyCharmDebugDisconnect
-from .config import PyCharmDebugConfig
+from importlib import import_module
+from typing import (
+    TYPE_CHECKING,
+    Any,
+)
+
+if TYPE_CHECKING:
+    from .connect import PyCharmDebugConnect
+    from .disconnect import PyCharmDebugDisconnect
+    from .config import PyCharmDebugConfig
+    from .memory import (
+        PyCharmDebugMemorySnapshot,
+        PyCharmDebugMemoryStart,
+        PyCharmDebugMemoryStop,
+    )
+    from .profile import (
+        PyCharmDebugProfileStart,
+        PyCharmDebugProfileStop,
+    )
+    from .threads import PyCharmDebugTraceThreads
+
+
+# actions are imported on first access, keeping editor startup cheap
+_ACTION_MODULES = {
+    "PyCharmDebugConnect": "connect",
+    "PyCharmDebugDisconnect": "disconnect",
+    "PyCharmDebugConfig": "config",
+    "PyCharmDebugTraceThreads": "threads",
+    "PyCharmDebugProfileStart": "profile",
+    "PyCharmDebugProfileStop": "profile",
+    "PyCharmDebugMemoryStart": "memory",
+    "PyCharmDebugMemorySnapshot": "memory",
+    "PyCharmDebugMemoryStop": "memory",
+}
 
 
 __all__ = [
     "PyCharmDebugConnect",
     "PyCharmDebugDisconnect",
     "PyCharmDebugConfig",
+    "PyCharmDebugTraceThreads",
+    "PyCharmDebugProfileStart",
+    "PyCharmDebugProfileStop",
+    "PyCharmDebugMemoryStart",
+    "PyCharmDebugMemorySnapshot",
+    "PyCharmDebugMemoryStop",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _ACTION_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(import_module(f".{module}", __name__), name)
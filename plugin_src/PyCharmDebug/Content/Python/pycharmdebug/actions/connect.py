@@ -1,10 +1,35 @@
-import sys
+from typing import (
+    Any,
+    Optional,
+)
+import threading
+import zipfile
 
 import unreal
 
+from .. import children
+from ..child import ChildConfig
+from ..connection import (
+    connect_async,
+    log_latency,
+    probe_server,
+)
+from ..egg_cache import prepare_egg
+from ..exceptions import PyCharmDebugRuntimeError
+from ..metrics import (
+    format_timings,
+    timed,
+)
+from ..session import SESSION
+from ..supervisor import SUPERVISOR
 from ..utils import (
     get_debug_egg,
+    get_debug_host,
     get_debug_port,
+    get_output_settings,
+    get_settings,
+    get_thread_selection,
+    get_trace_filter,
 )
 
 
@@ -12,7 +37,6 @@ ACTION_NAME = "start_debugger"
 ACTION_LABEL = "Connect"
 ICON_STYLE = "EditorStyle"
 ICON_NAME = "Sequencer.IconKeyBreak"
-HOST = "localhost"
 
 
 @unreal.uclass()
@@ -31,27 +55,122 @@ class PyCharmDebugConnect(unreal.ToolMenuEntryScript):
     def execute(
         self, context: unreal.ToolMenuContext  # pylint: disable=(unused-argument)
     ) -> None:
-        """Connect to the PyCharm debugger, via the port specified in
-        Resources/config.json
+        """Connect to the PyCharm debugger, via the host and port specified
+        in Config/tool_config.json. With connect_async enabled the editor keeps
+        running while waiting for the debug server.
 
         Args:
             context (unreal.ToolMenuContext): ToolMenuContext context object
         """
+        if SESSION.active:
+            unreal.log_warning("Already connected to PyCharm debugger")
+            return
+
         dbg_egg = get_debug_egg()
         if dbg_egg is None:
             return
-        sys.path.append(dbg_egg)
+        port = get_debug_port()
+        settings = get_settings()
+
+        if settings.connect_async:
+            connect_async(
+                settings.host,
+                port,
+                settings.connect_timeout,
+                lambda: attach(dbg_egg, port),
+            )
+        else:
+            connect(dbg_egg, port)
+
+
+def connect(
+    dbg_egg: str, port: int, host: Optional[str] = None, **attach_kwargs: Any
+) -> bool:
+    """Check the debug server is up and attach to it, blocking until done
+
+    Args:
+        dbg_egg (str): Path to the debug egg
+        port (int): The debug server port
+        host (str): The debug server host, defaults to None which uses the
+            configured host
+        **attach_kwargs: Keyword arguments for DebugSession.attach,
+            overriding the config
+
+    Returns:
+        bool: True if a new connection was made
+    """
+    host = host or get_debug_host()
+    try:
+        latency = probe_server(host, port)
+    except PyCharmDebugRuntimeError as ex:
+        unreal.log_error(str(ex))
+        return False
 
+    log_latency(host, port, latency)
+    return attach(dbg_egg, port, host, **attach_kwargs)
+
+
+def attach(
+    dbg_egg: str, port: int, host: Optional[str] = None, **attach_kwargs: Any
+) -> bool:
+    """Import pydevd from the debug egg and start tracing, does nothing if
+    already attached
+
+    Args:
+        dbg_egg (str): Path to the debug egg
+        port (int): The debug server port
+        host (str): The debug server host, defaults to None which uses the
+            configured host
+        **attach_kwargs: Keyword arguments for DebugSession.attach,
+            overriding the config
+
+    Returns:
+        bool: True if a new connection was made
+    """
+    settings = get_settings()
+    if dbg_egg and SESSION.imported is False and settings.extract_egg:
         try:
-            import pydevd_pycharm
-        except ImportError:
-            unreal.log_error("Failed to import pydevd_pycharm")
-            return
+            with timed("egg_extract"):
+                dbg_egg = prepare_egg(dbg_egg)
+        except (OSError, zipfile.BadZipFile) as ex:
+            unreal.log_warning(f"Failed to extract debug egg, using it as is: {ex}")
 
-        pydevd_pycharm.settrace(
-            HOST,
-            port=get_debug_port(),
-            stdoutToServer=True,
-            stderrToServer=True,
+    attach_kwargs.setdefault("trace_filter", get_trace_filter())
+    attach_kwargs.setdefault("backend", settings.trace_backend)
+    attach_kwargs.setdefault("trace_on_connect", settings.trace_on_connect)
+    attach_kwargs.setdefault("output", get_output_settings())
+    attach_kwargs.setdefault("threads", get_thread_selection())
+
+    host = host or settings.host
+    try:
+        attached = SESSION.attach(dbg_egg, host, port, **attach_kwargs)
+    except PyCharmDebugRuntimeError as ex:
+        unreal.log_error(str(ex))
+        return False
+
+    if attached:
+        unreal.log(f"PyCharm debugger connect timings: {format_timings()}")
+        if settings.debug_children:
+            children.install(
+                ChildConfig(
+                    dbg_egg,
+                    host,
+                    port,
+                    settings.child_port_range,
+                    settings.output_forwarding,
+                ),
+                settings.child_include,
+            )
+        else:
+            children.uninstall()
+
+    # the supervisor runs on the slate tick, which only the game thread may join
+    if attached and threading.current_thread() is threading.main_thread():
+        SUPERVISOR.watch(
+            lambda: attach(dbg_egg, port, host),
+            interval=settings.health_check_interval,
+            reconnect=settings.reconnect,
+            max_delay=settings.reconnect_max_delay,
         )
-        unreal.log("Connected to PyCharm debugger")
+
+    return attached
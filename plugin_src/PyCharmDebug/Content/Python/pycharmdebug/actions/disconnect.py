@@ -1,5 +1,13 @@
 import unreal
 
+from ..connection import cancel_connect
+from ..session import SESSION
+from ..supervisor import (
+    STATE_LOST,
+    SUPERVISOR,
+    get_connection_state,
+)
+
 
 ACTION_NAME = "stop_debugger"
 ACTION_LABEL = "Disconnect"
@@ -15,18 +23,20 @@ class PyCharmDebugDisconnect(unreal.ToolMenuEntryScript):
     def execute(
         self, context: unreal.ToolMenuContext  # pylint: disable=(unused-argument)
     ) -> None:
-        """Disconnect from the PyCharm debugger
+        """Disconnect from the PyCharm debugger, or stop waiting for it if a
+        connect is still pending
 
         Args:
             context (unreal.ToolMenuContext): ToolMenuContext context object
         """
-        try:
-            import pydevd
-        except ImportError:
+        if cancel_connect():
+            unreal.log("Stopped waiting for PyCharm debugger")
             return
 
-        pydevd.stoptrace()
-        unreal.log("Disconnected from PyCharm debugger")
+        lost = get_connection_state() == STATE_LOST
+        SUPERVISOR.stop()
+        if SESSION.detach() is False and lost is False:
+            unreal.log_warning("Not connected to PyCharm debugger")
 
     def __init__(self) -> None:
         super().__init__()
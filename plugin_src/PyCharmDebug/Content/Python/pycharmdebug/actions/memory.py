@@ -0,0 +1,120 @@
+import unreal
+
+from ..memory import (
+    MEMORY,
+    format_diff,
+    write_diff,
+)
+from ..utils import get_settings
+
+
+START_ACTION_NAME = "start_memory_trace"
+START_ACTION_LABEL = "Trace Memory"
+SNAPSHOT_ACTION_NAME = "memory_snapshot"
+SNAPSHOT_ACTION_LABEL = "Memory Snapshot"
+STOP_ACTION_NAME = "stop_memory_trace"
+STOP_ACTION_LABEL = "Stop Memory Trace"
+ICON_STYLE = "EditorStyle"
+ICON_NAME = "MemoryProfiler.Tab"
+
+
+@unreal.uclass()
+class PyCharmDebugMemoryStart(unreal.ToolMenuEntryScript):
+    """Menu action to start tracing the editor's Python allocations"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.data.name = START_ACTION_NAME
+        self.data.label = START_ACTION_LABEL
+        self.data.icon = unreal.ScriptSlateIcon(ICON_STYLE, ICON_NAME)
+
+    @unreal.ufunction(override=True)
+    def execute(
+        self, context: unreal.ToolMenuContext  # pylint: disable=(unused-argument)
+    ) -> None:
+        """Start tracemalloc and take the baseline snapshot
+
+        Args:
+            context (unreal.ToolMenuContext): ToolMenuContext context object
+        """
+        if MEMORY.snapshots:
+            unreal.log_warning("Python memory tracing is already running")
+            return
+
+        MEMORY.max_snapshots = get_settings().memory_max_snapshots
+        name = MEMORY.start()
+        unreal.log(f"Started tracing Python memory, baseline is {name}")
+
+
+@unreal.uclass()
+class PyCharmDebugMemorySnapshot(unreal.ToolMenuEntryScript):
+    """Menu action to snapshot the traced allocations and report what grew
+    since the previous snapshot"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.data.name = SNAPSHOT_ACTION_NAME
+        self.data.label = SNAPSHOT_ACTION_LABEL
+        self.data.icon = unreal.ScriptSlateIcon(ICON_STYLE, ICON_NAME)
+
+    @unreal.ufunction(override=True)
+    def execute(
+        self, context: unreal.ToolMenuContext  # pylint: disable=(unused-argument)
+    ) -> None:
+        """Take a snapshot and write the memory_top_n biggest changes since
+        the previous one to the log and Saved/PyCharmDebug/memory
+
+        Args:
+            context (unreal.ToolMenuContext): ToolMenuContext context object
+        """
+        if not MEMORY.snapshots:
+            unreal.log_warning(
+                "Python memory tracing is not running, start it with Trace Memory"
+            )
+            return
+
+        settings = get_settings()
+        MEMORY.max_snapshots = settings.memory_max_snapshots
+        MEMORY.take_snapshot()
+        pair = MEMORY.latest_pair()
+        if pair is None:
+            return
+
+        old, new = pair
+        report = format_diff(old, new, MEMORY.diff(old, new, settings.memory_top_n))
+        unreal.log(report)
+
+        try:
+            path = write_diff(old, new, report)
+        except OSError as ex:
+            unreal.log_error(f"Failed to write Python memory diff: {ex}")
+            return
+
+        unreal.log(f"Wrote Python memory diff to {path.as_posix()}")
+
+
+@unreal.uclass()
+class PyCharmDebugMemoryStop(unreal.ToolMenuEntryScript):
+    """Menu action to stop tracing the editor's Python allocations"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.data.name = STOP_ACTION_NAME
+        self.data.label = STOP_ACTION_LABEL
+        self.data.icon = unreal.ScriptSlateIcon(ICON_STYLE, ICON_NAME)
+
+    @unreal.ufunction(override=True)
+    def execute(
+        self, context: unreal.ToolMenuContext  # pylint: disable=(unused-argument)
+    ) -> None:
+        """Stop tracemalloc and drop the snapshots
+
+        Args:
+            context (unreal.ToolMenuContext): ToolMenuContext context object
+        """
+        if not MEMORY.snapshots:
+            unreal.log_warning("Python memory tracing is not running")
+            return
+
+        MEMORY.stop()
+        unreal.log("Stopped tracing Python memory")
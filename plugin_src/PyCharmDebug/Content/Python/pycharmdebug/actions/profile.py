@@ -0,0 +1,82 @@
+import unreal
+
+from ..profiler import (
+    PROFILER,
+    write_profile,
+)
+from ..utils import get_settings
+
+
+START_ACTION_NAME = "start_profiler"
+START_ACTION_LABEL = "Profile"
+STOP_ACTION_NAME = "stop_profiler"
+STOP_ACTION_LABEL = "Stop Profile"
+ICON_STYLE = "EditorStyle"
+ICON_NAME = "Profiler.Tab"
+
+
+@unreal.uclass()
+class PyCharmDebugProfileStart(unreal.ToolMenuEntryScript):
+    """Menu action to start sampling the editor's Python, without attaching
+    the debugger"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.data.name = START_ACTION_NAME
+        self.data.label = START_ACTION_LABEL
+        self.data.icon = unreal.ScriptSlateIcon(ICON_STYLE, ICON_NAME)
+
+    @unreal.ufunction(override=True)
+    def execute(
+        self, context: unreal.ToolMenuContext  # pylint: disable=(unused-argument)
+    ) -> None:
+        """Start the sampling profiler at the profile_sample_rate from
+        Config/tool_config.json
+
+        Args:
+            context (unreal.ToolMenuContext): ToolMenuContext context object
+        """
+        if PROFILER.running:
+            unreal.log_warning("The Python profiler is already running")
+            return
+
+        rate = get_settings().profile_sample_rate
+        PROFILER.start(rate)
+        unreal.log(f"Started profiling editor Python at {rate:g} samples/s")
+
+
+@unreal.uclass()
+class PyCharmDebugProfileStop(unreal.ToolMenuEntryScript):
+    """Menu action to stop the profiler and write the collected stacks"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.data.name = STOP_ACTION_NAME
+        self.data.label = STOP_ACTION_LABEL
+        self.data.icon = unreal.ScriptSlateIcon(ICON_STYLE, ICON_NAME)
+
+    @unreal.ufunction(override=True)
+    def execute(
+        self, context: unreal.ToolMenuContext  # pylint: disable=(unused-argument)
+    ) -> None:
+        """Stop the sampling profiler and write a flame graph file under
+        Saved/PyCharmDebug/profiles, in the configured profile_format
+
+        Args:
+            context (unreal.ToolMenuContext): ToolMenuContext context object
+        """
+        profile = PROFILER.stop()
+        if profile is None:
+            unreal.log_warning("The Python profiler is not running")
+            return
+
+        try:
+            path = write_profile(profile, get_settings().profile_format)
+        except OSError as ex:
+            unreal.log_error(f"Failed to write Python profile: {ex}")
+            return
+
+        unreal.log(
+            f"Wrote {profile.sample_count} samples over {profile.duration:.1f}s "
+            f"to {path.as_posix()}"
+        )
@@ -0,0 +1,62 @@
+import unreal
+
+from ..constants import (
+    THREADS_ALL,
+    THREADS_CURRENT,
+    THREADS_MATCHING,
+)
+from ..session import SESSION
+from ..threads import trace_threads
+from ..utils import get_settings
+
+
+ACTION_NAME = "trace_threads"
+ACTION_LABEL = "Trace Threads"
+ICON_STYLE = "EditorStyle"
+ICON_NAME = "Sequencer.IconKeyBreak"
+
+
+def get_next_mode(mode: str, has_patterns: bool) -> str:
+    """Get the thread selection mode after the given one, skipping matching
+    when no trace_thread_patterns are configured
+
+    Args:
+        mode (str): The current mode
+        has_patterns (bool): True if trace_thread_patterns is not empty
+
+    Returns:
+        str: The next mode
+    """
+    modes = [THREADS_ALL, THREADS_CURRENT]
+    if has_patterns:
+        modes.append(THREADS_MATCHING)
+
+    return modes[(modes.index(mode) + 1) % len(modes)] if mode in modes else modes[0]
+
+
+@unreal.uclass()
+class PyCharmDebugTraceThreads(unreal.ToolMenuEntryScript):
+    """Menu action to switch which threads the attached debugger traces"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.data.name = ACTION_NAME
+        self.data.label = ACTION_LABEL
+        self.data.icon = unreal.ScriptSlateIcon(ICON_STYLE, ICON_NAME)
+
+    @unreal.ufunction(override=True)
+    def execute(
+        self, context: unreal.ToolMenuContext  # pylint: disable=(unused-argument)
+    ) -> None:
+        """Cycle between tracing all threads, the game thread only and the
+        threads matching trace_thread_patterns from Config/tool_config.json
+
+        Args:
+            context (unreal.ToolMenuContext): ToolMenuContext context object
+        """
+        if SESSION.active is False:
+            unreal.log_warning("Not connected to PyCharm debugger")
+            return
+
+        patterns = get_settings().trace_thread_patterns
+        trace_threads(get_next_mode(SESSION.threads.mode, bool(patterns)), patterns)
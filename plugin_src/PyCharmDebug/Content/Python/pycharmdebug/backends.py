@@ -0,0 +1,71 @@
+import sys
+
+import unreal
+
+from .constants import (
+    BACKEND_MONITORING,
+    BACKEND_SETTRACE,
+)
+
+
+PYDEVD_MONITORING_ENV_VAR = "PYDEVD_USE_SYS_MONITORING"
+PYDEVD_CONSTANTS_MODULE = "_pydevd_bundle.pydevd_constants"
+
+
+def supports_monitoring() -> bool:
+    """Check whether the interpreter provides PEP 669 sys.monitoring
+
+    Returns:
+        bool: True on Python 3.12+
+    """
+    return sys.version_info >= (3, 12) and hasattr(sys, "monitoring")
+
+
+def resolve_backend(requested: str) -> str:
+    """Resolve the configured trace backend for this interpreter
+
+    ``auto`` picks sys.monitoring where available. Requesting sys.monitoring
+    on an older interpreter falls back to settrace.
+
+    Args:
+        requested (str): One of auto, settrace or sys_monitoring
+
+    Returns:
+        str: settrace or sys_monitoring
+    """
+    if requested == BACKEND_SETTRACE:
+        return BACKEND_SETTRACE
+
+    if supports_monitoring():
+        return BACKEND_MONITORING
+
+    if requested == BACKEND_MONITORING:
+        unreal.log_warning(
+            f"sys.monitoring requires Python 3.12+, running {sys.version.split()[0]}, "
+            "falling back to settrace"
+        )
+
+    return BACKEND_SETTRACE
+
+
+def get_pydevd_backend(requested: str) -> str:
+    """Get the trace backend the imported pydevd actually uses
+
+    pydevd decides on import and versions without sys.monitoring support,
+    e.g. pydevd-pycharm 263, ignore the request and always use settrace.
+
+    Args:
+        requested (str): The resolved backend pydevd was asked for
+
+    Returns:
+        str: settrace or sys_monitoring, the requested backend if pydevd's
+            constants module isn't loaded
+    """
+    constants = sys.modules.get(PYDEVD_CONSTANTS_MODULE)
+    if constants is None:
+        return requested
+
+    if getattr(constants, "USE_SYS_MONITORING", False):
+        return BACKEND_MONITORING
+
+    return BACKEND_SETTRACE
@@ -0,0 +1,92 @@
+from types import FrameType
+from typing import (
+    Optional,
+    Tuple,
+)
+import sys
+import threading
+
+
+# None until the breakpoints_enabled config value is first read
+_enabled: Optional[bool] = None
+_target: Optional[Tuple[str, int]] = None
+_lock = threading.Lock()
+
+
+def breakpoint() -> None:  # pylint: disable=redefined-builtin
+    """Suspend in the PyCharm debugger at the caller, connecting on first use
+
+    Safe to leave in production scripts: while breakpoints are disabled this
+    is a single cached boolean check. The debug egg and port are read from the
+    config once, on the first enabled hit. Also usable as the builtin
+    breakpoint() hook with ``PYTHONBREAKPOINT=pycharmdebug.breakpoint``.
+    """
+    if _enabled is False:
+        return
+
+    _hit(sys._getframe(1))  # pylint: disable=protected-access
+
+
+def set_breakpoints_enabled(enabled: Optional[bool]) -> None:
+    """Enable or disable breakpoint() for this editor session, without
+    changing the config file
+
+    Args:
+        enabled (bool): True to enable, False to disable, or None to read the
+            breakpoints_enabled config value again on the next hit
+    """
+    global _enabled, _target  # pylint: disable=global-statement
+
+    _enabled = enabled
+    _target = None
+
+
+def _is_enabled() -> bool:
+    global _enabled  # pylint: disable=global-statement
+
+    if _enabled is None:
+        from .utils import get_config_value
+
+        _enabled = bool(get_config_value("breakpoints_enabled"))
+
+    return _enabled
+
+
+def _hit(frame: FrameType) -> None:
+    global _enabled, _target  # pylint: disable=global-statement
+
+    import unreal
+
+    from .exceptions import PyCharmDebugRuntimeError
+
+    with _lock:
+        try:
+            if _is_enabled() is False:
+                return
+
+            from .session import SESSION
+
+            if SESSION.suspend(frame):
+                return
+
+            if _target is None:
+                from .utils import (
+                    get_debug_egg,
+                    get_debug_port,
+                )
+
+                _target = (get_debug_egg(), get_debug_port())
+        except PyCharmDebugRuntimeError as ex:
+            unreal.log_error(f"pycharmdebug.breakpoint() disabled: {ex}")
+            _enabled = False
+            return
+
+        from .actions.connect import connect
+
+        if connect(*_target, suspend=True, stop_at_frame=frame) is False:
+            # a missing debug server must not slow down every later hit
+            unreal.log_warning(
+                "pycharmdebug.breakpoint() disabled for this session, call "
+                "set_breakpoints_enabled(True) to try again"
+            )
+            _enabled = False
@@ -0,0 +1,166 @@
+# runs inside worker processes started by a debugged editor, which have no
+# unreal module, so only unreal-free plugin modules may be imported here
+from typing import (
+    Any,
+    Callable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+import json
+import os
+import runpy
+import sys
+
+from .constants import (
+    OUTPUT_BUFFERED,
+    OUTPUT_OFF,
+)
+
+
+CHILD_ENV_VAR = "PYCHARMDEBUG_CHILD"
+
+
+class ChildConfig(NamedTuple):
+    """Where a child process finds pydevd and the debug server, and whether
+    its output goes to the IDE"""
+
+    dbg_egg: str
+    host: str
+    port: int
+    port_range: Sequence[int] = ()
+    output_forwarding: str = OUTPUT_BUFFERED
+
+    def to_env(self) -> str:
+        """Serialize the config for the child's environment
+
+        Returns:
+            str: The config as JSON
+        """
+        return json.dumps(
+            {
+                "dbg_egg": self.dbg_egg,
+                "host": self.host,
+                "port": self.port,
+                "port_range": list(self.port_range),
+                "output_forwarding": self.output_forwarding,
+            }
+        )
+
+    @classmethod
+    def from_env(cls, value: Optional[str] = None) -> Optional["ChildConfig"]:
+        """Read the config from the environment
+
+        Args:
+            value (str): The serialized config, defaults to None which reads
+                the PYCHARMDEBUG_CHILD environment variable
+
+        Returns:
+            ChildConfig: The config, or None if it is missing or malformed
+        """
+        value = os.environ.get(CHILD_ENV_VAR) if value is None else value
+        if not value:
+            return None
+
+        try:
+            data = json.loads(value)
+            data["port_range"] = tuple(data.get("port_range", ()))
+            return cls(**data)
+        except (TypeError, ValueError):
+            return None
+
+
+def attach(config: ChildConfig) -> bool:
+    """Connect this process to the debug server, tracing every thread
+
+    With a port range the process leases its own port from the pool shared by
+    every process on the machine, otherwise it connects to the editor's port.
+    Output reaches the IDE through pydevd's own forwarding unless the
+    editor's output_forwarding is off, the buffered forwarder only runs in
+    the editor.
+
+    Args:
+        config (ChildConfig): The debug server and egg to use
+
+    Returns:
+        bool: True if connected
+    """
+    if "pydevd" in sys.modules:  # forked from the debugged editor
+        sys.modules["pydevd"].settrace_forked()
+        return True
+
+    port = config.port
+    if config.port_range:
+        from .exceptions import PyCharmDebugRuntimeError
+        from .port_pool import allocate_port
+
+        try:
+            port = allocate_port(config.port_range)
+        except PyCharmDebugRuntimeError as ex:
+            sys.stderr.write(f"PyCharmDebug: {ex}\n")
+            return False
+
+    if config.dbg_egg and config.dbg_egg not in sys.path:
+        sys.path.append(config.dbg_egg)
+
+    try:
+        import pydevd_pycharm
+    except ImportError:
+        sys.stderr.write("PyCharmDebug: Failed to import pydevd_pycharm\n")
+        return False
+
+    forward_output = config.output_forwarding != OUTPUT_OFF
+    pydevd_pycharm.settrace(
+        config.host,
+        port=port,
+        suspend=False,
+        stdoutToServer=forward_output,
+        stderrToServer=forward_output,
+        trace_only_current_thread=False,
+    )
+    return True
+
+
+def run_process(config: ChildConfig, run: Callable[[Any], Any], process: Any) -> Any:
+    """Attach, then run a multiprocessing process's original run method
+
+    Args:
+        config (ChildConfig): The debug server and egg to use
+        run (Callable): The process class's run method
+        process: The process
+
+    Returns:
+        The result of run
+    """
+    attach(config)
+    return run(process)
+
+
+def main(argv: List[str]) -> None:
+    """Attach, then run a Python command line the way the interpreter would
+
+    Args:
+        argv (list): ``-m module args``, ``-c code args`` or ``script args``
+    """
+    config = ChildConfig.from_env()
+    os.environ.pop(CHILD_ENV_VAR, None)  # not for this process's own children
+    if config is not None:
+        attach(config)
+
+    if argv[0] == "-m":
+        sys.argv = [argv[1]] + argv[2:]
+        runpy.run_module(argv[1], run_name="__main__", alter_sys=True)
+    elif argv[0] == "-c":
+        sys.argv = ["-c"] + argv[2:]
+        exec(  # pylint: disable=exec-used
+            compile(argv[1], "<string>", "exec"), {"__name__": "__main__"}
+        )
+    else:
+        sys.argv = argv
+        sys.path[0] = os.path.dirname(os.path.abspath(argv[0]))
+        runpy.run_path(argv[0], run_name="__main__")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
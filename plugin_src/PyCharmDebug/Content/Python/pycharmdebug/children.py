@@ -0,0 +1,271 @@
+from functools import partial
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+import fnmatch
+import multiprocessing.pool
+import multiprocessing.process
+import os
+import re
+import subprocess
+import sys
+
+import unreal
+
+from .child import (
+    CHILD_ENV_VAR,
+    ChildConfig,
+    run_process,
+)
+
+
+CHILD_MODULE = f"{__package__}.child"
+PYTHON_EXECUTABLE = re.compile(r"^python(\d+(\.\d+)?)?w?(\.exe)?$", re.IGNORECASE)
+# interpreter options that are kept in front of the injected -m
+FLAG_OPTIONS = re.compile(r"^-(b{1,2}|B|d|O{1,2}|q|s|S|u|v+|x)$")
+VALUE_OPTIONS = ("-X", "-W")
+# positions of shell and env in Popen's arguments after args
+POPEN_SHELL_INDEX = 7
+POPEN_ENV_INDEX = 9
+
+_config: Optional[ChildConfig] = None
+_include: List[str] = []
+_original_start: Optional[Callable[..., Any]] = None
+_original_popen_init: Optional[Callable[..., Any]] = None
+
+
+class PythonCommand(NamedTuple):
+    """A Python command line split into interpreter options and what it runs"""
+
+    executable: str
+    options: List[str]
+    target: List[str]  # -m module, -c code, or the script path
+    args: List[str]
+
+
+def qualified_name(obj: Any) -> str:
+    """Get the ``module.qualname`` of a function or class
+
+    Args:
+        obj: The function or class
+
+    Returns:
+        str: The qualified name, or an empty string
+    """
+    name = getattr(obj, "__qualname__", None)
+    if name is None:
+        return ""
+
+    module = getattr(obj, "__module__", None)
+    return f"{module}.{name}" if module else name
+
+
+def matches(names: Sequence[str], include: Sequence[str]) -> bool:
+    """Check whether a child process is selected by the include patterns
+
+    Args:
+        names (Sequence[str]): Names describing the child, e.g. the process
+            name, target function or script
+        include (Sequence[str]): fnmatch patterns, empty selects every child
+
+    Returns:
+        bool: True if any name matches any pattern
+    """
+    if not include:
+        return True
+
+    return any(
+        fnmatch.fnmatchcase(name, pattern)
+        for name in names
+        if name
+        for pattern in include
+    )
+
+
+def get_process_names(process: multiprocessing.process.BaseProcess) -> List[str]:
+    """Get the names a multiprocessing process is matched by: its name, its
+    target, its class when run is overridden and, for pool workers, the pool
+    initializer
+
+    Args:
+        process (BaseProcess): The process, not yet started
+
+    Returns:
+        list: The names
+    """
+    target = getattr(process, "_target", None)
+    names = [process.name, qualified_name(target)]
+
+    if type(process).run is not multiprocessing.process.BaseProcess.run:
+        names.append(qualified_name(type(process)))
+
+    if target is getattr(multiprocessing.pool, "worker", None):
+        args: Sequence[Any] = getattr(process, "_args", ())
+        if len(args) > 2:  # worker(inqueue, outqueue, initializer, ...)
+            names.append(qualified_name(args[2]))
+
+    return names
+
+
+def parse_python_command(command: Any) -> Optional[PythonCommand]:
+    """Split a subprocess command line that runs Python
+
+    Args:
+        command: The Popen args
+
+    Returns:
+        PythonCommand: The split command, or None if it doesn't run a Python
+            script, module or -c code in a way the child bootstrap can repeat
+    """
+    if isinstance(command, (list, tuple)) is False or not command:
+        return None
+
+    command = [os.fspath(arg) for arg in command]
+    if PYTHON_EXECUTABLE.match(Path(command[0]).name) is None:
+        return None
+
+    options = []
+    index = 1
+    while index < len(command):
+        arg = command[index]
+        if FLAG_OPTIONS.match(arg):
+            options.append(arg)
+        elif arg in VALUE_OPTIONS and index + 1 < len(command):
+            options.extend(command[index : index + 2])
+            index += 1
+        elif arg in ("-m", "-c") and index + 1 < len(command):
+            return PythonCommand(
+                command[0], options, command[index : index + 2], command[index + 2 :]
+            )
+        elif arg.startswith("-"):
+            return None  # stdin, isolated mode or an option we can't repeat
+        else:
+            return PythonCommand(command[0], options, [arg], command[index + 1 :])
+        index += 1
+
+    return None  # interactive
+
+
+def get_command_names(command: PythonCommand) -> List[str]:
+    """Get the names a Python subprocess is matched by: the module, the
+    script path and file name, or the source of ``-c`` code
+
+    Args:
+        command (PythonCommand): The split command
+
+    Returns:
+        list: The names
+    """
+    if command.target[0] in ("-m", "-c"):
+        return [command.target[1]]
+
+    return [command.target[0], Path(command.target[0]).name]
+
+
+def _is_attached() -> bool:
+    session = sys.modules.get(f"{__package__}.session")
+    return session is not None and session.SESSION.active
+
+
+def _patched_start(process: multiprocessing.process.BaseProcess) -> None:
+    if (
+        _config is not None
+        and _is_attached()
+        and matches(get_process_names(process), _include)
+    ):
+        # an instance attribute is pickled along with the process for spawn
+        process.run = partial(  # type: ignore[method-assign, assignment]
+            run_process, _config, type(process).run, process
+        )
+
+    if _original_start is not None:
+        _original_start(process)
+
+
+def _patched_popen_init(
+    popen: subprocess.Popen, args: Any, *popen_args: Any, **kwargs: Any
+) -> None:
+    command = parse_python_command(args)
+    # shell commands and env passed positionally are left alone
+    shell = kwargs.get(
+        "shell", len(popen_args) > POPEN_SHELL_INDEX and popen_args[POPEN_SHELL_INDEX]
+    )
+    supported = not shell and len(popen_args) <= POPEN_ENV_INDEX
+    if (
+        _config is not None
+        and command is not None
+        and supported
+        and _is_attached()
+        and matches(get_command_names(command), _include)
+    ):
+        env = dict(os.environ if kwargs.get("env") is None else kwargs["env"])
+        env[CHILD_ENV_VAR] = _config.to_env()
+        plugin_path = Path(__file__).resolve().parents[1].as_posix()
+        env["PYTHONPATH"] = os.pathsep.join(
+            [plugin_path] + [path for path in [env.get("PYTHONPATH")] if path]
+        )
+        kwargs["env"] = env
+        args = [
+            command.executable,
+            *command.options,
+            "-m",
+            CHILD_MODULE,
+            *command.target,
+            *command.args,
+        ]
+
+    if _original_popen_init is not None:
+        _original_popen_init(popen, args, *popen_args, **kwargs)
+
+
+def install(config: ChildConfig, include: Sequence[str] = ()) -> None:
+    """Attach child processes started while the editor is attached
+
+    multiprocessing processes, pools included, attach before running their
+    target. Python started through subprocess is run through the child
+    bootstrap, which attaches before running the script, module or code.
+    Calling install again updates the config and include patterns.
+
+    Args:
+        config (ChildConfig): The debug server and egg children use
+        include (Sequence[str]): fnmatch patterns selecting which children
+            are attached, empty attaches every child. Matched against the
+            process name, target function, process class and pool initializer,
+            or the script path, file name, module or ``-c`` source of a
+            subprocess
+    """
+    global _config, _include, _original_start, _original_popen_init  # pylint: disable=global-statement
+
+    _config = config
+    _include = list(include)
+
+    if _original_start is None:
+        _original_start = multiprocessing.process.BaseProcess.start
+        multiprocessing.process.BaseProcess.start = _patched_start  # type: ignore[method-assign, assignment]
+
+    if _original_popen_init is None:
+        _original_popen_init = subprocess.Popen.__init__
+        subprocess.Popen.__init__ = _patched_popen_init  # type: ignore[method-assign, assignment]
+
+    unreal.log("Child Python processes will attach to the PyCharm debugger")
+
+
+def uninstall() -> None:
+    """Restore process creation, children started afterwards run untraced"""
+    global _config, _original_start, _original_popen_init  # pylint: disable=global-statement
+
+    if _original_start is not None:
+        multiprocessing.process.BaseProcess.start = _original_start  # type: ignore[method-assign, assignment]
+        _original_start = None
+
+    if _original_popen_init is not None:
+        subprocess.Popen.__init__ = _original_popen_init  # type: ignore[method-assign, assignment]
+        _original_popen_init = None
+
+    _config = None
@@ -0,0 +1,215 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    IO,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+)
+import json
+import os
+import sys
+import tempfile
+import time
+
+from .exceptions import PyCharmDebugRuntimeError
+
+if sys.platform == "win32":
+    import msvcrt  # pylint: disable=import-error
+else:
+    import fcntl
+
+
+StatKey = Tuple[int, int]
+
+LOCK_SUFFIX = ".lock"
+LOCK_TIMEOUT = 5.0  # seconds
+LOCK_POLL_INTERVAL = 0.05  # seconds
+
+
+def try_lock_file(file: IO) -> bool:
+    """Take a non-blocking, exclusive advisory lock on an open file, the lock
+    is released when the file is closed or the process exits
+
+    Args:
+        file (IO): The open file
+
+    Returns:
+        bool: True if the lock was taken, False if another process holds it
+    """
+    try:
+        if sys.platform == "win32":
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+
+    return True
+
+
+def unlock_file(file: IO) -> None:
+    """Release a lock taken with :func:`try_lock_file`
+
+    Args:
+        file (IO): The open file
+    """
+    if sys.platform == "win32":
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path: Path, timeout: float = LOCK_TIMEOUT) -> Iterator[None]:
+    """Hold an advisory, inter-process lock on a file
+
+    The lock is taken on a sibling ``<name>.lock`` file so the locked file
+    itself can be atomically replaced while the lock is held.
+
+    Args:
+        path (Path): Path of the file to lock
+        timeout (float): Seconds to wait for the lock, defaults to 5.0
+
+    Raises:
+        PyCharmDebugRuntimeError:
+            Timed out waiting for the lock
+    """
+    lock_path = path.with_name(path.name + LOCK_SUFFIX)
+    with open(lock_path.as_posix(), "a+b") as lock_file:
+        deadline = time.monotonic() + timeout
+        while try_lock_file(lock_file) is False:
+            if time.monotonic() >= deadline:
+                raise PyCharmDebugRuntimeError(
+                    f"Timed out waiting for lock on {path.as_posix()}"
+                )
+            time.sleep(LOCK_POLL_INTERVAL)
+
+        try:
+            yield
+        finally:
+            unlock_file(lock_file)
+
+
+def atomic_write_json(path: Path, data: dict) -> None:
+    """Write json data through a temporary file renamed over the target, so
+    readers never see a partially written file
+
+    Args:
+        path (Path): Path of the file to write
+        data (dict): The data to serialize
+    """
+    file_descriptor, temp_name = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent.as_posix()
+    )
+    try:
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_name, path.as_posix())
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+        raise
+
+
+class ConfigStore:
+    """In-process cache of parsed config files
+
+    Each file is parsed once and kept in memory, keyed by its modification
+    time and size. The file is only re-read when either of those change.
+    Writes go through :meth:`update`, which applies a batch of changes in a
+    single locked, atomic transaction.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[Optional[StatKey], dict]] = {}
+
+    @staticmethod
+    def stat(path: Path) -> Optional[StatKey]:
+        """Get the key a config file is cached under
+
+        Args:
+            path (Path): Path to the config file
+
+        Returns:
+            tuple: The modification time and size, or None if the file is
+                missing
+        """
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def read(self, path: Path) -> dict:
+        """Get the parsed contents of a config file
+
+        Args:
+            path (Path): Path to the config file
+
+        Returns:
+            dict: The parsed config data, a missing or empty file yields an
+                empty dict
+        """
+        key = self.stat(path)
+        cache_id = str(path)
+
+        cached = self._entries.get(cache_id)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        data: dict = {}
+        if key is not None and key[1] != 0:
+            with open(path.as_posix(), "r", encoding="utf-8") as file:
+                data = json.load(file)
+
+        self._entries[cache_id] = (key, data)
+        return data
+
+    def update(
+        self, path: Path, changes: dict, defaults: Optional[dict] = None
+    ) -> dict:
+        """Apply a batch of changes to a config file in one transaction
+
+        The file is locked, re-read from disk, merged with the changes and
+        atomically replaced.
+
+        Args:
+            path (Path): Path to the config file
+            changes (dict): Keys and values to set
+            defaults (dict): Values used for keys missing from the file,
+                defaults to None
+
+        Returns:
+            dict: The data written to the file
+        """
+        with file_lock(path):
+            self.invalidate(path)
+            data = dict(defaults or {})
+            data.update(self.read(path))
+            data.update(changes)
+
+            atomic_write_json(path, data)
+            self._entries[str(path)] = (self.stat(path), data)
+
+        return data
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Drop cached data
+
+        Args:
+            path (Path): Path to drop from the cache, defaults to None
+                which clears every entry
+        """
+        if path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(str(path), None)
+
+
+CONFIG_STORE = ConfigStore()
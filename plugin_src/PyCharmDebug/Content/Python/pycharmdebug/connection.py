@@ -0,0 +1,244 @@
+from typing import (
+    Any,
+    Callable,
+    Optional,
+)
+import errno
+import select
+import socket
+import threading
+import time
+
+import unreal
+
+from .exceptions import PyCharmDebugRuntimeError
+from .metrics import METRICS
+
+
+PROBE_TIMEOUT = 0.08  # seconds, keep the pre-flight check well under 100ms
+POLL_INTERVAL = 0.25  # seconds between attempts while waiting for the server
+WORKER_THREAD_NAME = "PyCharmDebugConnect"
+CONNECT_IN_PROGRESS = (
+    0,
+    errno.EINPROGRESS,
+    errno.EWOULDBLOCK,
+    errno.EALREADY,
+    10035,  # WSAEWOULDBLOCK
+)
+
+
+def probe_server(host: str, port: int, timeout: float = PROBE_TIMEOUT) -> float:
+    """Check something is listening on host:port with a non-blocking connect
+
+    Args:
+        host (str): The debug server host
+        port (int): The debug server port
+        timeout (float): Seconds to wait for the handshake, defaults to 0.08
+
+    Returns:
+        float: The connect round-trip time in seconds
+
+    Raises:
+        PyCharmDebugRuntimeError:
+            Failed to resolve the host
+            Nothing listening on host:port
+            No answer from host:port within the timeout
+    """
+    try:
+        family, sock_type, proto, _, address = socket.getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )[0]
+    except socket.gaierror as ex:
+        raise PyCharmDebugRuntimeError(f"Failed to resolve host {host}") from ex
+
+    with socket.socket(family, sock_type, proto) as sock:
+        sock.setblocking(False)
+        start = time.perf_counter()
+        error = sock.connect_ex(address)
+        if error not in CONNECT_IN_PROGRESS:
+            raise PyCharmDebugRuntimeError(
+                f"No PyCharm debug server listening on {host}:{port}, is the "
+                "debug configuration running in PyCharm?"
+            )
+
+        _, writable, failed = select.select([], [sock], [sock], timeout)
+        latency = time.perf_counter() - start
+
+        if not writable and not failed:
+            raise PyCharmDebugRuntimeError(
+                f"No answer from {host}:{port} within {timeout * 1000:.0f} ms"
+            )
+
+        if failed or sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) != 0:
+            raise PyCharmDebugRuntimeError(
+                f"No PyCharm debug server listening on {host}:{port}, is the "
+                "debug configuration running in PyCharm?"
+            )
+
+    return latency
+
+
+def wait_for_server(host: str, port: int, timeout: float) -> Optional[float]:
+    """Probe host:port until something accepts connections
+
+    Args:
+        host (str): The debug server host
+        port (int): The debug server port
+        timeout (float): Seconds to keep trying for
+
+    Returns:
+        float: The connect round-trip time in seconds of the successful
+            probe, or None if the timeout expired first
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+
+        try:
+            return probe_server(host, port, min(PROBE_TIMEOUT, remaining))
+        except PyCharmDebugRuntimeError:
+            time.sleep(min(POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
+
+
+def log_latency(host: str, port: int, latency: float) -> None:
+    """Log and record the debug server connect round-trip time
+
+    Args:
+        host (str): The debug server host
+        port (int): The debug server port
+        latency (float): Round-trip time in seconds
+    """
+    METRICS.record("handshake", latency, host=host, port=port)
+    unreal.log(
+        f"PyCharm debug server on {host}:{port} answered in {latency * 1000:.1f} ms"
+    )
+
+
+class AsyncConnect:  # pylint: disable=too-many-instance-attributes
+    """Wait for the debug server on a worker thread, then finish attaching on
+    the next editor tick so the editor never blocks on the socket"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        timeout: float,
+        on_ready: Callable[[], Any],
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._on_ready = on_ready
+        self._done = threading.Event()
+        self._latency: Optional[float] = None
+        self._cancelled = False
+        self._tick_handle = None
+
+    @property
+    def pending(self) -> bool:
+        """bool: True while still waiting for the attach to finish"""
+        return self._tick_handle is not None
+
+    def start(self) -> None:
+        """Start waiting for the debug server"""
+        worker = threading.Thread(
+            target=self._wait, name=WORKER_THREAD_NAME, daemon=True
+        )
+        self._tick_handle = unreal.register_slate_post_tick_callback(self._on_tick)
+        worker.start()
+
+    def cancel(self) -> bool:
+        """Stop waiting, the debugger is not attached even if the server
+        answers later
+
+        Returns:
+            bool: True if the connect was still pending
+        """
+        self._cancelled = True
+        if self._tick_handle is None:
+            return False
+
+        unreal.unregister_slate_post_tick_callback(self._tick_handle)
+        self._tick_handle = None
+        return True
+
+    def _wait(self) -> None:
+        self._latency = wait_for_server(self.host, self.port, self.timeout)
+        self._done.set()
+
+    def _on_tick(self, delta_time: float) -> None:  # pylint: disable=unused-argument
+        if self._done.is_set() is False:
+            return
+
+        if self._tick_handle is not None:
+            unreal.unregister_slate_post_tick_callback(self._tick_handle)
+            self._tick_handle = None
+
+        if self._cancelled:
+            return
+
+        if self._latency is None:
+            unreal.log_error(
+                f"No PyCharm debug server found on {self.host}:{self.port} "
+                f"after {self.timeout:g}s"
+            )
+            return
+
+        log_latency(self.host, self.port, self._latency)
+
+        try:
+            self._on_ready()
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            # raising here would surface inside the slate tick
+            unreal.log_error(f"Failed to connect to PyCharm debugger: {ex}")
+
+
+_pending_connect: Optional[AsyncConnect] = None
+
+
+def connect_async(
+    host: str, port: int, timeout: float, on_ready: Callable[[], Any]
+) -> Optional[AsyncConnect]:
+    """Attach to the debug server without blocking the editor, only one
+    connect may be pending at a time
+
+    Args:
+        host (str): The debug server host
+        port (int): The debug server port
+        timeout (float): Seconds to wait for the server
+        on_ready (Callable): Called on the editor tick once the server is up
+
+    Returns:
+        AsyncConnect: The pending connect, or None if one was already pending
+    """
+    global _pending_connect  # pylint: disable=global-statement
+
+    if is_connect_pending():
+        unreal.log_warning("Already waiting for the PyCharm debugger")
+        return None
+
+    _pending_connect = AsyncConnect(host, port, timeout, on_ready)
+    _pending_connect.start()
+    unreal.log(f"Waiting for PyCharm debugger on {host}:{port}")
+
+    return _pending_connect
+
+
+def is_connect_pending() -> bool:
+    """Check whether an asynchronous connect is still waiting for the server
+
+    Returns:
+        bool: True while a connect is pending
+    """
+    return _pending_connect is not None and _pending_connect.pending
+
+
+def cancel_connect() -> bool:
+    """Cancel the pending asynchronous connect, if any
+
+    Returns:
+        bool: True if a pending connect was cancelled
+    """
+    return _pending_connect is not None and _pending_connect.cancel()
@@ -0,0 +1,31 @@
+# the values settings.py validates and defaults to, kept apart from the
+# modules they configure so resolving the settings doesn't import those
+
+BACKEND_AUTO = "auto"
+BACKEND_SETTRACE = "settrace"
+BACKEND_MONITORING = "sys_monitoring"
+BACKENDS = (BACKEND_AUTO, BACKEND_SETTRACE, BACKEND_MONITORING)
+
+THREADS_ALL = "all"
+THREADS_CURRENT = "current"
+THREADS_MATCHING = "matching"
+THREAD_MODES = (THREADS_ALL, THREADS_CURRENT, THREADS_MATCHING)
+
+OUTPUT_OFF = "off"
+OUTPUT_DIRECT = "direct"
+OUTPUT_BUFFERED = "buffered"
+OUTPUT_MODES = (OUTPUT_OFF, OUTPUT_DIRECT, OUTPUT_BUFFERED)
+DEFAULT_OUTPUT_FLUSH_SIZE = 8192  # bytes
+DEFAULT_OUTPUT_FLUSH_INTERVAL = 0.1  # seconds
+DEFAULT_OUTPUT_RATE_LIMIT = 65536  # bytes per second, 0 is unlimited
+
+FORMAT_SPEEDSCOPE = "speedscope"
+FORMAT_COLLAPSED = "collapsed"
+PROFILE_FORMATS = (FORMAT_SPEEDSCOPE, FORMAT_COLLAPSED)
+DEFAULT_SAMPLE_RATE = 100.0  # samples per second
+
+DEFAULT_TOP_N = 20
+DEFAULT_MAX_SNAPSHOTS = 2  # numbered ones, the previous and the current snapshot
+MIN_MAX_SNAPSHOTS = 2  # a snapshot is diffed against the previous one
+
+DEFAULT_WATCHDOG_THRESHOLD = 0.05  # seconds
@@ -0,0 +1,319 @@
+from pathlib import Path
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+import json
+import os
+import sys
+
+from .config_store import atomic_write_json
+from .paths import get_saved_dir
+
+
+ENV_VAR_PREFIX = "pycharm"
+# the plugin's own settings variables, PYCHARMDEBUG_*, are not install paths
+PLUGIN_ENV_VAR_PREFIX = "pycharmdebug"
+PRIMARY_ENV_VAR = "PyCharm"
+RELATIVE_EGG_PATH = "debug-eggs/pydevd-pycharm.egg"
+INDEX_FILE_NAME = "pycharm_index.json"
+INDEX_VERSION = 1
+
+
+class PyCharmInstallation(NamedTuple):
+    """A PyCharm installation found on this machine"""
+
+    root: str
+    egg: str  # empty if the installation has no debug egg
+    build: Tuple[int, ...]  # empty if the build number is unknown
+    source: str
+
+
+class _Scan:
+    """Installations found by a scan, and the directory modification times
+    used to tell whether the scan is still valid"""
+
+    def __init__(self) -> None:
+        self.installations: List[PyCharmInstallation] = []
+        self.dir_mtimes: Dict[str, Optional[int]] = {}
+        self._seen: set = set()
+
+    def watch(self, path: Path) -> Optional[int]:
+        """Record the modification time of a scanned directory"""
+        try:
+            mtime: Optional[int] = path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        self.dir_mtimes[path.as_posix()] = mtime
+        return mtime
+
+    def children(self, path: Path) -> Iterator[Path]:
+        """Iterate a watched directory's entries"""
+        if self.watch(path) is None:
+            return
+        try:
+            yield from sorted(path.iterdir())
+        except OSError:
+            return
+
+    def add(self, root: Path, source: str) -> None:
+        """Record an installation root, once"""
+        if root.as_posix() in self._seen or root.is_dir() is False:
+            return
+        self._seen.add(root.as_posix())
+
+        egg_path = root.joinpath(RELATIVE_EGG_PATH)
+        self.watch(root)
+        self.watch(egg_path.parent)
+
+        self.installations.append(
+            PyCharmInstallation(
+                root=root.as_posix(),
+                egg=egg_path.as_posix() if egg_path.is_file() else "",
+                build=read_build_number(root),
+                source=source,
+            )
+        )
+
+
+def get_env_bin_dirs() -> List[str]:
+    """Get the bin directories listed in PyCharm* environment variables, the
+    ``PyCharm`` variable first
+
+    Only absolute paths are kept, so flags PyCharm sets in processes it
+    starts, such as ``PYCHARM_HOSTED=1``, are ignored, and so are the
+    plugin's ``PYCHARMDEBUG_*`` settings.
+
+    Returns:
+        list: The bin directories
+    """
+    names = [PRIMARY_ENV_VAR] + sorted(
+        name
+        for name in os.environ
+        if name.lower().startswith(ENV_VAR_PREFIX)
+        and name.lower().startswith(PLUGIN_ENV_VAR_PREFIX) is False
+        and name != PRIMARY_ENV_VAR
+    )
+
+    bin_dirs = []
+    for name in names:
+        value = os.environ.get(name)
+        if not value:
+            continue
+        for entry in value.replace(os.pathsep, ";").split(";"):
+            entry = entry.strip().strip('"')
+            if entry and os.path.isabs(entry) and entry not in bin_dirs:
+                bin_dirs.append(entry)
+
+    return bin_dirs
+
+
+def get_toolbox_dirs() -> List[Path]:
+    """Get the JetBrains Toolbox apps directories for this platform
+
+    Returns:
+        list: The Toolbox apps directories
+    """
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData/Local")
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library/Application Support"
+    else:
+        base = Path(os.environ.get("XDG_DATA_HOME") or Path.home() / ".local/share")
+
+    return [base / "JetBrains/Toolbox/apps"]
+
+
+def get_system_prefixes() -> List[Path]:
+    """Get the directories PyCharm is commonly installed into on this
+    platform
+
+    Returns:
+        list: The install prefixes
+    """
+    if sys.platform == "win32":
+        return [
+            Path(os.environ[name]) / "JetBrains"
+            for name in ("ProgramFiles", "ProgramFiles(x86)")
+            if name in os.environ
+        ]
+    if sys.platform == "darwin":
+        return [Path("/Applications"), Path.home() / "Applications"]
+
+    return [
+        Path("/opt"),
+        Path("/usr/local"),
+        Path("/usr/share"),
+        Path.home() / ".local/share",
+        Path("/snap"),
+    ]
+
+
+def read_build_number(root: Path) -> Tuple[int, ...]:
+    """Read the build number of a PyCharm installation
+
+    Args:
+        root (Path): The installation root
+
+    Returns:
+        tuple: The build number components, e.g. (241, 18034, 82), or an
+            empty tuple if unknown
+    """
+    build = ""
+    try:
+        product_info = root.joinpath("product-info.json")
+        with open(product_info.as_posix(), encoding="utf-8") as file:
+            build = str(json.load(file).get("buildNumber", ""))
+    except (OSError, ValueError, AttributeError):
+        try:
+            build = root.joinpath("build.txt").read_text(encoding="utf-8")
+        except OSError:
+            return ()
+
+    build = build.strip().split("-")[-1]  # PY-241.18034.82
+    try:
+        return tuple(int(part) for part in build.split(".") if part)
+    except ValueError:
+        return ()
+
+
+def _is_install_root(path: Path) -> bool:
+    return path.joinpath("bin").is_dir()
+
+
+def _scan_toolbox(scan: _Scan, apps_dir: Path) -> None:
+    for app in scan.children(apps_dir):
+        if "pycharm" not in app.name.lower():
+            continue
+        if _is_install_root(app):  # Toolbox 2.x layout
+            scan.add(app, "toolbox")
+        for channel in scan.children(app):  # Toolbox 1.x ch-*/<build>
+            if channel.name.startswith("ch-") is False:
+                continue
+            for build_dir in scan.children(channel):
+                if _is_install_root(build_dir):
+                    scan.add(build_dir, "toolbox")
+
+
+def _scan_prefix(scan: _Scan, prefix: Path) -> None:
+    for child in scan.children(prefix):
+        if child.name.lower().startswith("pycharm") is False:
+            continue
+        if child.suffix == ".app":
+            child = child.joinpath("Contents")
+        elif prefix.name == "snap":
+            child = child.joinpath("current")
+        if _is_install_root(child):
+            scan.add(child, "system")
+
+
+def _scan() -> _Scan:
+    scan = _Scan()
+
+    for bin_dir in get_env_bin_dirs():
+        scan.watch(Path(bin_dir))
+        if Path(bin_dir).is_dir():
+            scan.add(Path(bin_dir).parent, "env")
+
+    for apps_dir in get_toolbox_dirs():
+        _scan_toolbox(scan, apps_dir)
+
+    for prefix in get_system_prefixes():
+        _scan_prefix(scan, prefix)
+
+    # newest build first, sorted() is stable so discovery order breaks ties
+    scan.installations = sorted(
+        scan.installations, key=lambda install: install.build, reverse=True
+    )
+    return scan
+
+
+def _is_current(env_bin_dirs: List[str], index: dict) -> bool:
+    if index.get("version") != INDEX_VERSION or index.get("env") != env_bin_dirs:
+        return False
+
+    for directory, mtime in index.get("dir_mtimes", {}).items():
+        try:
+            current: Optional[int] = os.stat(directory).st_mtime_ns
+        except OSError:
+            current = None
+        if current != mtime:
+            return False
+
+    return True
+
+
+def _get_index_path() -> Optional[Path]:
+    saved_dir = get_saved_dir()
+    if saved_dir is None:
+        return None
+    return saved_dir.joinpath(INDEX_FILE_NAME)
+
+
+def _load_index(index_path: Optional[Path]) -> dict:
+    if index_path is None:
+        return {}
+    try:
+        with open(index_path.as_posix(), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+_index: dict = {}
+
+
+def find_installations() -> List[PyCharmInstallation]:
+    """Find PyCharm installations from PyCharm* environment variables,
+    JetBrains Toolbox and the standard install prefixes, newest build first
+
+    The result is kept in memory and persisted next to the project's Saved
+    files, and is only rescanned when the environment variables or the
+    modification time of any scanned directory change.
+
+    Returns:
+        list: The installations found
+    """
+    global _index  # pylint: disable=global-statement
+
+    env_bin_dirs = get_env_bin_dirs()
+    index_path = _get_index_path()
+
+    if _is_current(env_bin_dirs, _index) is False:
+        _index = _load_index(index_path)
+
+        if _is_current(env_bin_dirs, _index) is False:
+            scan = _scan()
+            _index = {
+                "version": INDEX_VERSION,
+                "env": env_bin_dirs,
+                "dir_mtimes": scan.dir_mtimes,
+                "installations": [install._asdict() for install in scan.installations],
+            }
+            if index_path is not None:
+                try:
+                    index_path.parent.mkdir(parents=True, exist_ok=True)
+                    atomic_write_json(index_path, _index)
+                except OSError:
+                    pass  # the in-memory index still avoids rescanning
+
+    return [
+        PyCharmInstallation(
+            root=install["root"],
+            egg=install["egg"],
+            build=tuple(install["build"]),
+            source=install["source"],
+        )
+        for install in _index["installations"]
+    ]
+
+
+def clear_index() -> None:
+    """Drop the in-memory installation index"""
+    global _index  # pylint: disable=global-statement
+
+    _index = {}
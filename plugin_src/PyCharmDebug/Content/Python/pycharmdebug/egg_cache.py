@@ -0,0 +1,155 @@
+from pathlib import Path
+from typing import (
+    Dict,
+    Tuple,
+)
+import compileall
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+
+import unreal
+
+from .paths import (
+    PLUGIN_SAVED_DIR,
+    get_saved_dir,
+)
+
+
+CACHE_DIR = "egg_cache"
+ENTRY_PREFIX = "pydevd-"
+COMPLETE_MARKER = ".complete"
+HASH_LENGTH = 16
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_egg_hashes: Dict[Tuple[str, int, int], str] = {}
+
+
+def get_cache_root() -> Path:
+    """Get the directory extracted debug eggs are cached in, inside the
+    project Saved directory when available
+
+    Returns:
+        Path: The egg cache directory
+    """
+    saved_dir = get_saved_dir()
+    if saved_dir is None:
+        saved_dir = Path(tempfile.gettempdir()).joinpath(PLUGIN_SAVED_DIR)
+
+    return saved_dir.joinpath(CACHE_DIR)
+
+
+def get_egg_hash(egg_path: Path) -> str:
+    """Get a short content hash of the debug egg, memoized on the egg's
+    modification time and size so it is only computed once per egg
+
+    Args:
+        egg_path (Path): Path to the debug egg
+
+    Returns:
+        str: The egg content hash
+    """
+    stat = egg_path.stat()
+    memo_key = (egg_path.as_posix(), stat.st_mtime_ns, stat.st_size)
+
+    egg_hash = _egg_hashes.get(memo_key)
+    if egg_hash is None:
+        digest = hashlib.sha1()
+        with open(egg_path.as_posix(), "rb") as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        egg_hash = digest.hexdigest()[:HASH_LENGTH]
+        _egg_hashes[memo_key] = egg_hash
+
+    return egg_hash
+
+
+def get_python_tag() -> str:
+    """Get the running Python version as cache entries are suffixed with it
+
+    Returns:
+        str: e.g. ``py311``
+    """
+    return f"py{sys.version_info.major}{sys.version_info.minor}"
+
+
+def get_cache_entry_name(egg_path: Path) -> str:
+    """Get the cache directory name for a debug egg, keyed by the egg content
+    and the running Python version
+
+    Args:
+        egg_path (Path): Path to the debug egg
+
+    Returns:
+        str: The cache entry directory name
+    """
+    return f"{ENTRY_PREFIX}{get_egg_hash(egg_path)}-{get_python_tag()}"
+
+
+def evict_stale_entries(cache_root: Path, keep: str) -> None:
+    """Remove cached eggs other than the one in use, for the running Python
+    version only, so editors on other Python versions sharing the project
+    keep their own entries
+
+    Args:
+        cache_root (Path): The egg cache directory
+        keep (str): Name of the cache entry to keep
+    """
+    suffix = f"-{get_python_tag()}"
+    for entry in cache_root.iterdir():
+        if (
+            entry.name == keep
+            or entry.name.startswith(ENTRY_PREFIX) is False
+            or entry.name.endswith(suffix) is False
+        ):
+            continue
+        shutil.rmtree(entry.as_posix(), ignore_errors=True)
+
+
+def prepare_egg(egg: str) -> str:
+    """Extract and byte-compile a debug egg into the local cache, so pydevd is
+    imported from compiled modules rather than through zipimport
+
+    Args:
+        egg (str): Path to the debug egg
+
+    Returns:
+        str: Path to the extracted egg contents
+    """
+    egg_path = Path(egg)
+    cache_root = get_cache_root()
+    entry_name = get_cache_entry_name(egg_path)
+    entry = cache_root.joinpath(entry_name)
+
+    if entry.joinpath(COMPLETE_MARKER).is_file():
+        return entry.as_posix()
+
+    cache_root.mkdir(parents=True, exist_ok=True)
+    unreal.log(f"Extracting {egg_path.name} to {entry.as_posix()}")
+
+    staging = Path(tempfile.mkdtemp(prefix=f".{entry_name}.", dir=cache_root))
+    try:
+        with zipfile.ZipFile(egg_path.as_posix()) as archive:
+            archive.extractall(staging.as_posix())
+        # compile in process, worker processes would spawn new editor instances
+        compileall.compile_dir(staging.as_posix(), quiet=1)
+        staging.joinpath(COMPLETE_MARKER).touch()
+
+        if entry.is_dir():  # left over from an interrupted eviction
+            shutil.rmtree(entry.as_posix(), ignore_errors=True)
+
+        try:
+            os.replace(staging.as_posix(), entry.as_posix())
+        except OSError:
+            # another editor instance finished the same entry first
+            if entry.joinpath(COMPLETE_MARKER).is_file() is False:
+                raise
+    finally:
+        shutil.rmtree(staging.as_posix(), ignore_errors=True)
+
+    evict_stale_entries(cache_root, keep=entry_name)
+
+    return entry.as_posix()
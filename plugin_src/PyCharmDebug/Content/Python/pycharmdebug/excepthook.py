@@ -0,0 +1,137 @@
+from types import TracebackType
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    Type,
+)
+import sys
+import threading
+
+
+ExceptHook = Callable[
+    [Type[BaseException], BaseException, Optional[TracebackType]], Any
+]
+
+IGNORED_EXCEPTIONS = (KeyboardInterrupt, SystemExit)
+
+_previous_excepthook: Optional[ExceptHook] = None
+_previous_threading_excepthook: Optional[Callable[[Any], Any]] = None
+_lock = threading.Lock()
+
+
+def post_mortem(
+    exc_type: Optional[Type[BaseException]] = None,
+    exc: Optional[BaseException] = None,
+    tb: Optional[TracebackType] = None,
+) -> bool:
+    """Connect to the PyCharm debugger and show an exception at the frame
+    that raised it
+
+    Without arguments the exception currently being handled is used, so this
+    can be called from an ``except`` block. The connection is made without
+    tracing and stays open afterwards.
+
+    Args:
+        exc_type (type): The exception type, defaults to None
+        exc (BaseException): The exception, defaults to None
+        tb (TracebackType): The traceback, defaults to None
+
+    Returns:
+        bool: True if the debugger showed the exception
+    """
+    if exc is None:
+        exc_type, exc, tb = sys.exc_info()
+    if exc_type is None or exc is None:
+        return False
+
+    import unreal
+
+    from .exceptions import PyCharmDebugRuntimeError
+    from .session import SESSION
+
+    with _lock:  # one connect, even if several threads fail at once
+        if SESSION.active is False:
+            from .actions.connect import connect
+            from .utils import (
+                get_debug_egg,
+                get_debug_port,
+            )
+
+            unreal.log(f"Unhandled {exc_type.__name__}, attaching PyCharm debugger")
+            try:
+                dbg_egg, port = get_debug_egg(), get_debug_port()
+            except PyCharmDebugRuntimeError as ex:
+                unreal.log_error(str(ex))
+                return False
+
+            if connect(dbg_egg, port, suspend=False, trace_on_connect=False) is False:
+                return False
+
+    return SESSION.post_mortem((exc_type, exc, tb))
+
+
+def _is_enabled() -> bool:
+    from .utils import get_config_value
+
+    try:
+        return bool(get_config_value("post_mortem"))
+    except Exception:  # pylint: disable=broad-exception-caught
+        return False  # never hide the original exception behind a config error
+
+
+def _excepthook(
+    exc_type: Type[BaseException], exc: BaseException, tb: Optional[TracebackType]
+) -> None:
+    if issubclass(exc_type, IGNORED_EXCEPTIONS) is False and _is_enabled():
+        post_mortem(exc_type, exc, tb)
+
+    if _previous_excepthook is not None:
+        _previous_excepthook(exc_type, exc, tb)
+
+
+def _threading_excepthook(args: Any) -> None:
+    if (
+        args.exc_value is not None
+        and issubclass(args.exc_type, IGNORED_EXCEPTIONS) is False
+        and _is_enabled()
+    ):
+        post_mortem(args.exc_type, args.exc_value, args.exc_traceback)
+
+    if _previous_threading_excepthook is not None:
+        _previous_threading_excepthook(args)
+
+
+def install() -> None:
+    """Install the post-mortem exception hooks, chaining to the previous ones
+
+    Unreal reports errors in Python it runs itself, e.g. the Output Log
+    console, startup scripts, menu entries and tick callbacks, through its own
+    handler, so those never reach ``sys.excepthook``. In the editor the hooks
+    mostly catch exceptions that end a ``threading.Thread``; call
+    :func:`post_mortem` from an ``except`` block for the other entry points.
+    Nothing is imported or read until an exception goes unhandled, the
+    post_mortem config value is checked at that point.
+    """
+    global _previous_excepthook, _previous_threading_excepthook  # pylint: disable=global-statement
+
+    if sys.excepthook is _excepthook:
+        return
+
+    _previous_excepthook = sys.excepthook
+    sys.excepthook = _excepthook
+    _previous_threading_excepthook = threading.excepthook
+    threading.excepthook = _threading_excepthook
+
+
+def uninstall() -> None:
+    """Restore the exception hooks replaced by :func:`install`"""
+    global _previous_excepthook, _previous_threading_excepthook  # pylint: disable=global-statement
+
+    if sys.excepthook is not _excepthook:
+        return
+
+    sys.excepthook = _previous_excepthook or sys.__excepthook__
+    threading.excepthook = _previous_threading_excepthook or threading.__excepthook__
+    _previous_excepthook = None
+    _previous_threading_excepthook = None
@@ -0,0 +1,171 @@
+from typing import (
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+import os
+import threading
+
+from .exceptions import PyCharmDebugRuntimeError
+
+
+ENV_VAR = "PYCHARMDEBUG"
+HOST_ENV_VAR = "PYCHARMDEBUG_HOST"
+PORT_ENV_VAR = "PYCHARMDEBUG_PORT"
+TIMEOUT_ENV_VAR = "PYCHARMDEBUG_TIMEOUT"
+COMMAND_LINE_TOKEN = "-pycharmdebug"
+MODE_WAIT = "wait"
+MODE_STRICT = "strict"
+MODES = (MODE_WAIT, MODE_STRICT)
+ENABLED_VALUES = ("1", "true", "yes", "on")
+WORKER_THREAD_NAME = "PyCharmDebugAutoAttach"
+
+
+class AutoAttachRequest(NamedTuple):
+    """An auto-attach asked for through the environment or command line"""
+
+    mode: str
+    host: Optional[str] = None
+    port: Optional[int] = None
+    timeout: Optional[float] = None
+
+
+def _parse_mode(value: str) -> Optional[str]:
+    value = value.strip().lower()
+    if value in MODES:
+        return value
+    if value in ENABLED_VALUES:
+        return MODE_WAIT
+    return None
+
+
+def _command_line_mode() -> Optional[str]:
+    import unreal
+
+    for token in str(unreal.SystemLibrary.get_command_line()).split():
+        name, _, value = token.partition("=")
+        if name.lower() == COMMAND_LINE_TOKEN:
+            return _parse_mode(value or MODE_WAIT)
+
+    return None
+
+
+def get_request() -> Optional[AutoAttachRequest]:
+    """Get the auto-attach request, from the PYCHARMDEBUG environment
+    variable or a ``-PyCharmDebug[=wait|strict]`` command line token
+
+    Host, port and timeout can be overridden with the PYCHARMDEBUG_HOST,
+    PYCHARMDEBUG_PORT and PYCHARMDEBUG_TIMEOUT environment variables.
+
+    Returns:
+        AutoAttachRequest: The request, or None if auto-attach wasn't asked for
+
+    Raises:
+        PyCharmDebugRuntimeError:
+            Invalid port or timeout override
+    """
+    value = os.environ.get(ENV_VAR)
+    mode = _command_line_mode() if value is None else _parse_mode(value)
+    if mode is None:
+        return None
+
+    port = os.environ.get(PORT_ENV_VAR)
+    timeout = os.environ.get(TIMEOUT_ENV_VAR)
+    try:
+        return AutoAttachRequest(
+            mode=mode,
+            host=os.environ.get(HOST_ENV_VAR) or None,
+            port=int(port) if port else None,
+            timeout=float(timeout) if timeout else None,
+        )
+    except ValueError as ex:
+        raise PyCharmDebugRuntimeError(
+            f"Invalid {PORT_ENV_VAR} or {TIMEOUT_ENV_VAR}: {ex}"
+        ) from ex
+
+
+def auto_attach() -> Optional[threading.Thread]:
+    """Attach to the PyCharm debugger at startup without a menu or widget,
+    for commandlets and -nullrhi runs
+
+    Without a request this reads nothing but the environment and command
+    line, pydevd and the config are left alone. In ``wait`` mode the debug
+    server is waited for on a worker thread and startup carries on. In
+    ``strict`` mode startup blocks until attached and fails if the server
+    doesn't answer within the timeout. An invalid host, port or timeout
+    override is logged as an error and nothing is attached.
+
+    Returns:
+        threading.Thread: The worker thread in wait mode, otherwise None
+
+    Raises:
+        PyCharmDebugRuntimeError:
+            Strict mode failed to attach to the debug server
+    """
+    try:
+        request = get_request()
+    except PyCharmDebugRuntimeError as ex:
+        import unreal
+
+        unreal.log_error(str(ex))
+        return None
+
+    if request is None:
+        return None
+
+    if request.mode == MODE_STRICT:
+        _attach(request)
+        return None
+
+    worker = threading.Thread(
+        target=_attach, args=(request,), name=WORKER_THREAD_NAME, daemon=True
+    )
+    worker.start()
+    return worker
+
+
+def _resolve(request: AutoAttachRequest) -> Tuple[str, str, int, float]:
+    """Fill in the debug egg, host, port and timeout the request leaves out
+    from the config"""
+    from .utils import (
+        get_config_value,
+        get_debug_egg,
+        get_debug_host,
+        get_debug_port,
+    )
+
+    return (
+        get_debug_egg(),
+        request.host or get_debug_host(),
+        request.port or get_debug_port(),
+        request.timeout or get_config_value("connect_timeout"),
+    )
+
+
+def _attach(request: AutoAttachRequest) -> None:
+    import unreal
+
+    from .actions.connect import attach
+    from .connection import (
+        log_latency,
+        wait_for_server,
+    )
+
+    try:
+        dbg_egg, host, port, timeout = _resolve(request)
+
+        unreal.log(f"Waiting for PyCharm debugger on {host}:{port} ({request.mode})")
+        latency = wait_for_server(host, port, timeout)
+        if latency is None:
+            raise PyCharmDebugRuntimeError(
+                f"No PyCharm debug server found on {host}:{port} after {timeout:g}s"
+            )
+        log_latency(host, port, latency)
+
+        # from the worker thread every thread has to be traced, not just this one
+        if attach(dbg_egg, port, host=host, trace_only_current_thread=False) is False:
+            raise PyCharmDebugRuntimeError("Failed to attach to PyCharm debugger")
+    except PyCharmDebugRuntimeError as ex:
+        unreal.log_error(str(ex))
+        if request.mode == MODE_STRICT:
+            raise
@@ -0,0 +1,239 @@
+from pathlib import Path
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+import re
+import tempfile
+import time
+import tracemalloc
+
+from .constants import (
+    DEFAULT_MAX_SNAPSHOTS,
+    DEFAULT_TOP_N,
+)
+from .exceptions import PyCharmDebugRuntimeError
+from .paths import (
+    PLUGIN_SAVED_DIR,
+    get_saved_dir,
+)
+
+
+MEMORY_DIR = "memory"
+SNAPSHOT_PREFIX = "snapshot"
+UNSAFE_FILE_CHARS = re.compile(r"[^\w.-]")
+# allocations made by tracemalloc and the import system are noise in a diff
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def format_size(size: float) -> str:
+    """Format a byte count for the log
+
+    Args:
+        size (float): Number of bytes, may be negative
+
+    Returns:
+        str: e.g. ``+1.5 MiB``
+    """
+    sign = "-" if size < 0 else "+"
+    size = abs(size)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{sign}{size:.1f} {unit}"
+        size /= 1024
+    return f"{sign}{size:.1f} GiB"
+
+
+class MemoryTracker:
+    """Named tracemalloc snapshots of the editor's Python allocations
+
+    tracemalloc slows allocations down and holds a traceback per live block,
+    so it only runs between :meth:`start` and :meth:`stop`. Snapshots are kept
+    by name until stopped. The baseline and named snapshots are always kept,
+    of the numbered ones only the ``max_snapshots`` newest, since each one
+    holds a copy of every traced block.
+    """
+
+    def __init__(self, max_snapshots: int = DEFAULT_MAX_SNAPSHOTS) -> None:
+        self.max_snapshots = max_snapshots
+        self.snapshots: Dict[str, tracemalloc.Snapshot] = {}
+        self.baseline: Optional[str] = None
+        self._numbered: List[str] = []  # oldest first, the ones evicted
+        self._taken = 0
+        self._started_tracing = False
+
+    @property
+    def running(self) -> bool:
+        """bool: True while allocations are traced"""
+        return tracemalloc.is_tracing()
+
+    def start(self) -> str:
+        """Start tracing allocations and take a baseline snapshot
+
+        Returns:
+            str: Name of the baseline snapshot
+        """
+        if tracemalloc.is_tracing() is False:
+            tracemalloc.start()
+            self._started_tracing = True
+
+        self.baseline = self.take_snapshot()
+        self._numbered.remove(self.baseline)
+        return self.baseline
+
+    def stop(self) -> None:
+        """Drop the snapshots and stop tracing, unless tracing was already on
+        before :meth:`start`"""
+        self.snapshots.clear()
+        self.baseline = None
+        self._numbered.clear()
+        self._taken = 0
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def take_snapshot(self, name: Optional[str] = None) -> str:
+        """Take a snapshot of the allocations traced so far, dropping the
+        oldest numbered one once more than ``max_snapshots`` are kept
+
+        Args:
+            name (str): Name to keep the snapshot under, defaults to None
+                which numbers it, e.g. ``snapshot-2``
+
+        Returns:
+            str: The snapshot name
+
+        Raises:
+            PyCharmDebugRuntimeError:
+                Memory tracing was not started
+        """
+        if tracemalloc.is_tracing() is False:
+            raise PyCharmDebugRuntimeError("Memory tracing was not started")
+
+        self._taken += 1
+        if name is None:
+            name = f"{SNAPSHOT_PREFIX}-{self._taken}"
+            self._numbered.append(name)
+        elif name in self._numbered:
+            self._numbered.remove(name)  # named now, so kept
+
+        self.snapshots.pop(name, None)  # re-taken snapshots become the newest
+        self.snapshots[name] = tracemalloc.take_snapshot().filter_traces(
+            SNAPSHOT_FILTERS
+        )
+        while len(self._numbered) > max(self.max_snapshots, 1):
+            del self.snapshots[self._numbered.pop(0)]
+
+        return name
+
+    def diff(
+        self, old: str, new: str, limit: int = DEFAULT_TOP_N
+    ) -> List[tracemalloc.StatisticDiff]:
+        """Compare two snapshots, grouped by the file and line that allocated
+
+        Args:
+            old (str): Name of the earlier snapshot
+            new (str): Name of the later snapshot
+            limit (int): Number of lines to return, biggest growth first,
+                defaults to 20
+
+        Returns:
+            list: The allocation differences
+
+        Raises:
+            PyCharmDebugRuntimeError:
+                No snapshot with that name
+        """
+        for name in (old, new):
+            if name not in self.snapshots:
+                raise PyCharmDebugRuntimeError(f"No memory snapshot named {name}")
+
+        stats = self.snapshots[new].compare_to(self.snapshots[old], "lineno")
+        return stats[:limit]
+
+    def latest_pair(self) -> Optional[Tuple[str, str]]:
+        """Get the names of the two newest snapshots
+
+        Returns:
+            tuple: The older and newer name, or None if there are fewer than
+                two snapshots
+        """
+        if len(self.snapshots) < 2:
+            return None
+
+        names = list(self.snapshots)
+        return names[-2], names[-1]
+
+
+def format_diff(old: str, new: str, stats: List[tracemalloc.StatisticDiff]) -> str:
+    """Format a snapshot diff, one line per allocating file and line
+
+    Args:
+        old (str): Name of the earlier snapshot
+        new (str): Name of the later snapshot
+        stats (list): The allocation differences
+
+    Returns:
+        str: The formatted diff
+    """
+    growth = sum(stat.size_diff for stat in stats)
+    lines = [f"Top {len(stats)} allocation changes from {old} to {new}:"]
+    for stat in stats:
+        frame = stat.traceback[0]
+        lines.append(
+            f"  {format_size(stat.size_diff):>12} ({stat.count_diff:+d} blocks)"
+            f"  total {format_size(stat.size)[1:]:>10}"
+            f"  {frame.filename}:{frame.lineno}"
+        )
+    lines.append(f"Net change over these lines: {format_size(growth)}")
+
+    return "\n".join(lines)
+
+
+def get_memory_dir() -> Path:
+    """Get the directory memory diffs are written to, inside the project
+    Saved directory when available
+
+    Returns:
+        Path: The memory report directory
+    """
+    saved_dir = get_saved_dir()
+    if saved_dir is None:
+        saved_dir = Path(tempfile.gettempdir()).joinpath(PLUGIN_SAVED_DIR)
+
+    return saved_dir.joinpath(MEMORY_DIR)
+
+
+def write_diff(
+    old: str, new: str, report: str, directory: Optional[Path] = None
+) -> Path:
+    """Write a formatted diff to a timestamped file
+
+    Args:
+        old (str): Name of the earlier snapshot
+        new (str): Name of the later snapshot
+        report (str): The formatted diff
+        directory (Path): Where to write the file, defaults to
+            Saved/PyCharmDebug/memory
+
+    Returns:
+        Path: The written file
+    """
+    directory = directory or get_memory_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    names = UNSAFE_FILE_CHARS.sub("_", f"{old}-to-{new}")
+    path = directory.joinpath(f"memory-{stamp}-{names}.txt")
+    path.write_text(report + "\n", encoding="utf-8")
+    return path
+
+
+MEMORY = MemoryTracker()
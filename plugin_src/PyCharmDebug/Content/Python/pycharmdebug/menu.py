@@ -1,29 +1,205 @@
+from importlib import import_module
+from typing import (
+    Dict,
+    NamedTuple,
+)
+import sys
+
 import unreal
 
-from .actions import (
-    PyCharmDebugConnect,
-    PyCharmDebugDisconnect,
-    PyCharmDebugConfig,
+
+LEVEL_EDITOR_MENU = "LevelEditor.MainMenu"
+ACTIONS_PACKAGE = f"{__package__}.actions"
+
+
+class MenuEntry(NamedTuple):
+    """A menu entry and the action class it runs"""
+
+    name: str
+    label: str
+    icon_style: str
+    icon_name: str
+    module: str
+    class_name: str
+    tool_bar_button: bool = False
+    show_state: bool = False
+    show_threads: bool = False
+
+
+MENU_ENTRIES = (
+    MenuEntry(
+        name="start_debugger",
+        label="Connect",
+        icon_style="EditorStyle",
+        icon_name="Sequencer.IconKeyBreak",
+        module="connect",
+        class_name="PyCharmDebugConnect",
+        tool_bar_button=True,
+        show_state=True,
+    ),
+    MenuEntry(
+        name="stop_debugger",
+        label="Disconnect",
+        icon_style="EditorStyle",
+        icon_name="Sequencer.IconKeyAuto",
+        module="disconnect",
+        class_name="PyCharmDebugDisconnect",
+    ),
+    MenuEntry(
+        name="trace_threads",
+        label="Trace Threads",
+        icon_style="EditorStyle",
+        icon_name="Sequencer.IconKeyBreak",
+        module="threads",
+        class_name="PyCharmDebugTraceThreads",
+        show_threads=True,
+    ),
+    MenuEntry(
+        name="start_profiler",
+        label="Profile",
+        icon_style="EditorStyle",
+        icon_name="Profiler.Tab",
+        module="profile",
+        class_name="PyCharmDebugProfileStart",
+    ),
+    MenuEntry(
+        name="stop_profiler",
+        label="Stop Profile",
+        icon_style="EditorStyle",
+        icon_name="Profiler.Tab",
+        module="profile",
+        class_name="PyCharmDebugProfileStop",
+    ),
+    MenuEntry(
+        name="start_memory_trace",
+        label="Trace Memory",
+        icon_style="EditorStyle",
+        icon_name="MemoryProfiler.Tab",
+        module="memory",
+        class_name="PyCharmDebugMemoryStart",
+    ),
+    MenuEntry(
+        name="memory_snapshot",
+        label="Memory Snapshot",
+        icon_style="EditorStyle",
+        icon_name="MemoryProfiler.Tab",
+        module="memory",
+        class_name="PyCharmDebugMemorySnapshot",
+    ),
+    MenuEntry(
+        name="stop_memory_trace",
+        label="Stop Memory Trace",
+        icon_style="EditorStyle",
+        icon_name="MemoryProfiler.Tab",
+        module="memory",
+        class_name="PyCharmDebugMemoryStop",
+    ),
+    MenuEntry(
+        name="config_debugger",
+        label="Configure",
+        icon_style="EditorStyle",
+        icon_name="AutomationTools.MenuIcon",
+        module="config",
+        class_name="PyCharmDebugConfig",
+    ),
 )
 
+_ENTRIES_BY_NAME: Dict[str, MenuEntry] = {entry.name: entry for entry in MENU_ENTRIES}
+_actions: Dict[str, unreal.ToolMenuEntryScript] = {}
+
+
+def get_action(name: str) -> unreal.ToolMenuEntryScript:
+    """Get the action for a menu entry, importing and constructing it on
+    first use
+
+    Args:
+        name (str): The menu entry name
+
+    Returns:
+        unreal.ToolMenuEntryScript: The menu action
+    """
+    action = _actions.get(name)
+    if action is None:
+        entry = _ENTRIES_BY_NAME[name]
+        module = import_module(f"{ACTIONS_PACKAGE}.{entry.module}")
+        action = getattr(module, entry.class_name)()
+        _actions[name] = action
+
+    return action
 
-LEVEL_EDITOR_MENU = "LevelEditor.MainMenu"
 
+@unreal.uclass()
+class PyCharmDebugMenuEntry(unreal.ToolMenuEntryScript):
+    """Lightweight menu entry, the real action is only imported when the
+    entry is first clicked"""
 
-def install() -> None:
-    """Install the PyCharm debugger menu items into the level editor"""
+    @unreal.ufunction(override=True)
+    def execute(self, context: unreal.ToolMenuContext) -> None:
+        """Run the menu entry's action
+
+        Args:
+            context (unreal.ToolMenuContext): ToolMenuContext context object
+        """
+        get_action(str(self.data.name)).execute(context)
+
+    @unreal.ufunction(override=True)
+    def get_label(
+        self, context: unreal.ToolMenuContext  # pylint: disable=(unused-argument)
+    ) -> str:
+        """Get the entry label, with the connection state or traced threads
+        appended for the entries that show them
+
+        Args:
+            context (unreal.ToolMenuContext): ToolMenuContext context object
+
+        Returns:
+            str: The entry label
+        """
+        entry = _ENTRIES_BY_NAME[str(self.data.name)]
+        session = sys.modules.get(f"{__package__}.session")
+        if entry.show_threads and session is not None:
+            threads = session.get_thread_selection()
+            return f"{entry.label} ({threads})" if threads else entry.label
+
+        supervisor = sys.modules.get(f"{__package__}.supervisor")
+        if entry.show_state is False or supervisor is None:
+            return entry.label  # nothing was ever connected
+
+        return f"{entry.label} ({supervisor.get_connection_state()})"
+
+
+def _create_menu_entry(entry: MenuEntry) -> unreal.ToolMenuEntryScript:
+    script = PyCharmDebugMenuEntry()
+    script.data.name = entry.name
+    script.data.label = entry.label
+    script.data.icon = unreal.ScriptSlateIcon(entry.icon_style, entry.icon_name)
+    if entry.tool_bar_button:
+        script.data.advanced.entry_type = unreal.MultiBlockType.TOOL_BAR_BUTTON
+
+    return script
+
+
+def install(lazy: bool = True) -> None:
+    """Install the PyCharm debugger menu items into the level editor
+
+    Args:
+        lazy (bool): Register lightweight entries that import their action on
+            first use, rather than constructing every action up front,
+            defaults to True
+    """
     tool_menus = unreal.ToolMenus.get()
     tool_bar = tool_menus.find_menu(LEVEL_EDITOR_MENU)
 
-    start_action = PyCharmDebugConnect()
-    stop_action = PyCharmDebugDisconnect()
-    config_action = PyCharmDebugConfig()
-
     dbg_menu = tool_bar.add_sub_menu("dbg_menu", "Python", "PyCharmDebug", "PyCharm")
 
-    for action in [start_action, stop_action, config_action]:
+    for entry in MENU_ENTRIES:
+        if lazy:
+            script = _create_menu_entry(entry)
+        else:
+            script = get_action(entry.name)
+
         menu_entry = unreal.ToolMenuEntry(type=unreal.MultiBlockType.MENU_ENTRY)
-        menu_entry.script_object = action
+        menu_entry.script_object = script
         dbg_menu.add_menu_entry("Items", menu_entry)
 
     tool_menus.refresh_all_widgets()
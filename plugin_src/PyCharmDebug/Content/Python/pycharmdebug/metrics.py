@@ -0,0 +1,301 @@
+from collections import deque
+from contextlib import ContextDecorator
+from pathlib import Path
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+import json
+import math
+import os
+import threading
+import time
+
+import unreal
+
+from .paths import get_log_dir
+
+
+METRICS_FILE_NAME = "PyCharmDebugMetrics.jsonl"
+METRICS_FILE_MAX_SIZE = 1024 * 1024  # bytes, rotated once per session above this
+RING_BUFFER_SIZE = 512
+CONNECT_STEPS = (
+    "config_load",
+    "egg_resolve",
+    "egg_extract",
+    "pydevd_import",
+    "handshake",
+    "settrace",
+)
+
+
+class Metric(NamedTuple):
+    """One timed plugin operation"""
+
+    name: str
+    duration: float  # seconds
+    timestamp: float  # wall clock seconds since the epoch, when it finished
+    ok: bool = True
+    fields: Optional[Dict[str, Any]] = None
+
+    def to_json(self) -> str:
+        """Serialize the metric as one JSON line
+
+        Returns:
+            str: The metric as JSON, without a trailing newline
+        """
+        record = {
+            "name": self.name,
+            "duration_ms": round(self.duration * 1000, 3),
+            "timestamp": self.timestamp,
+            "ok": self.ok,
+            "pid": os.getpid(),
+        }
+        record.update(self.fields or {})
+        return json.dumps(record, default=str)
+
+
+class MetricSummary(NamedTuple):
+    """Percentiles of the recorded durations of one operation, in seconds"""
+
+    name: str
+    calls: int
+    p50: float
+    p95: float
+    max: float
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """Get a nearest-rank percentile
+
+    Args:
+        values (Sequence[float]): The values, sorted ascending
+        percent (float): The percentile, between 0 and 100
+
+    Returns:
+        float: The value at the percentile, 0.0 if there are no values
+    """
+    if not values:
+        return 0.0
+
+    rank = max(math.ceil(percent / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+class MetricsRecorder:
+    """Keep the most recent timings in a ring buffer and append every timing
+    to Saved/Logs/PyCharmDebugMetrics.jsonl
+
+    Recording only costs an append to the buffer and one line to the file,
+    percentiles are computed when a summary is asked for.
+    """
+
+    def __init__(self, size: int = RING_BUFFER_SIZE) -> None:
+        self.export = True
+        self._records: Deque[Metric] = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._path: Optional[Path] = None
+        self._resolved = False
+
+    def record(
+        self, name: str, duration: float, ok: bool = True, **fields: Any
+    ) -> Metric:
+        """Record the duration of an operation
+
+        Args:
+            name (str): The operation name
+            duration (float): How long it took in seconds
+            ok (bool): False if the operation failed, defaults to True
+            **fields: Extra values written with the record
+
+        Returns:
+            Metric: The recorded metric
+        """
+        metric = Metric(name, duration, time.time(), ok, fields)
+        with self._lock:
+            self._records.append(metric)
+            if self.export:
+                self._write(metric)
+
+        return metric
+
+    def _get_path(self) -> Optional[Path]:
+        if self._resolved is False:
+            self._resolved = True
+            log_dir = get_log_dir()
+            if log_dir is not None:
+                self._path = log_dir.joinpath(METRICS_FILE_NAME)
+                self._rotate(self._path)
+
+        return self._path
+
+    @staticmethod
+    def _rotate(path: Path) -> None:
+        try:
+            if path.stat().st_size > METRICS_FILE_MAX_SIZE:
+                os.replace(path.as_posix(), f"{path.as_posix()}.bak")
+        except OSError:
+            pass
+
+    def _write(self, metric: Metric) -> None:
+        path = self._get_path()
+        if path is None:
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path.as_posix(), "a", encoding="utf-8") as file:
+                file.write(metric.to_json() + "\n")
+        except OSError as ex:
+            self.export = False
+            unreal.log_warning(
+                f"Failed to write PyCharmDebug metrics, not exporting: {ex}"
+            )
+
+    def records(self, name: Optional[str] = None) -> List[Metric]:
+        """Get the metrics in the ring buffer, oldest first
+
+        Args:
+            name (str): Only get metrics of this operation, defaults to None
+
+        Returns:
+            list: The metrics
+        """
+        with self._lock:
+            records = list(self._records)
+
+        return [metric for metric in records if name is None or metric.name == name]
+
+    def last(self, name: str) -> Optional[Metric]:
+        """Get the most recent metric of an operation
+
+        Args:
+            name (str): The operation name
+
+        Returns:
+            Metric: The metric, or None if the operation wasn't recorded
+        """
+        with self._lock:
+            for metric in reversed(self._records):
+                if metric.name == name:
+                    return metric
+
+        return None
+
+    def summary(self) -> Dict[str, MetricSummary]:
+        """Get the p50 and p95 durations of each operation in the ring buffer
+
+        Returns:
+            dict: Summaries keyed by operation name
+        """
+        durations: Dict[str, List[float]] = {}
+        for metric in self.records():
+            durations.setdefault(metric.name, []).append(metric.duration)
+
+        summaries = {}
+        for name, values in durations.items():
+            values.sort()
+            summaries[name] = MetricSummary(
+                name,
+                len(values),
+                percentile(values, 50),
+                percentile(values, 95),
+                values[-1],
+            )
+
+        return summaries
+
+    def clear(self) -> None:
+        """Drop the metrics in the ring buffer, the file is left alone"""
+        with self._lock:
+            self._records.clear()
+
+    def timed(self, name: str, **fields: Any) -> "_Timer":
+        """Time a block or function with the monotonic clock, see
+        :func:`timed`"""
+        return _Timer(self, name, fields)
+
+
+class _Timer(ContextDecorator):
+    """Record how long a block takes, failures are recorded with ok False"""
+
+    def __init__(
+        self, recorder: MetricsRecorder, name: str, fields: Dict[str, Any]
+    ) -> None:
+        self.recorder = recorder
+        self.name = name
+        self.fields = fields
+        self._start = 0.0
+
+    def _recreate_cm(self) -> "_Timer":
+        # a fresh instance per call keeps nested and threaded use independent
+        return _Timer(self.recorder, self.name, self.fields)
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        self.recorder.record(
+            self.name,
+            time.perf_counter() - self._start,
+            ok=exc_type is None,
+            **self.fields,
+        )
+
+
+METRICS = MetricsRecorder()
+
+
+def timed(name: str, **fields: Any) -> _Timer:
+    """Time a plugin operation, usable as ``with timed("name"):`` or
+    ``@timed("name")``
+
+    Args:
+        name (str): The operation name
+        **fields: Extra values written with the record
+
+    Returns:
+        The timing context manager
+    """
+    return METRICS.timed(name, **fields)
+
+
+def format_timings(names: Sequence[str] = CONNECT_STEPS) -> str:
+    """Format the most recent duration of each operation for the log
+
+    Args:
+        names (Sequence[str]): The operations, defaults to the connect steps
+
+    Returns:
+        str: e.g. ``pydevd_import 120.3 ms, settrace 41.0 ms``
+    """
+    timings = []
+    for name in names:
+        metric = METRICS.last(name)
+        if metric is not None:
+            timings.append(f"{name} {metric.duration * 1000:.1f} ms")
+
+    return ", ".join(timings)
+
+
+def log_summary() -> Dict[str, MetricSummary]:
+    """Log the p50 and p95 duration of each recorded operation
+
+    Returns:
+        dict: Summaries keyed by operation name
+    """
+    summaries = METRICS.summary()
+    for summary in summaries.values():
+        unreal.log(
+            f"PyCharmDebug {summary.name}: {summary.calls} calls, "
+            f"p50 {summary.p50 * 1000:.1f} ms, p95 {summary.p95 * 1000:.1f} ms, "
+            f"max {summary.max * 1000:.1f} ms"
+        )
+
+    return summaries
@@ -0,0 +1,217 @@
+from typing import (
+    Any,
+    Callable,
+    List,
+    NamedTuple,
+    Optional,
+    TextIO,
+)
+import sys
+import threading
+import time
+
+from .constants import (
+    DEFAULT_OUTPUT_FLUSH_INTERVAL,
+    DEFAULT_OUTPUT_FLUSH_SIZE,
+    DEFAULT_OUTPUT_RATE_LIMIT,
+    OUTPUT_BUFFERED,
+)
+
+
+STDOUT_CONTEXT = 1  # pydevd io message contexts
+STDERR_CONTEXT = 2
+FLUSH_THREAD_NAME = "PyCharmDebugOutput"
+ENCODING = "utf-8"  # pydevd sends io messages to the IDE as UTF-8
+
+SendFunction = Callable[[str, int], None]
+
+
+class OutputSettings(NamedTuple):
+    """How editor stdout and stderr reach the IDE console"""
+
+    mode: str = OUTPUT_BUFFERED
+    flush_size: int = DEFAULT_OUTPUT_FLUSH_SIZE
+    flush_interval: float = DEFAULT_OUTPUT_FLUSH_INTERVAL
+    rate_limit: int = DEFAULT_OUTPUT_RATE_LIMIT
+
+
+class RateLimiter:
+    """Token bucket allowing up to ``rate`` bytes per second, with up to
+    one second's worth of burst"""
+
+    def __init__(self, rate: int) -> None:
+        self.rate = rate
+        self._tokens = float(rate)
+        self._last = time.monotonic()
+
+    def consume(self, size: int) -> int:
+        """Take up to size bytes from the bucket
+
+        Args:
+            size (int): Bytes wanted
+
+        Returns:
+            int: Bytes allowed, less than size once the limit is reached
+        """
+        if self.rate <= 0:
+            return size
+
+        now = time.monotonic()
+        self._tokens = min(self.rate, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+        allowed = min(size, int(self._tokens))
+        self._tokens -= allowed
+        return allowed
+
+
+class OutputForwarder:  # pylint: disable=too-many-instance-attributes
+    """File-like wrapper teeing writes to the original stream right away and
+    to the IDE in batches
+
+    Writes to the IDE are buffered and sent once ``flush_size`` bytes of
+    UTF-8 have collected or ``flush_interval`` has passed. Output over the rate
+    limit is dropped, and the number of dropped bytes is reported in the IDE
+    console once output fits under the limit again. In the editor the original
+    stream is Unreal's own redirect into the Output Log, so output keeps
+    reaching the log without going through ``unreal.log``.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        context: int,
+        send: SendFunction,
+        settings: OutputSettings,
+    ) -> None:
+        self.stream = stream
+        self.context = context
+        self.settings = settings
+        self.dropped = 0
+        self._reported = 0
+        self._send = send
+        self._limiter = RateLimiter(settings.rate_limit)
+        self._buffer: List[str] = []
+        self._size = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        """Write text to the original stream and queue it for the IDE
+
+        Args:
+            text (str): The text to write
+
+        Returns:
+            int: Number of characters written
+        """
+        written = self.stream.write(text)
+
+        with self._lock:
+            self._buffer.append(text)
+            self._size += len(text.encode(ENCODING, "replace"))
+            due = self._size >= self.settings.flush_size
+        if due:
+            self.flush_remote()
+
+        return len(text) if written is None else written
+
+    def flush(self) -> None:
+        """Flush the original stream, IDE output follows on its own schedule"""
+        self.stream.flush()
+
+    def flush_remote(self, force: bool = False) -> None:
+        """Send buffered output to the IDE if the size or time threshold was
+        reached
+
+        Args:
+            force (bool): Send whatever is buffered, defaults to False
+        """
+        with self._lock:
+            now = time.monotonic()
+            if force is False and (
+                self._size < self.settings.flush_size
+                and now - self._last_flush < self.settings.flush_interval
+            ):
+                return
+
+            text = "".join(self._buffer)
+            size = self._size
+            self._buffer.clear()
+            self._size = 0
+            self._last_flush = now
+
+            allowed = self._limiter.consume(size)
+            fits = allowed == size
+            notice = ""
+            if fits is False:
+                # a character cut in half is dropped along with the rest
+                data = text.encode(ENCODING, "replace")[:allowed]
+                text = data.decode(ENCODING, "ignore")
+                self.dropped += size - len(text.encode(ENCODING))
+            if self.dropped > self._reported and (fits or force):
+                notice = (
+                    f"\n[PyCharmDebug: {self.dropped - self._reported} bytes "
+                    f"of output dropped, limit {self.settings.rate_limit}/s]\n"
+                )
+                self._reported = self.dropped
+
+        if text:
+            self._send(text, self.context)
+        if notice:
+            self._send(notice, STDERR_CONTEXT)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.stream, name)
+
+
+class OutputRedirect:
+    """Replace sys.stdout and sys.stderr with forwarders and flush them on a
+    background thread until stopped"""
+
+    def __init__(self, send: SendFunction, settings: OutputSettings) -> None:
+        self.settings = settings
+        self.stdout = OutputForwarder(sys.stdout, STDOUT_CONTEXT, send, settings)
+        self.stderr = OutputForwarder(sys.stderr, STDERR_CONTEXT, send, settings)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def dropped(self) -> int:
+        """int: Bytes of output dropped by the rate limit"""
+        return self.stdout.dropped + self.stderr.dropped
+
+    def start(self) -> None:
+        """Install the forwarders and start the flush thread"""
+        sys.stdout = self.stdout
+        sys.stderr = self.stderr
+        self._thread = threading.Thread(
+            target=self._run, name=FLUSH_THREAD_NAME, daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while self._stop.wait(self.settings.flush_interval) is False:
+            try:
+                self.stdout.flush_remote()
+                self.stderr.flush_remote()
+            except Exception:  # pylint: disable=broad-exception-caught
+                return  # the connection is gone, output still reaches the log
+
+    def stop(self) -> None:
+        """Send any buffered output and restore the original streams"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        if sys.stdout is self.stdout:
+            sys.stdout = self.stdout.stream
+        if sys.stderr is self.stderr:
+            sys.stderr = self.stderr.stream
+
+        try:
+            self.stdout.flush_remote(force=True)
+            self.stderr.flush_remote(force=True)
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass
@@ -0,0 +1,39 @@
+from pathlib import Path
+from typing import Optional
+
+
+PLUGIN_SAVED_DIR = "PyCharmDebug"
+CONFIG_FILE_NAME = "tool_config.json"
+USER_CONFIG_DIR = ".pycharmdebug"
+STUDIO_CONFIG_ENV_VAR = "PYCHARMDEBUG_STUDIO_CONFIG"
+
+
+def get_saved_dir() -> Optional[Path]:
+    """Get the plugin's directory inside the project Saved directory
+
+    Returns:
+        Path: The plugin saved directory, or None if the project Saved
+            directory can't be resolved
+    """
+    import unreal  # debugged child processes import paths without unreal
+
+    saved_dir = unreal.Paths.project_saved_dir()
+    if isinstance(saved_dir, str) is False or saved_dir == "":
+        return None
+
+    return Path(saved_dir).joinpath(PLUGIN_SAVED_DIR)
+
+
+def get_log_dir() -> Optional[Path]:
+    """Get the project Saved/Logs directory
+
+    Returns:
+        Path: The project log directory, or None if it can't be resolved
+    """
+    import unreal
+
+    log_dir = unreal.Paths.project_log_dir()
+    if isinstance(log_dir, str) is False or log_dir == "":
+        return None
+
+    return Path(log_dir)
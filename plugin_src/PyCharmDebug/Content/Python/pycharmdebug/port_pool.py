@@ -0,0 +1,164 @@
+from pathlib import Path
+from typing import (
+    IO,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+import atexit
+import json
+import os
+import sys
+import tempfile
+
+from .config_store import (
+    try_lock_file,
+    unlock_file,
+)
+from .exceptions import PyCharmDebugRuntimeError
+from .paths import PLUGIN_SAVED_DIR
+
+
+REGISTRY_DIR = "ports"
+LOCK_SUFFIX = ".lock"
+INFO_SUFFIX = ".json"
+
+
+class PortLease(NamedTuple):
+    """A debug port held by a running Unreal process"""
+
+    port: int
+    pid: int
+    executable: str
+
+
+class _HeldPort(NamedTuple):
+    port: int
+    lock_file: IO
+
+
+_held: Optional[_HeldPort] = None
+
+
+def get_registry_dir() -> Path:
+    """Get the machine wide directory the port leases are kept in
+
+    Returns:
+        Path: The port registry directory
+    """
+    return Path(tempfile.gettempdir()).joinpath(PLUGIN_SAVED_DIR, REGISTRY_DIR)
+
+
+def _lock_path(registry: Path, port: int) -> Path:
+    return registry.joinpath(f"{port}{LOCK_SUFFIX}")
+
+
+def _info_path(registry: Path, port: int) -> Path:
+    return registry.joinpath(f"{port}{INFO_SUFFIX}")
+
+
+def allocate_port(port_range: Sequence[int]) -> int:
+    """Get this process's debug port, taking the first free port in the range
+    on first use
+
+    Each port is leased by holding a lock on its file in the registry
+    directory for the lifetime of the process, so the operating system frees
+    the lease even if the editor crashes. The lease is also released on exit.
+
+    Args:
+        port_range (Sequence[int]): First and last port of the range
+
+    Returns:
+        int: The leased port
+
+    Raises:
+        PyCharmDebugRuntimeError:
+            No free debug port in the range
+    """
+    global _held  # pylint: disable=global-statement
+
+    first, last = port_range
+    if _held is not None and first <= _held.port <= last:
+        return _held.port
+    release_port()
+
+    registry = get_registry_dir()
+    registry.mkdir(parents=True, exist_ok=True)
+
+    for port in range(first, last + 1):
+        lock_file = open(  # pylint: disable=consider-using-with
+            _lock_path(registry, port).as_posix(), "a+b"
+        )
+        if try_lock_file(lock_file) is False:
+            lock_file.close()
+            continue
+
+        info = {"port": port, "pid": os.getpid(), "executable": sys.executable}
+        _info_path(registry, port).write_text(json.dumps(info), encoding="utf-8")
+        _held = _HeldPort(port, lock_file)
+        return port
+
+    raise PyCharmDebugRuntimeError(
+        f"No free debug port between {first} and {last}, every port is used by "
+        "another Unreal process"
+    )
+
+
+def release_port() -> None:
+    """Give back the port leased by this process"""
+    global _held  # pylint: disable=global-statement
+
+    if _held is None:
+        return
+
+    registry = get_registry_dir()
+    try:
+        _info_path(registry, _held.port).unlink()
+    except OSError:
+        pass
+    unlock_file(_held.lock_file)
+    _held.lock_file.close()
+    _held = None
+
+
+def get_held_port() -> Optional[int]:
+    """Get the port leased by this process
+
+    Returns:
+        int: The leased port, or None if no port is leased
+    """
+    return None if _held is None else _held.port
+
+
+def list_ports() -> List[PortLease]:
+    """List the debug ports leased by running Unreal processes on this
+    machine, leases left behind by processes that are gone are skipped
+
+    Returns:
+        list: The leases, sorted by port
+    """
+    registry = get_registry_dir()
+    if registry.is_dir() is False:
+        return []
+
+    leases = []
+    for info_path in sorted(registry.glob(f"*{INFO_SUFFIX}")):
+        try:
+            info = json.loads(info_path.read_text(encoding="utf-8"))
+            port = int(info["port"])
+        except (OSError, ValueError, KeyError):
+            continue
+
+        if port != get_held_port():
+            with open(_lock_path(registry, port).as_posix(), "a+b") as lock_file:
+                if try_lock_file(lock_file):  # nobody holds it any more
+                    unlock_file(lock_file)
+                    continue
+
+        leases.append(PortLease(port, int(info["pid"]), str(info.get("executable"))))
+
+    return sorted(leases)
+
+
+atexit.register(release_port)
@@ -0,0 +1,269 @@
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import (
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+import json
+import sys
+import tempfile
+import threading
+import time
+
+from .constants import (
+    DEFAULT_SAMPLE_RATE,
+    FORMAT_COLLAPSED,
+    FORMAT_SPEEDSCOPE,
+)
+from .exceptions import PyCharmDebugRuntimeError
+from .metrics import timed
+from .paths import (
+    PLUGIN_SAVED_DIR,
+    get_saved_dir,
+)
+
+
+PROFILE_DIR = "profiles"
+PROFILE_SUFFIXES = {
+    FORMAT_SPEEDSCOPE: ".speedscope.json",
+    FORMAT_COLLAPSED: ".collapsed.txt",
+}
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+MAX_STACK_DEPTH = 256
+SAMPLER_THREAD_NAME = "PyCharmDebugProfiler"
+
+
+class StackFrame(NamedTuple):
+    """A function on a sampled stack"""
+
+    name: str
+    file: str
+    line: int
+
+
+Stack = Tuple[StackFrame, ...]
+
+
+def _walk_stack(frame: Optional[FrameType]) -> Stack:
+    stack: List[StackFrame] = []
+    while frame is not None and len(stack) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        stack.append(StackFrame(code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+
+    stack.reverse()  # root first, as flame graphs expect
+    return tuple(stack)
+
+
+def _sample(profile: "Profile", own_ident: int) -> None:
+    # a function of its own so no sampled frame outlives the sample
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    frames = sys._current_frames()  # pylint: disable=protected-access
+    for ident, frame in frames.items():
+        if ident != own_ident:
+            thread_name = names.get(ident, f"Thread-{ident}")
+            profile.samples[(thread_name, _walk_stack(frame))] += 1
+
+
+class Profile:
+    """Stacks collected by a :class:`SamplingProfiler`, counted per thread"""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.started = time.time()
+        self.duration = 0.0
+
+    @property
+    def sample_count(self) -> int:
+        """int: Number of stacks sampled over every thread"""
+        return sum(self.samples.values())
+
+    def to_collapsed(self) -> str:
+        """Format the samples as collapsed stacks, one ``thread;frame;frame
+        count`` line per distinct stack, as read by flamegraph.pl, speedscope
+        and most flame graph viewers
+
+        Returns:
+            str: The collapsed stacks
+        """
+        lines = []
+        for (thread_name, stack), count in sorted(self.samples.items()):
+            frames = [thread_name.replace(";", "_")] + [
+                f"{frame.name} ({frame.file}:{frame.line})".replace(";", "_")
+                for frame in stack
+            ]
+            lines.append(f"{';'.join(frames)} {count}")
+
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def to_speedscope(self, name: str = "Unreal Editor Python") -> Dict[str, Any]:
+        """Format the samples as a speedscope file, one sampled profile per
+        thread
+
+        Args:
+            name (str): Name shown in speedscope
+
+        Returns:
+            dict: The speedscope file contents
+        """
+        frame_indices: Dict[StackFrame, int] = {}
+        profiles: Dict[str, Dict[str, Any]] = {}
+
+        for (thread_name, stack), count in sorted(self.samples.items()):
+            profile = profiles.setdefault(
+                thread_name,
+                {
+                    "type": "sampled",
+                    "name": thread_name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": self.duration,
+                    "samples": [],
+                    "weights": [],
+                },
+            )
+            profile["samples"].append(
+                [frame_indices.setdefault(frame, len(frame_indices)) for frame in stack]
+            )
+            profile["weights"].append(count * self.interval)
+
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "pycharmdebug",
+            "shared": {
+                "frames": [
+                    {"name": frame.name, "file": frame.file, "line": frame.line}
+                    for frame in frame_indices
+                ]
+            },
+            "profiles": list(profiles.values()),
+        }
+
+
+class SamplingProfiler:
+    """Sample the stacks of every Python thread from a background thread
+
+    No trace or profile hook is installed, the sampled code runs at full
+    speed. Each sample reads ``sys._current_frames()`` and so briefly holds
+    the GIL, the cost grows with the sample rate and the stack depth rather
+    than with the number of calls made.
+    """
+
+    def __init__(self) -> None:
+        self.profile: Optional[Profile] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """bool: True while sampling"""
+        return self._thread is not None
+
+    def start(self, rate: float = DEFAULT_SAMPLE_RATE) -> None:
+        """Start sampling
+
+        Args:
+            rate (float): Samples per second, defaults to 100
+
+        Raises:
+            PyCharmDebugRuntimeError:
+                The profiler is already running
+        """
+        if self._thread is not None:
+            raise PyCharmDebugRuntimeError("The profiler is already running")
+
+        self.profile = Profile(1.0 / rate)
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=SAMPLER_THREAD_NAME, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> Optional[Profile]:
+        """Stop sampling
+
+        Returns:
+            Profile: The collected samples, or None if the profiler wasn't
+                running
+        """
+        if self._thread is None:
+            return None
+
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        return self.profile
+
+    def _run(self) -> None:
+        profile = self.profile
+        if profile is None:
+            return
+
+        own_ident = threading.get_ident()
+        start = time.perf_counter()
+        next_sample = start
+        while True:
+            next_sample += profile.interval
+            # skip missed samples rather than bursting to catch up
+            next_sample = max(next_sample, time.perf_counter())
+            if self._stop.wait(next_sample - time.perf_counter()):
+                break
+
+            _sample(profile, own_ident)
+
+        profile.duration = time.perf_counter() - start
+
+
+PROFILER = SamplingProfiler()
+
+
+def get_profile_dir() -> Path:
+    """Get the directory profiles are written to, inside the project Saved
+    directory when available
+
+    Returns:
+        Path: The profile directory
+    """
+    saved_dir = get_saved_dir()
+    if saved_dir is None:
+        saved_dir = Path(tempfile.gettempdir()).joinpath(PLUGIN_SAVED_DIR)
+
+    return saved_dir.joinpath(PROFILE_DIR)
+
+
+@timed("profile_write")
+def write_profile(
+    profile: Profile,
+    profile_format: str = FORMAT_SPEEDSCOPE,
+    directory: Optional[Path] = None,
+) -> Path:
+    """Write a profile to a timestamped file
+
+    Args:
+        profile (Profile): The profile to write
+        profile_format (str): speedscope or collapsed, defaults to speedscope
+        directory (Path): Where to write the file, defaults to
+            Saved/PyCharmDebug/profiles
+
+    Returns:
+        Path: The written file
+    """
+    directory = directory or get_profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(profile.started))
+    path = directory.joinpath(f"profile-{stamp}{PROFILE_SUFFIXES[profile_format]}")
+
+    if profile_format == FORMAT_COLLAPSED:
+        path.write_text(profile.to_collapsed(), encoding="utf-8")
+    else:
+        path.write_text(json.dumps(profile.to_speedscope()), encoding="utf-8")
+
+    return path
@@ -0,0 +1,465 @@
+from types import (
+    FrameType,
+    ModuleType,
+    TracebackType,
+)
+from typing import (
+    Any,
+    Optional,
+    Tuple,
+    Type,
+)
+import os
+import sys
+import threading
+
+import unreal
+
+from .backends import (
+    PYDEVD_MONITORING_ENV_VAR,
+    get_pydevd_backend,
+    resolve_backend,
+)
+from .constants import (
+    BACKEND_AUTO,
+    BACKEND_MONITORING,
+    OUTPUT_BUFFERED,
+    OUTPUT_DIRECT,
+    THREADS_ALL,
+    THREADS_CURRENT,
+)
+from .exceptions import PyCharmDebugRuntimeError
+from .metrics import timed
+from .output import (
+    OutputRedirect,
+    OutputSettings,
+)
+from .threads import (
+    ThreadSelection,
+    clear_selection,
+    set_selection,
+)
+from .trace_filter import TraceFilter
+
+
+class DebugSession:  # pylint: disable=too-many-instance-attributes
+    """State of the debugger connection for this editor session
+
+    The debug egg is added to sys.path once and the imported pydevd_pycharm
+    module is kept, so reconnecting never re-scans the egg. Connecting while
+    already attached is a no-op.
+    """
+
+    def __init__(self) -> None:
+        self._pydevd: Optional[ModuleType] = None
+        self.active = False
+        self.host: Optional[str] = None
+        self.port: Optional[int] = None
+        self.backend: Optional[str] = None
+        self.trace_on_connect = True
+        self.output: Optional[OutputRedirect] = None
+        self.threads = ThreadSelection()
+        self._threads = threading.local()
+
+    @property
+    def imported(self) -> bool:
+        """bool: True once pydevd_pycharm has been imported"""
+        return self._pydevd is not None
+
+    def import_pydevd(self, dbg_egg: str, backend: str = BACKEND_AUTO) -> ModuleType:
+        """Import pydevd_pycharm, from the debug egg if one is set
+
+        pydevd picks its trace backend on import, so the backend of the first
+        import is kept for the rest of the editor session. The backend pydevd
+        actually picked is recorded, it may not support the requested one.
+
+        Args:
+            dbg_egg (str): Path to the debug egg or its extracted contents,
+                or an empty string to use an installed pydevd-pycharm package
+            backend (str): Trace backend, one of auto, settrace or
+                sys_monitoring, defaults to auto
+
+        Returns:
+            ModuleType: The pydevd_pycharm module
+
+        Raises:
+            PyCharmDebugRuntimeError:
+                Failed to import pydevd_pycharm
+        """
+        if self._pydevd is not None:
+            if backend != BACKEND_AUTO and resolve_backend(backend) != self.backend:
+                unreal.log_warning(
+                    f"pydevd is already using the {self.backend} backend, restart "
+                    "the editor to change it"
+                )
+            return self._pydevd
+
+        if dbg_egg and dbg_egg not in sys.path:
+            sys.path.append(dbg_egg)
+
+        resolved_backend = resolve_backend(backend)
+        os.environ[PYDEVD_MONITORING_ENV_VAR] = (
+            "true" if resolved_backend == BACKEND_MONITORING else "false"
+        )
+
+        try:
+            with timed("pydevd_import", backend=resolved_backend):
+                import pydevd_pycharm
+        except ImportError as ex:
+            raise PyCharmDebugRuntimeError("Failed to import pydevd_pycharm") from ex
+
+        self._pydevd = pydevd_pycharm
+        self.backend = get_pydevd_backend(resolved_backend)
+        if self.backend != resolved_backend:
+            unreal.log_warning(
+                f"pydevd does not support the {resolved_backend} backend, using "
+                f"{self.backend}"
+            )
+        return pydevd_pycharm
+
+    def attach(  # pylint: disable=too-many-arguments
+        self,
+        dbg_egg: str,
+        host: str,
+        port: int,
+        *,
+        trace_filter: Optional[TraceFilter] = None,
+        backend: str = BACKEND_AUTO,
+        trace_on_connect: bool = True,
+        output: OutputSettings = OutputSettings(),
+        threads: Optional[ThreadSelection] = None,
+        **settrace_kwargs: Any,
+    ) -> bool:
+        """Connect to the debug server and start tracing
+
+        Args:
+            dbg_egg (str): Path to the debug egg
+            host (str): The debug server host
+            port (int): The debug server port
+            trace_filter (TraceFilter): Limits which files and modules are
+                traced, defaults to None
+            backend (str): Trace backend, one of auto, settrace or
+                sys_monitoring, defaults to auto
+            trace_on_connect (bool): Trace every thread once connected, when
+                False code is only traced inside traced() blocks, defaults to
+                True
+            output (OutputSettings): How stdout and stderr are forwarded to
+                the IDE, defaults to buffered forwarding
+            threads (ThreadSelection): Limits which threads are traced,
+                defaults to None which traces every thread
+            **settrace_kwargs: Extra keyword arguments for settrace
+
+        Returns:
+            bool: True if a new connection was made, False if already attached
+
+        Raises:
+            PyCharmDebugRuntimeError:
+                Failed to import pydevd_pycharm
+        """
+        if self.active:
+            unreal.log_warning("Already connected to PyCharm debugger")
+            return False
+
+        pydevd_pycharm = self.import_pydevd(dbg_egg, backend)
+        settrace_kwargs.setdefault("stdoutToServer", output.mode == OUTPUT_DIRECT)
+        settrace_kwargs.setdefault("stderrToServer", output.mode == OUTPUT_DIRECT)
+        if trace_on_connect is False or (
+            threads is not None and threads.mode == THREADS_CURRENT
+        ):
+            settrace_kwargs.setdefault("trace_only_current_thread", True)
+        with timed("settrace", host=host, port=port):
+            pydevd_pycharm.settrace(host, port=port, **settrace_kwargs)
+
+        self.active = True
+        self.host = host
+        self.port = port
+        self.trace_on_connect = trace_on_connect
+        self._threads = threading.local()
+        if trace_on_connect is False:
+            self._threads.tracing = True  # settrace still traced this thread
+            self.set_tracing(False)
+        unreal.log(f"Connected to PyCharm debugger ({self.backend} backend)")
+
+        if threads is not None and threads.mode != THREADS_ALL:
+            self.set_thread_selection(threads)
+
+        if output.mode == OUTPUT_BUFFERED:
+            self.start_output_forwarding(output)
+
+        if trace_filter:
+            self.apply_trace_filter(trace_filter)
+
+        return True
+
+    def apply_trace_filter(self, trace_filter: TraceFilter) -> bool:
+        """Hand a trace filter to the connected debugger
+
+        Args:
+            trace_filter (TraceFilter): The trace filter
+
+        Returns:
+            bool: True if the debugger accepted the filter
+        """
+        try:
+            import pydevd
+            from _pydevd_bundle.pydevd_filtering import ExcludeFilter
+        except ImportError:
+            unreal.log_warning("This pydevd version does not support trace filters")
+            return False
+
+        py_db = pydevd.get_global_debugger()
+        if py_db is None or hasattr(py_db, "set_exclude_filters") is False:
+            unreal.log_warning("This pydevd version does not support trace filters")
+            return False
+
+        py_db.set_exclude_filters(
+            [ExcludeFilter(*exclude) for exclude in trace_filter.to_pydevd_filters()]
+        )
+        return True
+
+    def start_output_forwarding(self, settings: OutputSettings) -> bool:
+        """Forward stdout and stderr to the IDE console in rate-limited
+        batches, output still reaches the editor log as it is written
+
+        Args:
+            settings (OutputSettings): Batch size, interval and rate limit
+
+        Returns:
+            bool: True if forwarding was started
+        """
+        try:
+            import pydevd
+        except ImportError:
+            return False
+
+        py_db = pydevd.get_global_debugger()
+        if py_db is None or hasattr(py_db, "cmd_factory") is False:
+            unreal.log_warning("This pydevd version does not support output forwarding")
+            return False
+
+        def send(text: str, context: int) -> None:
+            py_db.writer.add_command(py_db.cmd_factory.make_io_message(text, context))
+
+        self.stop_output_forwarding()
+        self.output = OutputRedirect(send, settings)
+        self.output.start()
+        return True
+
+    def stop_output_forwarding(self) -> None:
+        """Send any buffered output and restore stdout and stderr"""
+        if self.output is None:
+            return
+
+        self.output.stop()
+        if self.output.dropped:
+            unreal.log_warning(
+                f"{self.output.dropped} bytes of output were not forwarded "
+                "to PyCharm, raise output_rate_limit to see more"
+            )
+        self.output = None
+
+    def is_connected(self) -> bool:
+        """Check the debugger still has a live connection to the IDE, from
+        pydevd's own state so the socket is never touched
+
+        Returns:
+            bool: False once pydevd has dropped the connection
+        """
+        if self.active is False:
+            return False
+
+        try:
+            import pydevd
+        except ImportError:
+            return False
+
+        py_db = pydevd.get_global_debugger()
+        if py_db is None or getattr(py_db, "_finish_debugging_session", False):
+            return False
+
+        writer = getattr(py_db, "writer", None)
+        is_alive = getattr(writer, "is_alive", None)
+        return is_alive is None or bool(is_alive())
+
+    def is_tracing(self) -> bool:
+        """Check whether the current thread is traced
+
+        Returns:
+            bool: True if attached and the current thread is traced
+        """
+        if self.active is False:
+            return False
+
+        return getattr(self._threads, "tracing", self.trace_on_connect)
+
+    def set_tracing(self, enabled: bool) -> bool:
+        """Switch tracing of the current thread on or off, the connection
+        stays open either way
+
+        Args:
+            enabled (bool): True to trace the current thread
+
+        Returns:
+            bool: True if the tracing state was changed
+        """
+        if self.active is False or self._pydevd is None:
+            return False
+        if self.is_tracing() == enabled:
+            return False
+
+        if enabled:
+            # settrace while connected also traces the frames already running
+            self._pydevd.settrace(
+                self.host,
+                port=self.port,
+                suspend=False,
+                trace_only_current_thread=True,
+            )
+        else:
+            try:
+                import pydevd
+            except ImportError:
+                return False
+
+            py_db = pydevd.get_global_debugger()
+            if py_db is None or hasattr(py_db, "disable_tracing") is False:
+                unreal.log_warning(
+                    "This pydevd version does not support scoped tracing"
+                )
+                return False
+            py_db.disable_tracing()
+
+        self._threads.tracing = enabled
+        return True
+
+    def set_thread_selection(self, selection: ThreadSelection) -> bool:
+        """Switch which threads are traced, while attached or for the next
+        connection
+
+        Args:
+            selection (ThreadSelection): The threads to trace
+
+        Returns:
+            bool: True if applied to a live connection
+        """
+        self.threads = selection
+        if self.active is False:
+            return False
+
+        # marks the dropped threads first, pydevd skips them below
+        set_selection(selection)
+        if selection.mode != THREADS_CURRENT:
+            try:
+                import pydevd
+            except ImportError:
+                return False
+
+            # trace threads started later, and threads that were left untraced
+            py_db = pydevd.get_global_debugger()
+            for name in ("patch_threads", "set_tracing_for_untraced_contexts"):
+                method = getattr(py_db, name, None)
+                if method is not None:
+                    method()
+
+        if self.trace_on_connect:
+            self.set_tracing(selection.selects(threading.current_thread()))
+
+        unreal.log(f"PyCharm debugger is tracing {selection.describe()}")
+        return True
+
+    def suspend(self, frame: Optional[FrameType] = None) -> bool:
+        """Pause the connected debugger
+
+        Args:
+            frame (FrameType): Frame to stop at, defaults to None which stops
+                at the caller of settrace
+
+        Returns:
+            bool: True if the debugger was asked to suspend, False if not
+                attached
+        """
+        if self.active is False or self._pydevd is None:
+            return False
+
+        self._pydevd.settrace(
+            self.host, port=self.port, suspend=True, stop_at_frame=frame
+        )
+        self._threads.tracing = True
+        return True
+
+    def post_mortem(
+        self,
+        exc_info: Tuple[Type[BaseException], BaseException, Optional[TracebackType]],
+    ) -> bool:
+        """Show an exception in the connected debugger, stopping the current
+        thread at the frame that raised it until resumed from PyCharm
+
+        Args:
+            exc_info (tuple): The exception type, value and traceback
+
+        Returns:
+            bool: True if the debugger showed the exception
+        """
+        if self.active is False:
+            return False
+
+        try:
+            import pydevd
+            from _pydevd_bundle.pydevd_additional_thread_info import (
+                set_additional_thread_info,
+            )
+            from _pydevd_bundle.pydevd_breakpoints import stop_on_unhandled_exception
+        except ImportError:
+            unreal.log_warning("This pydevd version does not support post-mortem")
+            return False
+
+        py_db = pydevd.get_global_debugger()
+        if py_db is None:
+            return False
+
+        thread = threading.current_thread()
+        stop_on_unhandled_exception(
+            py_db, thread, set_additional_thread_info(thread), exc_info
+        )
+        return True
+
+    def detach(self) -> bool:
+        """Stop tracing and disconnect from the debug server
+
+        Returns:
+            bool: True if a connection was closed, False if not attached
+        """
+        if self.active is False or self._pydevd is None:
+            return False
+
+        with timed("disconnect"):
+            self.stop_output_forwarding()
+            self._pydevd.stoptrace()
+
+        self.active = False
+        self.host = None
+        self.port = None
+        clear_selection()
+        unreal.log("Disconnected from PyCharm debugger")
+        return True
+
+
+SESSION = DebugSession()
+
+
+def get_active_backend() -> Optional[str]:
+    """Get the trace backend of the current debugger connection
+
+    Returns:
+        str: settrace or sys_monitoring, or None if not attached
+    """
+    return SESSION.backend if SESSION.active else None
+
+
+def get_thread_selection() -> Optional[str]:
+    """Describe which threads the current debugger connection traces
+
+    Returns:
+        str: e.g. ``current thread (MainThread)``, or None if not attached
+    """
+    return SESSION.threads.describe() if SESSION.active else None
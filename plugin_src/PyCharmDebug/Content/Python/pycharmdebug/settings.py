@@ -0,0 +1,633 @@
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+import json
+import os
+
+import unreal
+
+from .config_store import (
+    CONFIG_STORE,
+    ConfigStore,
+    StatKey,
+)
+from .constants import (
+    BACKEND_AUTO,
+    BACKENDS,
+    DEFAULT_MAX_SNAPSHOTS,
+    DEFAULT_OUTPUT_FLUSH_INTERVAL,
+    DEFAULT_OUTPUT_FLUSH_SIZE,
+    DEFAULT_OUTPUT_RATE_LIMIT,
+    DEFAULT_SAMPLE_RATE,
+    DEFAULT_TOP_N,
+    DEFAULT_WATCHDOG_THRESHOLD,
+    FORMAT_SPEEDSCOPE,
+    MIN_MAX_SNAPSHOTS,
+    OUTPUT_BUFFERED,
+    OUTPUT_MODES,
+    PROFILE_FORMATS,
+    THREAD_MODES,
+    THREADS_ALL,
+)
+from .exceptions import (
+    PyCharmDebugRuntimeError,
+    PyCharmDebugTypeError,
+)
+from .metrics import timed
+from .paths import (
+    CONFIG_FILE_NAME,
+    STUDIO_CONFIG_ENV_VAR,
+    USER_CONFIG_DIR,
+    get_saved_dir,
+)
+
+
+LAYER_STUDIO = "studio"
+LAYER_PLUGIN = "plugin"
+LAYER_PROJECT = "project"
+LAYER_USER = "user"
+LAYER_ENV = "env"
+ENV_VAR_PREFIX = "PYCHARMDEBUG_"
+DEFAULT_PORT_NUMBER = 5678
+DEFAULT_HOST = "localhost"
+MIN_PORT_NUMBER = 0
+MAX_PORT_NUMBER = 65535  # unsigned 16-bit integer range for port numbers
+DEFAULT_CONNECT_TIMEOUT = 5.0  # seconds
+DEFAULT_HEALTH_CHECK_INTERVAL = 1.0  # seconds
+DEFAULT_RECONNECT_MAX_DELAY = 30.0  # seconds
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "port_number": DEFAULT_PORT_NUMBER,
+    "port_range": [],
+    "host": DEFAULT_HOST,
+    "debug_egg": "",
+    "connect_async": True,
+    "connect_timeout": DEFAULT_CONNECT_TIMEOUT,
+    "extract_egg": True,
+    "trace_include": [],
+    "trace_exclude": [],
+    "trace_backend": BACKEND_AUTO,
+    "breakpoints_enabled": False,
+    "trace_on_connect": True,
+    "trace_threads": THREADS_ALL,
+    "trace_thread_patterns": [],
+    "post_mortem": False,
+    "output_forwarding": OUTPUT_BUFFERED,
+    "output_flush_size": DEFAULT_OUTPUT_FLUSH_SIZE,
+    "output_flush_interval": DEFAULT_OUTPUT_FLUSH_INTERVAL,
+    "output_rate_limit": DEFAULT_OUTPUT_RATE_LIMIT,
+    "health_check_interval": DEFAULT_HEALTH_CHECK_INTERVAL,
+    "reconnect": False,
+    "reconnect_max_delay": DEFAULT_RECONNECT_MAX_DELAY,
+    "profile_sample_rate": DEFAULT_SAMPLE_RATE,
+    "profile_format": FORMAT_SPEEDSCOPE,
+    "memory_top_n": DEFAULT_TOP_N,
+    "memory_max_snapshots": DEFAULT_MAX_SNAPSHOTS,
+    "watchdog_enabled": False,
+    "watchdog_threshold": DEFAULT_WATCHDOG_THRESHOLD,
+    "watchdog_connect_threshold": 0.0,
+    "debug_children": False,
+    "child_include": [],
+    "child_port_range": [],
+}
+
+
+def _validate_port(port: int) -> int:
+    """Validate a port number
+
+    Raises:
+        PyCharmDebugTypeError:
+            Port must be an integer
+        PyCharmDebugRuntimeError:
+            Port must be between 0 and 65535
+    """
+    if isinstance(port, int) is False:
+        raise PyCharmDebugTypeError("Port must be an integer")
+
+    if port < MIN_PORT_NUMBER or port > MAX_PORT_NUMBER:
+        raise PyCharmDebugRuntimeError("Port must be between 0 and 65535")
+
+    return port
+
+
+def _validate_port_range(port_range: List[int]) -> List[int]:
+    """Validate a port range, an empty list clears it
+
+    Raises:
+        PyCharmDebugTypeError:
+            Port range must be a list of two ports
+        PyCharmDebugRuntimeError:
+            Port must be between 0 and 65535
+            First port of the range must not be above the last
+    """
+    if isinstance(port_range, list) is False or len(port_range) not in (0, 2):
+        raise PyCharmDebugTypeError("Port range must be a list of two ports")
+
+    if port_range:
+        first, last = (_validate_port(port) for port in port_range)
+        if first > last:
+            raise PyCharmDebugRuntimeError(
+                "First port of the range must not be above the last"
+            )
+
+    return port_range
+
+
+def _validate_host(host: str) -> str:
+    """Validate a debug server host
+
+    Raises:
+        PyCharmDebugTypeError:
+            Host must be a non-empty string
+    """
+    if isinstance(host, str) is False or host.strip() == "":
+        raise PyCharmDebugTypeError("Host must be a non-empty string")
+
+    return host.strip()
+
+
+def _validate_egg(location: str) -> str:
+    """Validate and normalize a debug egg location, an empty string clears it
+
+    Raises:
+        PyCharmDebugTypeError:
+            Invalid egg file
+    """
+    if location == "":  # allow user to clear the path
+        return location
+
+    egg_path = Path(location.strip('"'))
+    if egg_path.is_file() is False or egg_path.name != "pydevd-pycharm.egg":
+        raise PyCharmDebugTypeError(f"Invalid egg file: {egg_path.as_posix()}")
+
+    return egg_path.as_posix()
+
+
+def _validate_bool(value: bool) -> bool:
+    """Validate a boolean flag
+
+    Raises:
+        PyCharmDebugTypeError:
+            Value must be a boolean
+    """
+    if isinstance(value, bool) is False:
+        raise PyCharmDebugTypeError("Value must be a boolean")
+
+    return value
+
+
+def _validate_timeout(timeout: float) -> float:
+    """Validate a timeout in seconds
+
+    Raises:
+        PyCharmDebugTypeError:
+            Timeout must be a number
+        PyCharmDebugRuntimeError:
+            Timeout must be greater than 0
+    """
+    if isinstance(timeout, bool) or isinstance(timeout, (int, float)) is False:
+        raise PyCharmDebugTypeError("Timeout must be a number")
+
+    if timeout <= 0:
+        raise PyCharmDebugRuntimeError("Timeout must be greater than 0")
+
+    return float(timeout)
+
+
+def _validate_patterns(patterns: List[str]) -> List[str]:
+    """Validate a list of trace filter patterns
+
+    Raises:
+        PyCharmDebugTypeError:
+            Patterns must be a list of strings
+    """
+    if isinstance(patterns, list) is False or any(
+        isinstance(pattern, str) is False for pattern in patterns
+    ):
+        raise PyCharmDebugTypeError("Patterns must be a list of strings")
+
+    return [pattern.strip() for pattern in patterns if pattern.strip()]
+
+
+def _validate_backend(backend: str) -> str:
+    """Validate a trace backend name
+
+    Raises:
+        PyCharmDebugRuntimeError:
+            Unknown trace backend
+    """
+    if backend not in BACKENDS:
+        raise PyCharmDebugRuntimeError(
+            f"Unknown trace backend: {backend}, expected one of {', '.join(BACKENDS)}"
+        )
+
+    return backend
+
+
+def _validate_thread_mode(mode: str) -> str:
+    """Validate a thread selection mode
+
+    Raises:
+        PyCharmDebugRuntimeError:
+            Unknown thread selection mode
+    """
+    if mode not in THREAD_MODES:
+        raise PyCharmDebugRuntimeError(
+            f"Unknown trace_threads mode: {mode}, expected one of "
+            f"{', '.join(THREAD_MODES)}"
+        )
+
+    return mode
+
+
+def _validate_output_mode(mode: str) -> str:
+    """Validate an output forwarding mode
+
+    Raises:
+        PyCharmDebugRuntimeError:
+            Unknown output forwarding mode
+    """
+    if mode not in OUTPUT_MODES:
+        raise PyCharmDebugRuntimeError(
+            f"Unknown output forwarding mode: {mode}, expected one of "
+            f"{', '.join(OUTPUT_MODES)}"
+        )
+
+    return mode
+
+
+def _validate_optional_timeout(timeout: float) -> float:
+    """Validate a timeout in seconds, 0 turns it off
+
+    Raises:
+        PyCharmDebugTypeError:
+            Timeout must be a number
+        PyCharmDebugRuntimeError:
+            Timeout must not be negative
+    """
+    if isinstance(timeout, bool) or isinstance(timeout, (int, float)) is False:
+        raise PyCharmDebugTypeError("Timeout must be a number")
+
+    if timeout < 0:
+        raise PyCharmDebugRuntimeError("Timeout must not be negative")
+
+    return float(timeout)
+
+
+def _validate_rate(rate: float) -> float:
+    """Validate a sample rate in samples per second
+
+    Raises:
+        PyCharmDebugTypeError:
+            Sample rate must be a number
+        PyCharmDebugRuntimeError:
+            Sample rate must be greater than 0
+    """
+    if isinstance(rate, bool) or isinstance(rate, (int, float)) is False:
+        raise PyCharmDebugTypeError("Sample rate must be a number")
+
+    if rate <= 0:
+        raise PyCharmDebugRuntimeError("Sample rate must be greater than 0")
+
+    return float(rate)
+
+
+def _validate_profile_format(profile_format: str) -> str:
+    """Validate a profile output format
+
+    Raises:
+        PyCharmDebugRuntimeError:
+            Unknown profile format
+    """
+    if profile_format not in PROFILE_FORMATS:
+        raise PyCharmDebugRuntimeError(
+            f"Unknown profile format: {profile_format}, expected one of "
+            f"{', '.join(PROFILE_FORMATS)}"
+        )
+
+    return profile_format
+
+
+def _validate_count(count: int) -> int:
+    """Validate a non-negative integer, a size or a rate
+
+    Raises:
+        PyCharmDebugTypeError:
+            Value must be an integer
+        PyCharmDebugRuntimeError:
+            Value must not be negative
+    """
+    if isinstance(count, bool) or isinstance(count, int) is False:
+        raise PyCharmDebugTypeError("Value must be an integer")
+
+    if count < 0:
+        raise PyCharmDebugRuntimeError("Value must not be negative")
+
+    return count
+
+
+def _validate_snapshot_count(count: int) -> int:
+    """Validate the number of numbered memory snapshots kept
+
+    Raises:
+        PyCharmDebugTypeError:
+            Value must be an integer
+        PyCharmDebugRuntimeError:
+            Snapshot count must be at least 2
+    """
+    count = _validate_count(count)
+    if count < MIN_MAX_SNAPSHOTS:
+        raise PyCharmDebugRuntimeError(
+            f"Snapshot count must be at least {MIN_MAX_SNAPSHOTS}"
+        )
+
+    return count
+
+
+CONFIG_VALIDATORS: Dict[str, Callable[[Any], Any]] = {
+    "port_number": _validate_port,
+    "port_range": _validate_port_range,
+    "host": _validate_host,
+    "debug_egg": _validate_egg,
+    "connect_async": _validate_bool,
+    "connect_timeout": _validate_timeout,
+    "extract_egg": _validate_bool,
+    "trace_include": _validate_patterns,
+    "trace_exclude": _validate_patterns,
+    "trace_backend": _validate_backend,
+    "breakpoints_enabled": _validate_bool,
+    "trace_on_connect": _validate_bool,
+    "trace_threads": _validate_thread_mode,
+    "trace_thread_patterns": _validate_patterns,
+    "post_mortem": _validate_bool,
+    "output_forwarding": _validate_output_mode,
+    "output_flush_size": _validate_count,
+    "output_flush_interval": _validate_timeout,
+    "output_rate_limit": _validate_count,
+    "health_check_interval": _validate_timeout,
+    "reconnect": _validate_bool,
+    "reconnect_max_delay": _validate_timeout,
+    "profile_sample_rate": _validate_rate,
+    "profile_format": _validate_profile_format,
+    "memory_top_n": _validate_count,
+    "memory_max_snapshots": _validate_snapshot_count,
+    "watchdog_enabled": _validate_bool,
+    "watchdog_threshold": _validate_timeout,
+    "watchdog_connect_threshold": _validate_optional_timeout,
+    "debug_children": _validate_bool,
+    "child_include": _validate_patterns,
+    "child_port_range": _validate_port_range,
+}
+
+
+class Settings:
+    """Resolved plugin settings, one typed attribute per config key"""
+
+    __slots__ = tuple(DEFAULT_CONFIG)
+
+    port_number: int
+    port_range: List[int]
+    host: str
+    debug_egg: str
+    connect_async: bool
+    connect_timeout: float
+    extract_egg: bool
+    trace_include: List[str]
+    trace_exclude: List[str]
+    trace_backend: str
+    breakpoints_enabled: bool
+    trace_on_connect: bool
+    trace_threads: str
+    trace_thread_patterns: List[str]
+    post_mortem: bool
+    output_forwarding: str
+    output_flush_size: int
+    output_flush_interval: float
+    output_rate_limit: int
+    health_check_interval: float
+    reconnect: bool
+    reconnect_max_delay: float
+    profile_sample_rate: float
+    profile_format: str
+    memory_top_n: int
+    memory_max_snapshots: int
+    watchdog_enabled: bool
+    watchdog_threshold: float
+    watchdog_connect_threshold: float
+    debug_children: bool
+    child_include: List[str]
+    child_port_range: List[int]
+
+    def __init__(self, **values: Any) -> None:
+        for key, default in DEFAULT_CONFIG.items():
+            value = values.get(key, default)
+            setattr(self, key, list(value) if isinstance(value, list) else value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the settings as a dictionary
+
+        Returns:
+            dict: Config keys and their values
+        """
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+class _Layer:
+    """Validated values of one settings layer"""
+
+    def __init__(
+        self,
+        key: Optional[StatKey],
+        values: Dict[str, Any],
+        invalid: Dict[str, str],
+    ) -> None:
+        self.key = key
+        self.values = values
+        self.invalid = invalid
+
+
+def validate_layer(name: str, data: Dict[str, Any]) -> _Layer:
+    """Validate the values of a settings layer, unknown keys and None values
+    are ignored
+
+    Args:
+        name (str): The layer name, used in warnings
+        data (dict): The raw layer values
+
+    Returns:
+        _Layer: The valid values, and an error for each invalid one
+    """
+    values = {}
+    invalid = {}
+    for key, value in data.items():
+        validator = CONFIG_VALIDATORS.get(key)
+        if validator is None or value is None:
+            continue
+
+        try:
+            values[key] = validator(value)
+        except (PyCharmDebugRuntimeError, PyCharmDebugTypeError) as ex:
+            unreal.log_warning(f"Ignoring {key} from the {name} settings: {ex}")
+            invalid[key] = str(ex)
+
+    return _Layer(None, values, invalid)
+
+
+def _parse_env_value(value: str) -> Any:
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value  # plain strings don't need quoting
+
+
+class SettingsResolver:  # pylint: disable=too-many-instance-attributes
+    """Merge the settings layers into one :class:`Settings`, lowest first:
+
+    - the defaults
+    - ``studio``, the file named by PYCHARMDEBUG_STUDIO_CONFIG
+    - ``plugin``, the plugin's Config/tool_config.json
+    - ``project``, Saved/PyCharmDebug/tool_config.json in the project
+    - ``user``, ~/.pycharmdebug/tool_config.json
+    - ``env``, PYCHARMDEBUG_<KEY> environment variables, e.g.
+      PYCHARMDEBUG_PORT_NUMBER
+
+    Each layer is validated when it is loaded and kept, keyed by its file's
+    modification time and size. Getting the settings costs one stat per layer
+    file; a layer is only re-read and the result only merged again when one of
+    those changed. The layer file paths and environment variables are resolved
+    once, until invalidated.
+    """
+
+    def __init__(
+        self,
+        plugin_config: Callable[[], Optional[Path]],
+        store: ConfigStore = CONFIG_STORE,
+    ) -> None:
+        self._plugin_config = plugin_config
+        self._store = store
+        self._layers: Dict[str, _Layer] = {}
+        self._env: Optional[_Layer] = None
+        self._studio_path: Optional[Path] = None
+        self._layer_paths: Optional[List[Tuple[str, Path]]] = None
+        self._settings: Optional[Settings] = None
+        self._key: Optional[Tuple[Any, ...]] = None
+        self.invalid: Dict[str, str] = {}
+
+    def _get_env(self) -> _Layer:
+        if self._env is None:
+            studio_config = os.environ.get(STUDIO_CONFIG_ENV_VAR)
+            self._studio_path = Path(studio_config) if studio_config else None
+            data = {}
+            for key in DEFAULT_CONFIG:
+                value = os.environ.get(f"{ENV_VAR_PREFIX}{key.upper()}")
+                if value is not None:
+                    data[key] = _parse_env_value(value)
+            self._env = validate_layer(LAYER_ENV, data)
+
+        return self._env
+
+    def _read(self, name: str, path: Path) -> Dict[str, Any]:
+        try:
+            data = self._store.read(path)
+        except (OSError, ValueError) as ex:
+            unreal.log_warning(f"Ignoring the {name} settings {path}: {ex}")
+            return {}
+
+        if isinstance(data, dict) is False:
+            unreal.log_warning(f"Ignoring the {name} settings {path}: not an object")
+            return {}
+
+        return data
+
+    def get_layer_paths(self) -> List[Tuple[str, Path]]:
+        """Get the settings files that exist in place, lowest layer first
+
+        Returns:
+            list: Layer names and file paths
+        """
+        if self._layer_paths is not None:
+            return self._layer_paths
+
+        self._get_env()
+        project_dir = get_saved_dir()
+        try:
+            plugin_config: Optional[Path] = self._plugin_config()
+        except PyCharmDebugRuntimeError:
+            plugin_config = None
+
+        paths = [
+            (LAYER_STUDIO, self._studio_path),
+            (LAYER_PLUGIN, plugin_config),
+            (
+                LAYER_PROJECT,
+                project_dir.joinpath(CONFIG_FILE_NAME) if project_dir else None,
+            ),
+            (LAYER_USER, Path.home().joinpath(USER_CONFIG_DIR, CONFIG_FILE_NAME)),
+        ]
+        layer_paths = [(name, path) for name, path in paths if path is not None]
+        if plugin_config is not None:
+            self._layer_paths = layer_paths  # looked up again until it exists
+
+        return layer_paths
+
+    def get(self) -> Settings:
+        """Get the merged settings, re-reading only the layers that changed
+
+        Returns:
+            Settings: The resolved settings
+        """
+        env = self._get_env()
+        layer_paths = self.get_layer_paths()
+        stat_keys = tuple(self._store.stat(path) for _, path in layer_paths)
+        key = tuple(name for name, _ in layer_paths) + stat_keys
+
+        if self._settings is not None and key == self._key:
+            return self._settings
+
+        with timed("config_load"):
+            layers = []
+            for (name, path), stat_key in zip(layer_paths, stat_keys):
+                layer = self._layers.get(name)
+                if layer is None or layer.key != stat_key:
+                    layer = validate_layer(name, self._read(name, path))
+                    layer.key = stat_key
+                    self._layers[name] = layer
+                layers.append(layer)
+            layers.append(env)
+
+            merged = dict(DEFAULT_CONFIG)
+            invalid: Dict[str, str] = {}
+            for layer in layers:
+                merged.update(layer.values)
+                for name in layer.values:
+                    invalid.pop(name, None)
+                invalid.update(layer.invalid)
+
+        self._settings = Settings(**merged)
+        self.invalid = invalid
+        self._key = key
+        return self._settings
+
+    def invalidate(self, layer: Optional[str] = None) -> None:
+        """Drop cached layers, they are read again on the next get
+
+        Args:
+            layer (str): Layer to drop, defaults to None which drops every
+                layer and re-reads the environment
+        """
+        if layer is None:
+            self._layers.clear()
+            self._env = None
+            self._layer_paths = None
+        elif layer == LAYER_ENV:
+            self._env = None
+            self._layer_paths = None  # the studio path comes from the environment
+        else:
+            self._layers.pop(layer, None)
+        self._settings = None
+        self._key = None
@@ -0,0 +1,188 @@
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    Tuple,
+)
+import threading
+import time
+
+import unreal
+
+from .connection import (
+    is_connect_pending,
+    probe_server,
+)
+from .exceptions import PyCharmDebugRuntimeError
+from .session import SESSION
+
+
+STATE_DISCONNECTED = "disconnected"
+STATE_CONNECTING = "connecting"
+STATE_ATTACHED = "attached"
+STATE_LOST = "lost"
+STATES = (STATE_DISCONNECTED, STATE_CONNECTING, STATE_ATTACHED, STATE_LOST)
+RECONNECT_INITIAL_DELAY = 1.0  # seconds
+PROBE_THREAD_NAME = "PyCharmDebugReconnect"
+
+
+class ConnectionSupervisor:  # pylint: disable=too-many-instance-attributes
+    """Watch the debugger connection from the editor tick
+
+    Every ``interval`` seconds the connection state is checked, a cheap read
+    of pydevd's own state that never touches the socket. When PyCharm goes
+    away the session is detached, dropping the dead trace hook, and the state
+    becomes lost. With reconnect enabled the debug server is then probed on a
+    worker thread with exponential backoff and attached again once it is back.
+    """
+
+    def __init__(self) -> None:
+        self.interval = 0.0
+        self.reconnect = False
+        self.max_delay = 0.0
+        self.lost = False
+        self._on_reconnect: Optional[Callable[[], Any]] = None
+        self._address: Optional[Tuple[str, int]] = None
+        self._tick_handle = None
+        self._elapsed = 0.0
+        self._delay = RECONNECT_INITIAL_DELAY
+        self._next_attempt = 0.0
+        self._probe: Optional[threading.Thread] = None
+        self._probe_result: Optional[bool] = None
+
+    @property
+    def running(self) -> bool:
+        """bool: True while the supervisor is registered on the editor tick"""
+        return self._tick_handle is not None
+
+    @property
+    def reconnecting(self) -> bool:
+        """bool: True while a reconnect probe is in flight"""
+        return self._probe is not None
+
+    def watch(
+        self,
+        on_reconnect: Callable[[], Any],
+        interval: float,
+        reconnect: bool,
+        max_delay: float,
+    ) -> None:
+        """Start watching the current connection
+
+        Args:
+            on_reconnect (Callable): Attaches again once the server is back
+            interval (float): Seconds between health checks
+            reconnect (bool): Reconnect after the connection is lost
+            max_delay (float): Longest wait between reconnect attempts in
+                seconds
+        """
+        self._on_reconnect = on_reconnect
+        if SESSION.host is not None and SESSION.port is not None:
+            self._address = (SESSION.host, SESSION.port)
+        self.interval = interval
+        self.reconnect = reconnect
+        self.max_delay = max_delay
+        self.lost = False
+        self._delay = RECONNECT_INITIAL_DELAY
+        self._elapsed = 0.0
+
+        if self._tick_handle is None:
+            self._tick_handle = unreal.register_slate_post_tick_callback(self._on_tick)
+
+    def stop(self) -> None:
+        """Stop watching and forget a lost connection, the connection itself
+        is left alone"""
+        self._unregister()
+        self.lost = False
+
+    def _unregister(self) -> None:
+        if self._tick_handle is not None:
+            unreal.unregister_slate_post_tick_callback(self._tick_handle)
+            self._tick_handle = None
+
+    def _on_tick(self, delta_time: float) -> None:
+        self._elapsed += delta_time
+        if self._elapsed < self.interval:
+            return
+        self._elapsed = 0.0
+
+        try:
+            self.check()
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            # raising here would surface inside the slate tick
+            unreal.log_error(f"PyCharm debugger health check failed: {ex}")
+
+    def check(self) -> None:
+        """Run one health check, or one reconnect step once the connection
+        was lost"""
+        if SESSION.active:
+            if SESSION.is_connected():
+                return
+            unreal.log_warning("Lost connection to PyCharm debugger")
+            SESSION.detach()
+            self.lost = True
+            self._next_attempt = time.monotonic() + self._delay
+
+        if self.lost is False:
+            self._unregister()  # disconnected on purpose
+            return
+
+        if self.reconnect is False or self._address is None:
+            self._unregister()
+            return
+
+        self._step_reconnect()
+
+    def _step_reconnect(self) -> None:
+        if self._probe is not None:
+            if self._probe.is_alive():
+                return
+            self._probe = None
+            if self._probe_result and self._on_reconnect is not None:
+                unreal.log("PyCharm debug server is back, reconnecting")
+                self._on_reconnect()
+                if SESSION.active:
+                    return
+            self._delay = min(self._delay * 2, self.max_delay)
+            self._next_attempt = time.monotonic() + self._delay
+            return
+
+        if time.monotonic() >= self._next_attempt:
+            self._probe_result = None
+            self._probe = threading.Thread(
+                target=self._run_probe, name=PROBE_THREAD_NAME, daemon=True
+            )
+            self._probe.start()
+
+    def _run_probe(self) -> None:
+        if self._address is None:
+            return
+
+        try:
+            probe_server(*self._address)
+        except PyCharmDebugRuntimeError:
+            self._probe_result = False
+        else:
+            self._probe_result = True
+
+
+SUPERVISOR = ConnectionSupervisor()
+
+
+def get_connection_state() -> str:
+    """Get the state of the debugger connection, for the menu and config
+    widget
+
+    Returns:
+        str: disconnected, connecting, attached or lost
+    """
+    if SESSION.active:
+        return STATE_ATTACHED
+
+    if is_connect_pending() or SUPERVISOR.reconnecting:
+        return STATE_CONNECTING
+
+    if SUPERVISOR.lost:
+        return STATE_LOST
+
+    return STATE_DISCONNECTED
@@ -0,0 +1,212 @@
+from types import FrameType
+from typing import (
+    Callable,
+    Dict,
+    Optional,
+    Sequence,
+)
+import fnmatch
+import sys
+import threading
+import weakref
+
+from .constants import (
+    THREADS_ALL,
+    THREADS_CURRENT,
+)
+
+
+# thread attribute pydevd checks before tracing a thread
+DO_NOT_TRACE_ATTR = "pydev_do_not_trace"
+
+
+class ThreadSelection:
+    """Decides which threads the debugger traces
+
+    ``all`` traces every thread, ``current`` only the thread the selection was
+    made on, usually the editor game thread, and ``matching`` only threads
+    whose name matches one of the fnmatch patterns. Decisions are memoized per
+    thread name, so checking a thread is a dictionary lookup after the first
+    time.
+    """
+
+    def __init__(
+        self,
+        mode: str = THREADS_ALL,
+        patterns: Sequence[str] = (),
+        owner: Optional[int] = None,
+    ) -> None:
+        self.mode = mode
+        self.patterns = list(patterns)
+        self.owner = threading.get_ident() if owner is None else owner
+        self._decisions: Dict[str, bool] = {}
+
+    def selects(self, thread: threading.Thread) -> bool:
+        """Check whether a thread should be traced
+
+        Args:
+            thread (Thread): The thread
+
+        Returns:
+            bool: True if the thread should be traced
+        """
+        if self.mode == THREADS_ALL:
+            return True
+        if self.mode == THREADS_CURRENT:
+            return thread.ident == self.owner
+
+        decision = self._decisions.get(thread.name)
+        if decision is None:
+            decision = any(
+                fnmatch.fnmatchcase(thread.name, pattern) for pattern in self.patterns
+            )
+            self._decisions[thread.name] = decision
+
+        return decision
+
+    def describe(self) -> str:
+        """Describe the selection for the log and the config widget
+
+        Returns:
+            str: e.g. ``threads matching Asset*, IO*``
+        """
+        if self.mode == THREADS_ALL:
+            return "all threads"
+        if self.mode == THREADS_CURRENT:
+            names = [t.name for t in threading.enumerate() if t.ident == self.owner]
+            return f"current thread ({names[0] if names else self.owner})"
+
+        return f"threads matching {', '.join(self.patterns) or '(none)'}"
+
+
+_selection = ThreadSelection()
+# threads this module marked as not traced, pydevd's own threads set the
+# attribute themselves and are left alone
+_excluded: "weakref.WeakSet[threading.Thread]" = weakref.WeakSet()
+_original_start: Optional[Callable[[threading.Thread], None]] = None
+
+
+def _apply(thread: threading.Thread) -> bool:
+    """Mark one thread for pydevd according to the selection
+
+    Returns:
+        bool: True if the thread is not traced
+    """
+    if thread in _excluded:
+        _excluded.discard(thread)
+        vars(thread).pop(DO_NOT_TRACE_ATTR, None)
+    elif DO_NOT_TRACE_ATTR in vars(thread):
+        return bool(vars(thread)[DO_NOT_TRACE_ATTR])
+
+    if _selection.selects(thread):
+        return False
+
+    setattr(thread, DO_NOT_TRACE_ATTR, True)
+    _excluded.add(thread)
+    return True
+
+
+def _patched_start(thread: threading.Thread) -> None:
+    _apply(thread)  # before pydevd sees the thread start running
+
+    if _original_start is not None:
+        _original_start(thread)
+
+
+def _restore_start() -> None:
+    global _original_start  # pylint: disable=global-statement
+
+    # a wrapper installed after ours stays, ours then only passes through
+    if _original_start is not None and threading.Thread.start is _patched_start:
+        threading.Thread.start = _original_start  # type: ignore[method-assign, assignment]
+        _original_start = None
+
+
+def get_selection() -> ThreadSelection:
+    """Get the thread selection in effect
+
+    Returns:
+        ThreadSelection: The selection
+    """
+    return _selection
+
+
+def set_selection(selection: ThreadSelection) -> None:
+    """Make pydevd trace only the threads a selection picks
+
+    Running threads the selection drops get the per-thread attribute pydevd
+    checks before tracing a thread, and threads started while the selection
+    is in effect get it as they start. A thread is checked once, renaming it
+    afterwards doesn't change whether it is traced. Frames already running
+    in dropped threads stop being traced with the settrace backend.
+
+    Args:
+        selection (ThreadSelection): The selection
+    """
+    global _selection, _original_start  # pylint: disable=global-statement
+
+    if selection.mode == THREADS_ALL:
+        clear_selection()  # nothing to mark, Thread.start is left alone too
+        _selection = selection
+        return
+
+    _selection = selection
+    if _original_start is None:
+        _original_start = threading.Thread.start
+        threading.Thread.start = _patched_start  # type: ignore[method-assign, assignment]
+
+    current = threading.get_ident()
+    frames = sys._current_frames()  # pylint: disable=protected-access
+    for thread in threading.enumerate():
+        if _apply(thread) is False:
+            continue
+        if thread.ident == current or thread.ident not in frames:
+            continue  # the session switches its own thread through pydevd
+
+        frame: Optional[FrameType] = frames[thread.ident]
+        while frame is not None:
+            frame.f_trace = None
+            frame = frame.f_back
+    del frames
+
+
+def clear_selection() -> None:
+    """Trace every thread again, dropping only the attributes and the
+    Thread.start wrapper this module added"""
+    global _selection  # pylint: disable=global-statement
+
+    _selection = ThreadSelection()
+    for thread in list(_excluded):
+        vars(thread).pop(DO_NOT_TRACE_ATTR, None)
+    _excluded.clear()
+    _restore_start()
+
+
+def trace_threads(mode: str = THREADS_ALL, patterns: Sequence[str] = ()) -> bool:
+    """Switch which threads the attached debugger traces
+
+    Args:
+        mode (str): ``all``, ``current`` for the editor game thread only, or
+            ``matching`` for threads whose name matches one of the patterns,
+            defaults to all
+        patterns (Sequence[str]): fnmatch patterns for thread names, e.g.
+            ``["AssetScan*"]``, used by matching, defaults to ()
+
+    Returns:
+        bool: True if applied, False if not attached
+
+    Raises:
+        PyCharmDebugRuntimeError:
+            Unknown thread selection mode
+    """
+    # settings needs unreal, which child processes importing this don't have
+    from .settings import _validate_thread_mode
+
+    _validate_thread_mode(mode)
+
+    session_module = sys.modules.get(f"{__package__}.session")
+    if session_module is None or session_module.SESSION.active is False:
+        return False
+
+    selection = ThreadSelection(mode, patterns, owner=threading.main_thread().ident)
+    return session_module.SESSION.set_thread_selection(selection)
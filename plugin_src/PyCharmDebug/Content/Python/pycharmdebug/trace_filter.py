@@ -0,0 +1,105 @@
+from typing import (
+    List,
+    Sequence,
+    Tuple,
+)
+
+
+MODULE_WILDCARD = ".*"
+RECURSIVE_WILDCARD = "**"
+
+
+def is_path_pattern(pattern: str) -> bool:
+    """Tell file path globs from module prefixes
+
+    Patterns containing a path separator or ending in .py are file path globs,
+    anything else is a module prefix, e.g. ``unreal`` or ``mytools.assets``.
+
+    Args:
+        pattern (str): The filter pattern
+
+    Returns:
+        bool: True if the pattern is a file path glob
+    """
+    return "/" in pattern or "\\" in pattern or pattern.endswith(".py")
+
+
+def to_pydevd_glob(pattern: str) -> str:
+    """Translate a file path glob to pydevd's glob syntax
+
+    pydevd matches globs one path segment at a time, so ``*`` never crosses a
+    separator and only ``**`` spans directories. A ``*`` segment becomes
+    ``**``, and a wildcard file name is allowed at any depth below the
+    directories before it, so ``*/site-packages/*`` and ``*/MyTools/*.py``
+    match as deep as they read.
+
+    Args:
+        pattern (str): The file path glob, either separator
+
+    Returns:
+        str: The pydevd glob, with forward slashes
+    """
+    *directories, name = pattern.replace("\\", "/").split("/")
+    segments = [RECURSIVE_WILDCARD if part == "*" else part for part in directories]
+    if name == "*":
+        segments.append(RECURSIVE_WILDCARD)
+    elif "*" in name:
+        segments += [RECURSIVE_WILDCARD, name]  # a file name at any depth
+    else:
+        segments.append(name)
+
+    globs: List[str] = []
+    for segment in segments:
+        if segment != RECURSIVE_WILDCARD or globs[-1:] != [RECURSIVE_WILDCARD]:
+            globs.append(segment)
+
+    return "/".join(globs)
+
+
+def to_pydevd_module(pattern: str) -> str:
+    """Translate a module pattern to the module prefix pydevd matches
+
+    Args:
+        pattern (str): The module pattern, e.g. ``mytools`` or ``mytools.*``
+
+    Returns:
+        str: The module prefix, e.g. ``mytools``
+    """
+    return pattern.removesuffix(MODULE_WILDCARD)
+
+
+def _to_pydevd_filter(pattern: str, exclude: bool) -> Tuple[str, bool, bool]:
+    if is_path_pattern(pattern):
+        return to_pydevd_glob(pattern), exclude, True
+    return to_pydevd_module(pattern), exclude, False
+
+
+class TraceFilter:
+    """Include/exclude filter deciding which code the debugger traces
+
+    The filter is handed to pydevd as exclude filters when connecting, pydevd
+    then skips the code it excludes.
+    """
+
+    def __init__(
+        self, include: Sequence[str] = (), exclude: Sequence[str] = ()
+    ) -> None:
+        self.include = list(include)
+        self.exclude = list(exclude)
+
+    def __bool__(self) -> bool:
+        return bool(self.include or self.exclude)
+
+    def to_pydevd_filters(self) -> List[Tuple[str, bool, bool]]:
+        """Convert the filter to pydevd exclude filters, first match wins
+
+        Returns:
+            list: (name, exclude, is_path) tuples, in the order pydevd's
+                ExcludeFilter expects
+        """
+        filters = [_to_pydevd_filter(pattern, True) for pattern in self.exclude]
+        filters += [_to_pydevd_filter(pattern, False) for pattern in self.include]
+        if self.include:
+            filters.append((RECURSIVE_WILDCARD, True, True))  # nothing else is traced
+
+        return filters
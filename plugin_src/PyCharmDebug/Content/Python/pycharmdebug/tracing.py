@@ -0,0 +1,74 @@
+from contextlib import ContextDecorator
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    TypeVar,
+    Union,
+    overload,
+)
+import sys
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _Traced(ContextDecorator):
+    """Trace the current thread inside a block, restoring the previous tracing
+    state on exit"""
+
+    def __init__(self) -> None:
+        self._previous: Optional[bool] = None
+
+    def _recreate_cm(self) -> "_Traced":
+        # a fresh instance per call keeps nested and threaded use independent
+        return _Traced()
+
+    def __enter__(self) -> "_Traced":
+        session_module = sys.modules.get(f"{__package__}.session")
+        if session_module is None:  # nothing can be attached yet
+            return self
+
+        session = session_module.SESSION
+        if session.active:
+            self._previous = session.is_tracing()
+            session.set_tracing(True)
+
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._previous is None:
+            return
+
+        from .session import SESSION
+
+        SESSION.set_tracing(self._previous)
+        self._previous = None
+
+
+@overload
+def traced(func: None = None) -> _Traced: ...
+
+
+@overload
+def traced(func: F) -> F: ...
+
+
+def traced(func: Optional[F] = None) -> Union[_Traced, F]:
+    """Trace only inside a block or function, for use with a connection made
+    with trace_on_connect disabled
+
+    Usable as ``with traced():``, ``@traced`` or ``@traced()``. Does nothing
+    when the debugger is not attached.
+
+    Args:
+        func (Callable): Function to decorate, defaults to None
+
+    Returns:
+        The context manager, or the decorated function
+    """
+    if func is None:
+        return _Traced()
+
+    return _Traced()(func)
+
@@ -1,21 +1,70 @@
 from pathlib import Path
-import os
-import json
+from typing import (
+    Any,
+    Optional,
+)
+import threading
 
 from unreal import PluginBlueprintLibrary
 
-from .exceptions import (
-    PyCharmDebugRuntimeError,
-    PyCharmDebugTypeError,
+from .config_store import CONFIG_STORE
+from .discovery import (
+    find_installations,
+    get_env_bin_dirs,
+)
+from .exceptions import PyCharmDebugRuntimeError
+from .metrics import timed
+from .output import OutputSettings
+from .port_pool import allocate_port
+from .settings import (  # pylint: disable=unused-import
+    CONFIG_VALIDATORS,
+    DEFAULT_CONFIG,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_PORT_NUMBER,
+    MAX_PORT_NUMBER,
+    MIN_PORT_NUMBER,
+    Settings,
+    SettingsResolver,
 )
+from .threads import ThreadSelection
+from .trace_filter import TraceFilter
 
 
-DEFAULT_PORT_NUMBER = 5678
-MIN_PORT_NUMBER = 0
-MAX_PORT_NUMBER = 65535  # unsigned 16-bit integer range for port numbers
 PLUGIN_NAME = "PyCharmDebug"
 RELATIVE_CONFIG_PATH = "Config/tool_config.json"
 
+_plugin_root: Optional[str] = None
+
+
+def get_plugin_root() -> str:
+    """Get the plugin base directory, resolved once per session
+
+    Returns:
+        str: The plugin base directory
+
+    Raises:
+        PyCharmDebugRuntimeError:
+            Failed to resolve plugin root directory
+    """
+    global _plugin_root  # pylint: disable=global-statement
+
+    if _plugin_root is None:
+        plugin_root = PluginBlueprintLibrary.get_plugin_base_dir(PLUGIN_NAME)
+        if plugin_root is None:
+            raise PyCharmDebugRuntimeError("Failed to resolve plugin root directory")
+        _plugin_root = plugin_root
+
+    return _plugin_root
+
+
+def clear_caches() -> None:
+    """Drop the cached plugin root, config data and resolved settings"""
+    global _plugin_root  # pylint: disable=global-statement
+
+    _plugin_root = None
+    CONFIG_STORE.invalidate()
+    SETTINGS.invalidate()
+
 
 def get_plugin_config(create_on_fail=False) -> Path:
     """Get the path to the tool config file
@@ -32,11 +81,7 @@ def get_plugin_config(create_on_fail=False) -> Path:
             Failed to resolve plugin root directory
             Failed to resolve plugin config
     """
-    plugin_root = PluginBlueprintLibrary.get_plugin_base_dir(PLUGIN_NAME)
-    if plugin_root is None:
-        raise PyCharmDebugRuntimeError("Failed to resolve plugin root directory")
-
-    resolved_plugin_config = Path(plugin_root).joinpath(RELATIVE_CONFIG_PATH)
+    resolved_plugin_config = Path(get_plugin_root()).joinpath(RELATIVE_CONFIG_PATH)
 
     if resolved_plugin_config.exists() is False:
         if create_on_fail:
@@ -47,26 +92,138 @@ def get_plugin_config(create_on_fail=False) -> Path:
     return resolved_plugin_config
 
 
+# looked up on each call so the plugin config is resolved lazily
+SETTINGS = SettingsResolver(
+    lambda: get_plugin_config()  # pylint: disable=unnecessary-lambda
+)
+
+
+def get_settings() -> Settings:
+    """Get the settings merged from every layer, see :class:`SettingsResolver`
+
+    Returns:
+        Settings: The resolved settings
+    """
+    return SETTINGS.get()
+
+
 def get_debug_port() -> int:
-    """Get the port number from the config file
+    """Get the port number from the settings, or this process's own port
+    from the port_range pool when one is set
 
     Returns:
         int: The port number
+
+    Raises:
+        PyCharmDebugRuntimeError:
+            No free debug port in the range
+    """
+    settings = get_settings()
+
+    if settings.port_range:
+        return allocate_port(settings.port_range)
+
+    return settings.port_number
+
+
+def get_debug_host() -> str:
+    """Get the debug server host from the config file
+
+    Returns:
+        str: The debug server host
+    """
+    return get_config_value("host")
+
+
+def get_config_value(key: str) -> Any:
+    """Get a value from the settings, falling back to its default when no
+    layer sets it
+
+    Args:
+        key (str): The config key
+
+    Returns:
+        Any: The config value
+
+    Raises:
+        PyCharmDebugRuntimeError:
+            Unknown config key
     """
-    plugin_config = get_plugin_config()
+    if key not in DEFAULT_CONFIG:
+        raise PyCharmDebugRuntimeError(f"Unknown config key: {key}")
 
-    if plugin_config is None:
-        return DEFAULT_PORT_NUMBER
+    return getattr(get_settings(), key)
 
-    with open(plugin_config.as_posix(), "r", encoding="utf-8") as file:
-        data = json.load(file)
 
-    port_number = data.get("port_number", DEFAULT_PORT_NUMBER)
-    if port_number is None:
-        # port number key is present but value is None, default to 5678
-        port_number = DEFAULT_PORT_NUMBER
+def get_trace_filter() -> TraceFilter:
+    """Get the trace filter built from the trace_include and trace_exclude
+    config patterns
 
-    return port_number
+    Returns:
+        TraceFilter: The trace filter
+    """
+    settings = get_settings()
+    return TraceFilter(include=settings.trace_include, exclude=settings.trace_exclude)
+
+
+def get_thread_selection() -> ThreadSelection:
+    """Get the thread selection built from the trace_threads and
+    trace_thread_patterns config, where the current thread is the editor
+    game thread
+
+    Returns:
+        ThreadSelection: The thread selection
+    """
+    settings = get_settings()
+    return ThreadSelection(
+        settings.trace_threads,
+        settings.trace_thread_patterns,
+        owner=threading.main_thread().ident,
+    )
+
+
+def get_output_settings() -> OutputSettings:
+    """Get the stdout and stderr forwarding settings from the config
+
+    Returns:
+        OutputSettings: The output forwarding settings
+    """
+    settings = get_settings()
+    return OutputSettings(
+        mode=settings.output_forwarding,
+        flush_size=settings.output_flush_size,
+        flush_interval=settings.output_flush_interval,
+        rate_limit=settings.output_rate_limit,
+    )
+
+
+def update_debug_config(**changes: Any) -> bool:
+    """Apply several config changes in a single transaction, the config file
+    is written once, atomically, while holding an advisory lock
+
+    Args:
+        **changes: Config keys and the values to set
+
+    Returns:
+        bool: True once the changes are written
+
+    Raises:
+        PyCharmDebugRuntimeError:
+            Unknown config key
+            Failed to resolve plugin root directory
+    """
+    validated = {}
+    for key, value in changes.items():
+        validator = CONFIG_VALIDATORS.get(key)
+        if validator is None:
+            raise PyCharmDebugRuntimeError(f"Unknown config key: {key}")
+        validated[key] = validator(value)
+
+    plugin_config = get_plugin_config(create_on_fail=True)
+    # only the changed keys, defaults written here would shadow the studio layer
+    CONFIG_STORE.update(plugin_config, validated)
+
+    return True
 
 
 def set_debug_port(port: int) -> bool:
@@ -81,30 +238,37 @@ def set_debug_port(port: int) -> bool:
         PyCharmDebugRuntimeError:
             Port must be between 0 and 65535
     """
-    if isinstance(port, int) is False:
-        raise PyCharmDebugTypeError("Port must be an integer")
+    return update_debug_config(port_number=port)
 
-    if port < MIN_PORT_NUMBER or port > MAX_PORT_NUMBER:
-        raise PyCharmDebugRuntimeError("Port must be between 0 and 65535")
 
-    plugin_config = get_plugin_config(create_on_fail=True)
+def get_post_mortem() -> bool:
+    """Get whether unhandled exceptions attach the debugger post-mortem
 
-    if plugin_config is None:
-        return False  # failed to find or create plugin config
+    Returns:
+        bool: True if post-mortem mode is enabled
+    """
+    return bool(get_config_value("post_mortem"))
 
-    with open(plugin_config.as_posix(), "r", encoding="utf-8") as file:
-        data: dict = json.load(file)
 
-    data["port_number"] = port
+def set_post_mortem(enabled: bool) -> bool:
+    """Enable or disable post-mortem mode in the config
 
-    with open(plugin_config.as_posix(), "w", encoding="utf-8") as file:
-        json.dump(data, file, indent=4)
+    Args:
+        enabled (bool): True to attach the debugger on unhandled exceptions
 
-    return True
+    Returns:
+        bool: True if the operation was successful
+
+    Raises:
+        PyCharmDebugTypeError:
+            Value must be a boolean
+    """
+    return update_debug_config(post_mortem=enabled)
 
 
 def find_system_dbg_egg() -> str:
-    """Attempt to find the debug egg from the system PyCharm installation
+    """Attempt to find the debug egg from the system PyCharm installations,
+    preferring the newest build
 
     Returns:
         str: Path to the PyCharm installation debug egg or None
@@ -115,54 +279,42 @@ def find_system_dbg_egg() -> str:
             PyCharm bin path not found
             System debug egg not found
     """
-    pycharm_bin_dir = os.environ.get("PyCharm")
-    if pycharm_bin_dir is None:
-        raise PyCharmDebugRuntimeError("PyCharm installation not found")
-
-    pycharm_dir_path: Path = Path(pycharm_bin_dir.split(";")[0])
+    installations = find_installations()
 
-    if pycharm_dir_path.is_dir() is False:
-        raise PyCharmDebugRuntimeError("PyCharm bin path not found")
-
-    egg_path: Path = pycharm_dir_path.parent.joinpath("debug-eggs/pydevd-pycharm.egg")
+    if not installations:
+        if get_env_bin_dirs():
+            raise PyCharmDebugRuntimeError("PyCharm bin path not found")
+        raise PyCharmDebugRuntimeError("PyCharm installation not found")
 
-    if egg_path.is_file() is False:
-        raise PyCharmDebugRuntimeError("System debug egg not found")
+    for installation in installations:
+        if installation.egg:
+            return installation.egg
 
-    return egg_path.as_posix()
+    raise PyCharmDebugRuntimeError("System debug egg not found")
 
 
+@timed("egg_resolve")
 def get_debug_egg() -> str:
-    """Get the debug egg location from the config file.
+    """Get the debug egg location from the settings, the location is checked
+    once when its layer is loaded
 
     Returns:
         str: Path to the debug egg or empty string if not set
 
     Raises:
         PyCharmDebugRuntimeError
-            No debug egg set
+            No valid debug egg set
     """
-    plugin_config = get_plugin_config()
-
-    data = {}
-    if plugin_config:
-        with open(plugin_config.as_posix(), "r", encoding="utf-8") as file:
-            data = json.load(file)
+    settings = get_settings()
 
-    serialized_egg = str(data.get("debug_egg"))
-
-    if serialized_egg == "":
-        return serialized_egg
-
-    egg_path = Path(serialized_egg)
-    if egg_path.is_file() is False or egg_path.name != "pydevd-pycharm.egg":
+    if "debug_egg" in SETTINGS.invalid:
         raise PyCharmDebugRuntimeError(
             "No valid debug_egg location saved in the config, please either enter "
             "one manually in the dialog box, or click 'Find installed' to try "
             "and resolve from a system PyCharm installation"
         )
 
-    return egg_path.as_posix()
+    return settings.debug_egg
 
 
 def set_debug_egg(location: str) -> bool:
@@ -173,27 +325,11 @@ def set_debug_egg(location: str) -> bool:
 
     Returns:
         bool: True if the operation was successful
-    """
-    plugin_config = get_plugin_config(create_on_fail=True)
-
-    if plugin_config is None:
-        raise PyCharmDebugRuntimeError("Failed to find or create plugin config")
-
-    with open(plugin_config.as_posix(), "r", encoding="utf-8") as file:
-        data: dict = json.load(file)
-
-    if location == "":  # allow user to clear the path
-        data["debug_egg"] = location
-
-    else:
-        location = location.strip('"')
-        egg_path = Path(location)
-        if egg_path.is_file() is False or egg_path.name != "pydevd-pycharm.egg":
-            raise PyCharmDebugTypeError(f"Invalid egg file: {egg_path.as_posix()}")
-
-        data["debug_egg"] = egg_path.as_posix()
-
-    with open(plugin_config.as_posix(), "w", encoding="utf-8") as file:
-        json.dump(data, file, indent=4)
 
-    return True
+    Raises:
+        PyCharmDebugRuntimeError:
+            Failed to resolve plugin root directory
+        PyCharmDebugTypeError:
+            Invalid egg file
+    """
+    return update_debug_config(debug_egg=location)
@@ -0,0 +1,257 @@
+from types import FrameType
+from typing import (
+    Any,
+    Callable,
+    List,
+    Optional,
+)
+import sys
+import threading
+import time
+import traceback
+
+import unreal
+
+from .constants import DEFAULT_WATCHDOG_THRESHOLD
+from .metrics import METRICS
+
+
+MIN_POLL_INTERVAL = 0.005  # seconds
+WATCHDOG_THREAD_NAME = "PyCharmDebugWatchdog"
+# commandlets and runs without rendering have no editor UI to hold up
+NO_SLATE_TOKENS = ("-run", "-nullrhi")
+
+
+class Stall:
+    """Python code holding up the editor main thread"""
+
+    def __init__(self, start: float, stack: List[str]) -> None:
+        self.start = start
+        self.stack = stack
+        self.duration = 0.0
+        self.connected = False
+
+    @property
+    def location(self) -> str:
+        """str: The innermost frame of the sampled stack"""
+        return self.stack[-1].strip().splitlines()[0] if self.stack else ""
+
+
+def _format_stack(frame: FrameType) -> List[str]:
+    return traceback.extract_stack(frame).format()
+
+
+class SlowCallWatchdog:  # pylint: disable=too-many-instance-attributes
+    """Spot Python calls that block the editor main thread
+
+    The editor tick stamps a heartbeat. A background thread checks it several
+    times per threshold; once the main thread has gone longer than the
+    threshold without ticking while running Python code, its stack is sampled
+    and, once the tick resumes, logged with how long the stall lasted. Nothing
+    is checked before the first tick, so editor startup isn't reported. Stalls
+    in native code, with no Python on the main thread, are ignored. Nothing is
+    traced, so the main thread runs at full speed.
+    """
+
+    def __init__(self) -> None:
+        self.threshold = DEFAULT_WATCHDOG_THRESHOLD
+        self.connect_threshold = 0.0
+        self.stalls = 0
+        self._on_connect: Optional[Callable[[], Any]] = None
+        self._connect_pending = False
+        self._main_ident = 0
+        self._last_tick = 0.0  # no heartbeat yet
+        self._stall: Optional[Stall] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._tick_handle = None
+
+    @property
+    def running(self) -> bool:
+        """bool: True while watching the main thread"""
+        return self._thread is not None
+
+    def start(
+        self,
+        threshold: float = DEFAULT_WATCHDOG_THRESHOLD,
+        connect_threshold: float = 0.0,
+        on_connect: Optional[Callable[[], Any]] = None,
+        thread: Optional[threading.Thread] = None,
+    ) -> None:
+        """Start watching the main thread, must be called from it
+
+        Args:
+            threshold (float): Seconds a call may block the main thread
+                before it is reported, defaults to 0.05
+            connect_threshold (float): Seconds a stall has to last for
+                ``on_connect`` to be called, on the main thread once it ticks
+                again, 0 never calls it, defaults to 0.0
+            on_connect (Callable): Connects the debugger, defaults to None
+            thread (Thread): The thread whose stack is sampled, defaults to
+                None which is the main thread
+        """
+        self.stop()
+
+        self.threshold = threshold
+        self.connect_threshold = connect_threshold
+        self._on_connect = on_connect
+        self._connect_pending = False
+        self._main_ident = (thread or threading.main_thread()).ident or 0
+        self._last_tick = 0.0
+        self._stall = None
+        self._stop.clear()
+
+        self._tick_handle = unreal.register_slate_post_tick_callback(self._on_tick)
+        self._thread = threading.Thread(
+            target=self._run, name=WATCHDOG_THREAD_NAME, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching"""
+        if self._tick_handle is not None:
+            unreal.unregister_slate_post_tick_callback(self._tick_handle)
+            self._tick_handle = None
+
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _on_tick(self, delta_time: float) -> None:  # pylint: disable=unused-argument
+        now = time.perf_counter()
+        stall = self._stall
+        self._last_tick = now
+        if stall is not None:
+            self._stall = None
+            stall.duration = now - stall.start
+            self._report(stall)
+
+        if self._connect_pending and self._on_connect is not None:
+            self._connect_pending = False
+            self._on_connect()
+
+    def _run(self) -> None:
+        poll_interval = max(self.threshold / 4, MIN_POLL_INTERVAL)
+        while self._stop.wait(poll_interval) is False:
+            try:
+                self.check()
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                unreal.log_error(f"PyCharmDebug watchdog failed: {ex}")
+                return
+
+    def check(self) -> Optional[Stall]:
+        """Sample the main thread if it has not ticked within the threshold
+
+        Returns:
+            Stall: The stall in progress, or None
+        """
+        last_tick = self._last_tick
+        if last_tick == 0.0:
+            return None  # the editor is still starting up
+
+        blocked = time.perf_counter() - last_tick
+        if blocked < self.threshold:
+            return None
+
+        stall = self._stall
+        if stall is None or stall.start != last_tick:
+            frame = sys._current_frames().get(  # pylint: disable=protected-access
+                self._main_ident
+            )
+            if frame is None:
+                return None  # blocked in native code, not by a Python call
+
+            stall = Stall(last_tick, _format_stack(frame))
+            del frame
+            self._stall = stall
+
+        if (
+            self.connect_threshold
+            and blocked >= self.connect_threshold
+            and stall.connected is False
+            and self._on_connect is not None
+        ):
+            stall.connected = True
+            self._connect_pending = True  # connected from the main thread
+            unreal.log_warning(
+                f"Editor main thread blocked for {blocked * 1000:.0f} ms by "
+                f"{stall.location}, connecting PyCharm debugger once it ticks"
+            )
+
+        return stall
+
+    def _report(self, stall: Stall) -> None:
+        self.stalls += 1
+        METRICS.record("main_thread_stall", stall.duration, location=stall.location)
+        unreal.log_warning(
+            f"Python blocked the editor main thread for {stall.duration * 1000:.0f} "
+            f"ms (threshold {self.threshold * 1000:.0f} ms), stack when it passed "
+            "the threshold:\n" + "".join(stall.stack).rstrip()
+        )
+
+
+WATCHDOG = SlowCallWatchdog()
+
+
+def _connect() -> None:
+    from .actions.connect import connect
+    from .exceptions import PyCharmDebugRuntimeError
+    from .session import SESSION
+    from .utils import (
+        get_debug_egg,
+        get_debug_port,
+    )
+
+    if SESSION.active:
+        return
+
+    try:
+        # trace every thread so the main thread can be paused in its next stall
+        connected = connect(
+            get_debug_egg(),
+            get_debug_port(),
+            suspend=False,
+            trace_only_current_thread=False,
+        )
+    except PyCharmDebugRuntimeError as ex:
+        unreal.log_error(str(ex))
+        return
+
+    if connected:
+        unreal.log_warning(
+            "PyCharm debugger connected, pause in PyCharm during the next stall "
+            "to inspect the main thread"
+        )
+
+
+def _has_slate() -> bool:
+    for token in str(unreal.SystemLibrary.get_command_line()).split():
+        if token.partition("=")[0].lower() in NO_SLATE_TOKENS:
+            return False
+
+    return True
+
+
+def install() -> bool:
+    """Start the watchdog if watchdog_enabled is set in the config, unless
+    the editor runs a commandlet or without rendering
+
+    Returns:
+        bool: True if the watchdog was started
+    """
+    if _has_slate() is False:
+        return False
+
+    from .utils import get_settings
+
+    settings = get_settings()
+    if settings.watchdog_enabled is False:
+        return False
+
+    WATCHDOG.start(
+        settings.watchdog_threshold,
+        settings.watchdog_connect_threshold,
+        _connect,
+    )
+    return True
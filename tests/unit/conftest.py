@@ -7,3 +7,24 @@ def mock_unreal(monkeypatch):
     unreal_mock = MagicMock()
     monkeypatch.setitem(__import__('sys').modules, 'unreal', unreal_mock)
     return unreal_mock
+
+
+@pytest.fixture(autouse=True)
+def unload_pycharmdebug():
+    # modules bind the mocked unreal module on import and hold module level
+    # caches, re-import them fresh for every test
+    yield
+    modules = __import__('sys').modules
+    for name in [name for name in modules if name.split('.')[0] == 'pycharmdebug']:
+        del modules[name]
+
+
+@pytest.fixture(autouse=True)
+def isolate_settings(monkeypatch, tmp_path_factory):
+    # keep the user settings layer and PYCHARMDEBUG_* variables of the machine
+    # running the tests out of them
+    monkeypatch.setenv("HOME", tmp_path_factory.mktemp("home").as_posix())
+    monkeypatch.setenv("USERPROFILE", __import__('os').environ["HOME"])
+    for name in list(__import__('os').environ):
+        if name.startswith("PYCHARMDEBUG"):
+            monkeypatch.delenv(name)
@@ -0,0 +1,63 @@
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "requested, supported, expected",
+    [
+        ("auto", True, "sys_monitoring"),
+        ("auto", False, "settrace"),
+        ("settrace", True, "settrace"),
+        ("sys_monitoring", True, "sys_monitoring"),
+        ("sys_monitoring", False, "settrace"),
+    ],
+)
+def test_resolve_backend_expects_expected(mocker, requested, supported, expected):
+    # Arrange
+    from pycharmdebug.backends import resolve_backend
+    mocker.patch("pycharmdebug.backends.supports_monitoring", return_value=supported)
+
+    # Act
+    result = resolve_backend(requested)
+
+    # Assert
+    assert result == expected
+
+
+def test_resolve_backend_monitoring_unsupported_expects_warning(mocker, mock_unreal):
+    # Arrange
+    from pycharmdebug.backends import resolve_backend
+    mocker.patch("pycharmdebug.backends.supports_monitoring", return_value=False)
+
+    # Act
+    resolve_backend("sys_monitoring")
+
+    # Assert
+    assert "falling back to settrace" in mock_unreal.log_warning.call_args[0][0]
+
+
+@pytest.mark.parametrize(
+    "constants, expected",
+    [
+        (None, "sys_monitoring"),
+        ({}, "settrace"),
+        ({"USE_SYS_MONITORING": False}, "settrace"),
+        ({"USE_SYS_MONITORING": True}, "sys_monitoring"),
+    ],
+)
+def test_get_pydevd_backend_expects_expected(monkeypatch, constants, expected):
+    # Arrange
+    import types
+    from pycharmdebug.backends import get_pydevd_backend
+    monkeypatch.delitem(sys.modules, "_pydevd_bundle.pydevd_constants", raising=False)
+    if constants is not None:
+        module = types.ModuleType("_pydevd_bundle.pydevd_constants")
+        vars(module).update(constants)
+        monkeypatch.setitem(sys.modules, "_pydevd_bundle.pydevd_constants", module)
+
+    # Act
+    result = get_pydevd_backend("sys_monitoring")
+
+    # Assert
+    assert result == expected
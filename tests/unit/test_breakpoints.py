@@ -0,0 +1,80 @@
+import json
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def unreal_classes(mock_unreal):
+    mock_unreal.uclass.return_value = lambda cls: cls
+    mock_unreal.ufunction.return_value = lambda func: func
+    return mock_unreal
+
+
+def _write_plugin_config(mocker, tmp_path, data):
+    plugin_config = tmp_path / "tool_config.json"
+    plugin_config.write_text(json.dumps(data), encoding="utf-8")
+    mocker.patch("pycharmdebug.utils.get_plugin_config", return_value=plugin_config)
+    return plugin_config
+
+
+def test_breakpoint_disabled_expects_config_read_once_and_nothing_imported(mocker, tmp_path):
+    # Arrange
+    import pycharmdebug
+    _write_plugin_config(mocker, tmp_path, {"breakpoints_enabled": False})
+    read = mocker.spy(__import__("pycharmdebug.utils").utils, "get_config_value")
+
+    # Act
+    for _ in range(3):
+        pycharmdebug.breakpoint()
+
+    # Assert
+    assert read.call_count == 1
+    assert "pycharmdebug.session" not in sys.modules
+    assert "pycharmdebug.actions.connect" not in sys.modules
+
+
+def test_breakpoint_enabled_expects_connect_on_first_hit_then_suspend(unreal_classes, mocker, tmp_path):
+    # Arrange
+    import pycharmdebug
+    from pycharmdebug.session import SESSION
+    _write_plugin_config(mocker, tmp_path, {"breakpoints_enabled": True, "debug_egg": "", "port_number": 42})
+    connect = mocker.patch("pycharmdebug.actions.connect.connect", return_value=True)
+    suspend = mocker.patch.object(SESSION, "suspend", side_effect=[False, True])
+
+    # Act
+    pycharmdebug.breakpoint()
+    caller = sys._getframe()
+    pycharmdebug.breakpoint()
+
+    # Assert
+    connect.assert_called_once_with("", 42, suspend=True, stop_at_frame=caller)
+    assert suspend.call_args[0][0] is caller
+
+
+def test_breakpoint_connect_fails_expects_disabled(unreal_classes, mocker, tmp_path):
+    # Arrange
+    import pycharmdebug
+    _write_plugin_config(mocker, tmp_path, {"breakpoints_enabled": True, "debug_egg": ""})
+    connect = mocker.patch("pycharmdebug.actions.connect.connect", return_value=False)
+
+    # Act
+    pycharmdebug.breakpoint()
+    pycharmdebug.breakpoint()
+
+    # Assert
+    connect.assert_called_once()
+    assert "disabled" in unreal_classes.log_warning.call_args[0][0]
+
+
+def test_set_breakpoints_enabled_expects_config_ignored(mocker):
+    # Arrange
+    import pycharmdebug
+    get_plugin_config = mocker.patch("pycharmdebug.utils.get_plugin_config")
+
+    # Act
+    pycharmdebug.set_breakpoints_enabled(False)
+    pycharmdebug.breakpoint()
+
+    # Assert
+    get_plugin_config.assert_not_called()
@@ -0,0 +1,244 @@
+import multiprocessing
+import subprocess
+import sys
+
+import pytest
+
+
+FAKE_PYDEVD = """
+import os
+def settrace(host, port=None, **kwargs):
+    with open(os.environ["MARKER"], "a") as marker:
+        marker.write(f"{host}:{port}:{kwargs['trace_only_current_thread']}\\n")
+"""
+
+
+def _initializer():
+    pass
+
+
+@pytest.fixture
+def children():
+    from pycharmdebug import children
+    yield children
+    children.uninstall()
+
+
+@pytest.fixture
+def config():
+    from pycharmdebug.child import ChildConfig
+    return ChildConfig("/tmp/egg", "localhost", 5678)
+
+
+@pytest.mark.parametrize(
+    "names, include, expected",
+    [
+        (["worker"], [], True),
+        (["worker", "tools.bake.run"], ["tools.bake.*"], True),
+        (["worker", ""], ["*.bake"], False),
+    ],
+)
+def test_matches_expects_fnmatch_on_any_name(names, include, expected):
+    # Arrange
+    from pycharmdebug.children import matches
+
+    # Act
+    result = matches(names, include)
+
+    # Assert
+    assert result is expected
+
+
+def test_get_process_names_with_pool_worker_expects_initializer():
+    # Arrange
+    from pycharmdebug.children import get_process_names
+    process = multiprocessing.Process(
+        target=multiprocessing.pool.worker, args=(None, None, _initializer)
+    )
+
+    # Act
+    names = get_process_names(process)
+
+    # Assert
+    assert names[1] == "multiprocessing.pool.worker"
+    assert names[-1] == f"{__name__}._initializer"
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [
+        (["python3", "-u", "-X", "dev", "job.py", "a"], ("python3", ["-u", "-X", "dev"], ["job.py"], ["a"])),
+        (["/usr/bin/python3.11", "-m", "tools.bake", "-v"], ("/usr/bin/python3.11", [], ["-m", "tools.bake"], ["-v"])),
+        (["python.exe", "-c", "pass"], ("python.exe", [], ["-c", "pass"], [])),
+    ],
+)
+def test_parse_python_command_expects_split(command, expected):
+    # Arrange
+    from pycharmdebug.children import parse_python_command
+
+    # Act
+    result = parse_python_command(command)
+
+    # Assert
+    assert tuple(result) == expected
+
+
+@pytest.mark.parametrize(
+    "command",
+    ["python job.py", ["git", "status"], ["python", "-I", "job.py"], ["python", "-"], ["python", "-u"]],
+)
+def test_parse_python_command_unsupported_expects_none(command):
+    # Arrange
+    from pycharmdebug.children import parse_python_command
+
+    # Act
+    result = parse_python_command(command)
+
+    # Assert
+    assert result is None
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [
+        (["python", "tools/job.py"], ["tools/job.py", "job.py"]),
+        (["python", "-m", "tools.bake"], ["tools.bake"]),
+        (["python", "-c", "import mytools; mytools.run()"], ["import mytools; mytools.run()"]),
+    ],
+)
+def test_get_command_names_expects_target_names(command, expected):
+    # Arrange
+    from pycharmdebug.children import get_command_names, parse_python_command
+
+    # Act
+    result = get_command_names(parse_python_command(command))
+
+    # Assert
+    assert result == expected
+
+
+def test_start_attached_expects_run_wrapped(mocker, children, config):
+    # Arrange
+    mocker.patch.object(children, "_is_attached", return_value=True)
+    original_start = mocker.patch.object(multiprocessing.process.BaseProcess, "start")
+    children.install(config, ["*._initializer"])
+    matching = multiprocessing.Process(target=_initializer)
+    other = multiprocessing.Process(target=print)
+
+    # Act
+    matching.start()
+    other.start()
+
+    # Assert
+    assert matching.run.func is children.run_process
+    assert matching.run.args == (config, multiprocessing.Process.run, matching)
+    assert "run" not in vars(other)
+    assert original_start.call_count == 2
+
+
+def test_start_detached_expects_run_untouched(mocker, children, config):
+    # Arrange
+    mocker.patch.object(children, "_is_attached", return_value=False)
+    mocker.patch.object(multiprocessing.process.BaseProcess, "start")
+    children.install(config)
+    process = multiprocessing.Process(target=_initializer)
+
+    # Act
+    process.start()
+
+    # Assert
+    assert "run" not in vars(process)
+
+
+def test_uninstall_expects_originals_restored(children, config):
+    # Arrange
+    start = multiprocessing.process.BaseProcess.start
+    popen_init = subprocess.Popen.__init__
+    children.install(config)
+
+    # Act
+    children.uninstall()
+
+    # Assert
+    assert multiprocessing.process.BaseProcess.start is start
+    assert subprocess.Popen.__init__ is popen_init
+
+
+def test_child_main_with_script_expects_attach_then_run(mocker, tmp_path):
+    # Arrange
+    from pycharmdebug import child
+    attach = mocker.patch.object(child, "attach")
+    mocker.patch.object(sys, "argv", [])
+    mocker.patch.object(sys, "path", [""] + sys.path)
+    script = tmp_path.joinpath("job.py")
+    script.write_text("import sys\nRESULT.extend(sys.argv)\n")
+    config = child.ChildConfig("/tmp/egg", "localhost", 5678)
+    mocker.patch.dict("os.environ", {child.CHILD_ENV_VAR: config.to_env()})
+    result = []
+    mocker.patch.object(child.runpy, "run_path", lambda path, run_name: exec(
+        open(path).read(), {"RESULT": result, "__name__": run_name}
+    ))
+
+    # Act
+    child.main([script.as_posix(), "a"])
+
+    # Assert
+    attach.assert_called_once_with(config)
+    assert result == [script.as_posix(), "a"]
+    assert child.CHILD_ENV_VAR not in __import__("os").environ
+
+
+@pytest.mark.parametrize("output_forwarding, expected", [("off", False), ("direct", True)])
+def test_child_attach_expects_output_forwarding_respected(mocker, output_forwarding, expected):
+    # Arrange
+    from pycharmdebug import child
+    pydevd_pycharm = mocker.MagicMock()
+    mocker.patch.dict(sys.modules, {"pydevd_pycharm": pydevd_pycharm})
+    mocker.patch.dict(sys.modules)
+    sys.modules.pop("pydevd", None)
+    config = child.ChildConfig("", "localhost", 5678, (), output_forwarding)
+
+    # Act
+    result = child.attach(child.ChildConfig.from_env(config.to_env()))
+
+    # Assert
+    assert result is True
+    pydevd_pycharm.settrace.assert_called_once_with(
+        "localhost",
+        port=5678,
+        suspend=False,
+        stdoutToServer=expected,
+        stderrToServer=expected,
+        trace_only_current_thread=False,
+    )
+
+
+def test_popen_python_attached_expects_child_connects(mocker, children, tmp_path):
+    # Arrange
+    from pycharmdebug.child import ChildConfig
+    egg = tmp_path.joinpath("egg")
+    egg.mkdir()
+    egg.joinpath("pydevd_pycharm.py").write_text(FAKE_PYDEVD)
+    marker = tmp_path.joinpath("marker.txt")
+    script = tmp_path.joinpath("job.py")
+    script.write_text("import sys\nprint(sys.argv[1:])\n")
+    mocker.patch.object(children, "_is_attached", return_value=True)
+    children.install(ChildConfig(egg.as_posix(), "localhost", 5678), ["job.py"])
+
+    # Act
+    result = subprocess.run(
+        [sys.executable, script.as_posix(), "a"],
+        # the fake egg has to win over an installed pydevd-pycharm
+        env={
+            **__import__("os").environ,
+            "MARKER": marker.as_posix(),
+            "PYTHONPATH": egg.as_posix(),
+        },
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Assert
+    assert result.stdout.strip() == "['a']"
+    assert marker.read_text() == "localhost:5678:False\n"
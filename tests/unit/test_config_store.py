@@ -0,0 +1,139 @@
+import json
+import os
+
+
+def test_config_store_read_expects_parsed_data(tmp_path):
+    # Arrange
+    from pycharmdebug.config_store import ConfigStore
+    config = tmp_path / "tool_config.json"
+    config.write_text(json.dumps({"port_number": 42}), encoding="utf-8")
+    store = ConfigStore()
+
+    # Act
+    result = store.read(config)
+
+    # Assert
+    assert result == {"port_number": 42}
+
+
+def test_config_store_repeated_read_expects_file_opened_once(tmp_path, mocker):
+    # Arrange
+    from pycharmdebug.config_store import ConfigStore
+    config = tmp_path / "tool_config.json"
+    config.write_text(json.dumps({"port_number": 42}), encoding="utf-8")
+    store = ConfigStore()
+    spy_load = mocker.spy(json, "load")
+
+    # Act
+    for _ in range(10):
+        store.read(config)
+
+    # Assert
+    assert spy_load.call_count == 1
+
+
+def test_config_store_file_changed_expects_reread(tmp_path):
+    # Arrange
+    from pycharmdebug.config_store import ConfigStore
+    config = tmp_path / "tool_config.json"
+    config.write_text(json.dumps({"port_number": 42}), encoding="utf-8")
+    store = ConfigStore()
+    store.read(config)
+
+    config.write_text(json.dumps({"port_number": 4242}), encoding="utf-8")
+    stat = config.stat()
+    os.utime(config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    # Act
+    result = store.read(config)
+
+    # Assert
+    assert result == {"port_number": 4242}
+
+
+def test_config_store_invalidate_expects_reread(tmp_path, mocker):
+    # Arrange
+    from pycharmdebug.config_store import ConfigStore
+    config = tmp_path / "tool_config.json"
+    config.write_text(json.dumps({"port_number": 42}), encoding="utf-8")
+    store = ConfigStore()
+    store.read(config)
+    spy_load = mocker.spy(json, "load")
+
+    # Act
+    store.invalidate(config)
+    store.read(config)
+
+    # Assert
+    assert spy_load.call_count == 1
+
+
+def test_get_debug_port_repeated_calls_expects_plugin_root_resolved_once(tmp_path, mocker):
+    # Arrange
+    from pycharmdebug import utils
+    config_dir = tmp_path / "Config"
+    config_dir.mkdir()
+    (config_dir / "tool_config.json").write_text(
+        json.dumps({"port_number": 42}), encoding="utf-8"
+    )
+    mocked_base_dir = mocker.patch.object(
+        utils.PluginBlueprintLibrary,
+        "get_plugin_base_dir",
+        return_value=tmp_path.as_posix(),
+    )
+
+    # Act
+    results = [utils.get_debug_port() for _ in range(5)]
+
+    # Assert
+    assert results == [42] * 5
+    mocked_base_dir.assert_called_once()
+
+
+def test_config_store_update_empty_file_expects_defaults_merged(tmp_path):
+    # Arrange
+    from pycharmdebug.config_store import ConfigStore
+    config = tmp_path / "tool_config.json"
+    config.touch()
+    store = ConfigStore()
+
+    # Act
+    result = store.update(config, {"port_number": 42}, defaults={"debug_egg": ""})
+
+    # Assert
+    assert result == {"debug_egg": "", "port_number": 42}
+    assert json.loads(config.read_text(encoding="utf-8")) == result
+    assert store.read(config) == result
+
+
+def test_config_store_update_expects_no_temp_files_left(tmp_path):
+    # Arrange
+    from pycharmdebug.config_store import ConfigStore
+    config = tmp_path / "tool_config.json"
+    store = ConfigStore()
+
+    # Act
+    store.update(config, {"port_number": 42})
+
+    # Assert
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "tool_config.json",
+        "tool_config.json.lock",
+    ]
+
+
+def test_file_lock_already_held_expects_raises_PyCharmDebugRuntimeError(tmp_path):
+    # Arrange
+    import pytest
+    from pycharmdebug.config_store import file_lock
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+    config = tmp_path / "tool_config.json"
+
+    # Act
+    with file_lock(config):
+        with pytest.raises(PyCharmDebugRuntimeError) as _ex:
+            with file_lock(config, timeout=0.1):
+                pass
+
+    # Assert
+    assert "Timed out waiting for lock" in str(_ex)
@@ -0,0 +1,169 @@
+import socket
+
+import pytest
+
+
+@pytest.fixture
+def listening_port():
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    yield server.getsockname()[1]
+    server.close()
+
+
+@pytest.fixture
+def closed_port():
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    port = server.getsockname()[1]
+    server.close()
+    return port
+
+
+def _run_ticks(mock_unreal, pending):
+    pending._done.wait(5)
+    tick = mock_unreal.register_slate_post_tick_callback.call_args[0][0]
+    tick(0.0)
+
+
+def test_probe_server_listening_expects_latency(listening_port):
+    # Arrange
+    from pycharmdebug.connection import probe_server
+
+    # Act
+    result = probe_server("127.0.0.1", listening_port)
+
+    # Assert
+    assert 0 <= result < 0.1
+
+
+def test_probe_server_nothing_listening_expects_raises_PyCharmDebugRuntimeError(closed_port):
+    # Arrange
+    import time
+    from pycharmdebug.connection import probe_server
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+    start = time.perf_counter()
+
+    # Act
+    with pytest.raises(PyCharmDebugRuntimeError) as _ex:
+        probe_server("127.0.0.1", closed_port)
+
+    # Assert
+    assert "No PyCharm debug server listening" in str(_ex)
+    assert time.perf_counter() - start < 0.1
+
+
+def test_probe_server_no_answer_expects_raises_PyCharmDebugRuntimeError(mocker, listening_port):
+    # Arrange
+    from pycharmdebug.connection import probe_server
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+    mocker.patch("select.select", return_value=([], [], []))
+
+    # Act
+    with pytest.raises(PyCharmDebugRuntimeError) as _ex:
+        probe_server("127.0.0.1", listening_port, timeout=0.05)
+
+    # Assert
+    assert "No answer from" in str(_ex)
+
+
+def test_wait_for_server_listening_expects_latency(listening_port):
+    # Arrange
+    from pycharmdebug.connection import wait_for_server
+
+    # Act
+    result = wait_for_server("127.0.0.1", listening_port, timeout=1.0)
+
+    # Assert
+    assert result is not None
+
+
+def test_wait_for_server_nothing_listening_expects_none(closed_port):
+    # Arrange
+    from pycharmdebug.connection import wait_for_server
+
+    # Act
+    result = wait_for_server("127.0.0.1", closed_port, timeout=0.3)
+
+    # Assert
+    assert result is None
+
+
+def test_connect_async_server_listening_expects_on_ready_called_on_tick(mock_unreal, listening_port, mocker):
+    # Arrange
+    from pycharmdebug.connection import connect_async
+    on_ready = mocker.Mock()
+
+    # Act
+    pending = connect_async("127.0.0.1", listening_port, 1.0, on_ready)
+    on_ready.assert_not_called()
+    _run_ticks(mock_unreal, pending)
+
+    # Assert
+    on_ready.assert_called_once()
+    mock_unreal.unregister_slate_post_tick_callback.assert_called_once()
+    assert pending.pending is False
+
+
+def test_connect_async_nothing_listening_expects_error_logged(mock_unreal, closed_port, mocker):
+    # Arrange
+    from pycharmdebug.connection import connect_async
+    on_ready = mocker.Mock()
+
+    # Act
+    pending = connect_async("127.0.0.1", closed_port, 0.2, on_ready)
+    _run_ticks(mock_unreal, pending)
+
+    # Assert
+    on_ready.assert_not_called()
+    assert "No PyCharm debug server found" in mock_unreal.log_error.call_args[0][0]
+
+
+def test_connect_async_already_pending_expects_none(mock_unreal, closed_port, mocker):
+    # Arrange
+    from pycharmdebug.connection import connect_async
+    first = connect_async("127.0.0.1", closed_port, 0.2, mocker.Mock())
+
+    # Act
+    result = connect_async("127.0.0.1", closed_port, 0.2, mocker.Mock())
+
+    # Assert
+    assert result is None
+    first._done.wait(5)
+
+
+def test_connect_async_cancelled_expects_on_ready_not_called(mock_unreal, listening_port, mocker):
+    # Arrange
+    from pycharmdebug.connection import cancel_connect, connect_async
+    on_ready = mocker.Mock()
+    pending = connect_async("127.0.0.1", listening_port, 1.0, on_ready)
+
+    # Act
+    cancelled = cancel_connect()
+    _run_ticks(mock_unreal, pending)
+
+    # Assert
+    assert cancelled is True
+    on_ready.assert_not_called()
+    assert pending.pending is False
+    assert cancel_connect() is False
+
+
+def test_disconnect_while_connect_pending_expects_connect_cancelled(mock_unreal, listening_port, mocker):
+    # Arrange
+    mock_unreal.ToolMenuEntryScript = object
+    mock_unreal.uclass.return_value = lambda cls: cls
+    mock_unreal.ufunction.return_value = lambda func: func
+    from pycharmdebug.actions.disconnect import PyCharmDebugDisconnect
+    from pycharmdebug.connection import connect_async
+    on_ready = mocker.Mock()
+    pending = connect_async("127.0.0.1", listening_port, 1.0, on_ready)
+
+    # Act
+    PyCharmDebugDisconnect.execute(None, None)
+    _run_ticks(mock_unreal, pending)
+
+    # Assert
+    on_ready.assert_not_called()
+    mock_unreal.log_warning.assert_not_called()
@@ -0,0 +1,146 @@
+import json
+import os
+
+import pytest
+
+
+def _make_install(root, build=None, egg=True):
+    (root / "bin").mkdir(parents=True)
+    if build is not None:
+        (root / "product-info.json").write_text(
+            json.dumps({"buildNumber": build}), encoding="utf-8"
+        )
+    if egg:
+        (root / "debug-eggs").mkdir()
+        (root / "debug-eggs" / "pydevd-pycharm.egg").touch()
+    return root
+
+
+@pytest.fixture
+def isolated_discovery(mocker, monkeypatch, tmp_path):
+    for name in list(os.environ):
+        if name.lower().startswith("pycharm"):
+            monkeypatch.delenv(name)
+    toolbox = tmp_path / "Toolbox" / "apps"
+    prefix = tmp_path / "opt"
+    toolbox.mkdir(parents=True)
+    prefix.mkdir()
+    mocker.patch("pycharmdebug.discovery.get_toolbox_dirs", return_value=[toolbox])
+    mocker.patch("pycharmdebug.discovery.get_system_prefixes", return_value=[prefix])
+    return tmp_path
+
+
+def test_find_installations_env_vars_expects_all_entries_newest_first(isolated_discovery, monkeypatch):
+    # Arrange
+    from pycharmdebug.discovery import find_installations
+    old = _make_install(isolated_discovery / "old", build="PY-233.1.2")
+    new = _make_install(isolated_discovery / "new", build="241.5.6")
+    community = _make_install(isolated_discovery / "community", build="PC-241.7.8")
+    monkeypatch.setenv("PyCharm", f"{old / 'bin'};{new / 'bin'};")
+    monkeypatch.setenv("PyCharm Community Edition", f"{community / 'bin'};")
+
+    # Act
+    result = find_installations()
+
+    # Assert
+    assert [install.root for install in result] == [
+        community.as_posix(), new.as_posix(), old.as_posix()
+    ]
+    assert result[0].egg == (community / "debug-eggs" / "pydevd-pycharm.egg").as_posix()
+    assert result[0].build == (241, 7, 8)
+
+
+def test_get_env_bin_dirs_expects_flags_and_plugin_settings_ignored(isolated_discovery, monkeypatch):
+    # Arrange
+    from pycharmdebug.discovery import get_env_bin_dirs
+    bin_dir = (isolated_discovery / "pycharm" / "bin").as_posix()
+    monkeypatch.setenv("PyCharm", f"{bin_dir};")
+    monkeypatch.setenv("PYCHARM_HOSTED", "1")
+    monkeypatch.setenv("PYCHARM_DISPLAY_PORT", "63342")
+    monkeypatch.setenv("PYCHARMDEBUG_PORT", "5678")
+    monkeypatch.setenv("PYCHARMDEBUG_DEBUG_EGG", "/opt/pydevd-pycharm.egg")
+
+    # Act
+    result = get_env_bin_dirs()
+
+    # Assert
+    assert result == [bin_dir]
+
+
+def test_find_installations_toolbox_layouts_expects_found(isolated_discovery):
+    # Arrange
+    from pycharmdebug.discovery import find_installations
+    apps = isolated_discovery / "Toolbox" / "apps"
+    legacy = _make_install(apps / "PyCharm-P" / "ch-0" / "233.1.2", build="233.1.2")
+    current = _make_install(apps / "pycharm-professional", build="242.1.2")
+    _make_install(apps / "clion", build="250.1.1")
+
+    # Act
+    result = find_installations()
+
+    # Assert
+    assert [install.root for install in result] == [current.as_posix(), legacy.as_posix()]
+    assert {install.source for install in result} == {"toolbox"}
+
+
+def test_find_installations_system_prefix_without_egg_expects_empty_egg(isolated_discovery):
+    # Arrange
+    from pycharmdebug.discovery import find_installations
+    install = _make_install(isolated_discovery / "opt" / "pycharm-2024.1", egg=False)
+
+    # Act
+    result = find_installations()
+
+    # Assert
+    assert result[0].root == install.as_posix()
+    assert result[0].egg == ""
+    assert result[0].build == ()
+
+
+def test_find_installations_repeated_expects_single_scan(isolated_discovery, mocker):
+    # Arrange
+    from pycharmdebug import discovery
+    _make_install(isolated_discovery / "opt" / "pycharm", build="241.1.1")
+    spy_scan = mocker.spy(discovery, "_scan")
+
+    # Act
+    for _ in range(5):
+        discovery.find_installations()
+
+    # Assert
+    assert spy_scan.call_count == 1
+
+
+def test_find_installations_new_install_expects_rescan(isolated_discovery):
+    # Arrange
+    from pycharmdebug.discovery import find_installations
+    _make_install(isolated_discovery / "opt" / "pycharm-old", build="233.1.1")
+    find_installations()
+    prefix = isolated_discovery / "opt"
+    new = _make_install(prefix / "pycharm-new", build="241.1.1")
+    stat = prefix.stat()
+    os.utime(prefix, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    # Act
+    result = find_installations()
+
+    # Assert
+    assert result[0].root == new.as_posix()
+
+
+def test_find_installations_persisted_index_expects_loaded_without_scan(isolated_discovery, mock_unreal, mocker):
+    # Arrange
+    from pycharmdebug import discovery
+    mock_unreal.Paths.project_saved_dir.return_value = (isolated_discovery / "Saved").as_posix()
+    _make_install(isolated_discovery / "opt" / "pycharm", build="241.1.1")
+    expected = discovery.find_installations()
+    discovery.clear_index()
+    spy_scan = mocker.spy(discovery, "_scan")
+
+    # Act
+    result = discovery.find_installations()
+
+    # Assert
+    assert result == expected
+    assert (isolated_discovery / "Saved" / "PyCharmDebug" / "pycharm_index.json").is_file()
+    spy_scan.assert_not_called()
@@ -0,0 +1,87 @@
+import zipfile
+
+import pytest
+
+
+@pytest.fixture
+def cache_root(mock_unreal, tmp_path):
+    saved_dir = tmp_path / "Saved"
+    mock_unreal.Paths.project_saved_dir.return_value = saved_dir.as_posix()
+    return saved_dir / "PyCharmDebug" / "egg_cache"
+
+
+def _write_egg(path, source="VALUE = 42\n"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path.as_posix(), "w") as archive:
+        archive.writestr("pydevd_pycharm.py", source)
+    return path.as_posix()
+
+
+def test_prepare_egg_expects_extracted_and_compiled(cache_root, tmp_path):
+    # Arrange
+    from pycharmdebug.egg_cache import prepare_egg
+    egg = _write_egg(tmp_path / "eggs" / "pydevd-pycharm.egg")
+
+    # Act
+    result = prepare_egg(egg)
+
+    # Assert
+    extracted = cache_root / result.rsplit("/", 1)[-1]
+    assert result == extracted.as_posix()
+    assert (extracted / "pydevd_pycharm.py").is_file()
+    assert list((extracted / "__pycache__").glob("pydevd_pycharm.*.pyc"))
+
+
+def test_prepare_egg_already_cached_expects_not_extracted_again(cache_root, tmp_path, mocker):
+    # Arrange
+    from pycharmdebug.egg_cache import prepare_egg
+    egg = _write_egg(tmp_path / "eggs" / "pydevd-pycharm.egg")
+    first = prepare_egg(egg)
+    spy_extract = mocker.spy(zipfile.ZipFile, "extractall")
+
+    # Act
+    result = prepare_egg(egg)
+
+    # Assert
+    assert result == first
+    spy_extract.assert_not_called()
+
+
+def test_prepare_egg_new_egg_expects_stale_entry_evicted(cache_root, tmp_path):
+    # Arrange
+    from pycharmdebug.egg_cache import prepare_egg
+    old = prepare_egg(_write_egg(tmp_path / "old" / "pydevd-pycharm.egg"))
+
+    # Act
+    new = prepare_egg(_write_egg(tmp_path / "new" / "pydevd-pycharm.egg", "VALUE = 7\n"))
+
+    # Assert
+    assert new != old
+    assert [path.as_posix() for path in cache_root.iterdir()] == [new]
+
+
+def test_prepare_egg_other_python_entry_expects_kept(cache_root, tmp_path):
+    # Arrange
+    from pycharmdebug.egg_cache import prepare_egg
+    other = cache_root / "pydevd-0123456789abcdef-py27"
+    other.mkdir(parents=True)
+
+    # Act
+    prepare_egg(_write_egg(tmp_path / "eggs" / "pydevd-pycharm.egg"))
+
+    # Assert
+    assert other.is_dir()
+
+
+def test_get_cache_entry_name_expects_python_version_in_key(cache_root, tmp_path):
+    # Arrange
+    import sys
+    from pycharmdebug.egg_cache import get_cache_entry_name
+    egg = _write_egg(tmp_path / "pydevd-pycharm.egg")
+
+    # Act
+    result = get_cache_entry_name(tmp_path / "pydevd-pycharm.egg")
+
+    # Assert
+    assert result.startswith("pydevd-")
+    assert result.endswith(f"-py{sys.version_info.major}{sys.version_info.minor}")
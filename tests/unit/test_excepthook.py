@@ -0,0 +1,103 @@
+import json
+import sys
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def restore_hooks(monkeypatch):
+    monkeypatch.setattr(sys, "excepthook", sys.excepthook)
+    monkeypatch.setattr(threading, "excepthook", threading.excepthook)
+
+
+def _write_plugin_config(mocker, tmp_path, data):
+    plugin_config = tmp_path / "tool_config.json"
+    plugin_config.write_text(json.dumps(data), encoding="utf-8")
+    mocker.patch("pycharmdebug.utils.get_plugin_config", return_value=plugin_config)
+    return plugin_config
+
+
+def _exc_info():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        return sys.exc_info()
+
+
+def test_install_expects_no_config_read_and_previous_hook_chained(restore_hooks, mocker):
+    # Arrange
+    from pycharmdebug.excepthook import install
+    previous = mocker.MagicMock()
+    sys.excepthook = previous
+
+    # Act
+    install()
+    install()
+
+    # Assert
+    assert "pycharmdebug.utils" not in sys.modules
+    assert sys.excepthook is not previous
+    sys.excepthook(*_exc_info())
+    previous.assert_called_once()
+
+
+def test_excepthook_disabled_expects_no_connect(restore_hooks, mocker, tmp_path):
+    # Arrange
+    from pycharmdebug.excepthook import install
+    _write_plugin_config(mocker, tmp_path, {"post_mortem": False})
+    post_mortem = mocker.patch("pycharmdebug.excepthook.post_mortem")
+    install()
+
+    # Act
+    sys.excepthook(*_exc_info())
+
+    # Assert
+    post_mortem.assert_not_called()
+
+
+def test_excepthook_enabled_expects_post_mortem_with_exception(restore_hooks, mocker, tmp_path):
+    # Arrange
+    from pycharmdebug.excepthook import install
+    _write_plugin_config(mocker, tmp_path, {"post_mortem": True})
+    post_mortem = mocker.patch("pycharmdebug.excepthook.post_mortem")
+    exc_info = _exc_info()
+    install()
+
+    # Act
+    sys.excepthook(*exc_info)
+    sys.excepthook(KeyboardInterrupt, KeyboardInterrupt(), None)
+
+    # Assert
+    post_mortem.assert_called_once_with(*exc_info)
+
+
+def test_post_mortem_not_attached_expects_untraced_connect_then_exception_shown(mock_unreal, mocker, tmp_path):
+    # Arrange
+    mock_unreal.uclass.return_value = lambda cls: cls
+    mock_unreal.ufunction.return_value = lambda func: func
+    from pycharmdebug.excepthook import post_mortem
+    from pycharmdebug.session import SESSION
+    _write_plugin_config(mocker, tmp_path, {"debug_egg": "", "port_number": 42})
+    connect = mocker.patch("pycharmdebug.actions.connect.connect", return_value=True)
+    show = mocker.patch.object(SESSION, "post_mortem", return_value=True)
+    exc_info = _exc_info()
+
+    # Act
+    result = post_mortem(*exc_info)
+
+    # Assert
+    assert result is True
+    connect.assert_called_once_with("", 42, suspend=False, trace_on_connect=False)
+    show.assert_called_once_with(exc_info)
+
+
+def test_post_mortem_no_exception_expects_false():
+    # Arrange
+    from pycharmdebug.excepthook import post_mortem
+
+    # Act
+    result = post_mortem()
+
+    # Assert
+    assert result is False
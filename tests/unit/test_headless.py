@@ -0,0 +1,133 @@
+import sys
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clean_environment(monkeypatch):
+    for name in ("PYCHARMDEBUG", "PYCHARMDEBUG_HOST", "PYCHARMDEBUG_PORT", "PYCHARMDEBUG_TIMEOUT"):
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.fixture
+def unreal_classes(mock_unreal):
+    mock_unreal.uclass.return_value = lambda cls: cls
+    mock_unreal.ufunction.return_value = lambda func: func
+    mock_unreal.SystemLibrary.get_command_line.return_value = "MyProject -run=cook -nullrhi"
+    return mock_unreal
+
+
+def test_auto_attach_not_requested_expects_nothing_imported(unreal_classes):
+    # Arrange
+    from pycharmdebug.headless import auto_attach
+
+    # Act
+    result = auto_attach()
+
+    # Assert
+    assert result is None
+    assert "pycharmdebug.utils" not in sys.modules
+    assert "pydevd_pycharm" not in sys.modules
+
+
+@pytest.mark.parametrize(
+    "env, command_line, expected",
+    [
+        ("1", "", "wait"),
+        ("strict", "", "strict"),
+        (None, "MyProject -PyCharmDebug", "wait"),
+        (None, "MyProject -pycharmdebug=Strict -nullrhi", "strict"),
+        ("0", "MyProject -PyCharmDebug", None),
+    ],
+)
+def test_get_request_expects_mode(unreal_classes, monkeypatch, env, command_line, expected):
+    # Arrange
+    from pycharmdebug.headless import get_request
+    if env is not None:
+        monkeypatch.setenv("PYCHARMDEBUG", env)
+    unreal_classes.SystemLibrary.get_command_line.return_value = command_line
+
+    # Act
+    result = get_request()
+
+    # Assert
+    assert (result and result.mode) == expected
+
+
+def test_auto_attach_strict_server_missing_expects_raises_PyCharmDebugRuntimeError(unreal_classes, monkeypatch, mocker):
+    # Arrange
+    from pycharmdebug.headless import auto_attach
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+    monkeypatch.setenv("PYCHARMDEBUG", "strict")
+    monkeypatch.setenv("PYCHARMDEBUG_PORT", "6000")
+    monkeypatch.setenv("PYCHARMDEBUG_TIMEOUT", "0.5")
+    mocker.patch("pycharmdebug.utils.get_debug_host", return_value="localhost")
+    mocker.patch("pycharmdebug.utils.get_debug_egg", return_value="")
+    wait = mocker.patch("pycharmdebug.connection.wait_for_server", return_value=None)
+
+    # Act
+    with pytest.raises(PyCharmDebugRuntimeError) as _ex:
+        auto_attach()
+
+    # Assert
+    wait.assert_called_once_with("localhost", 6000, 0.5)
+    assert "No PyCharm debug server found on localhost:6000" in str(_ex)
+
+
+def test_auto_attach_wait_expects_attach_on_worker_thread_tracing_all_threads(unreal_classes, monkeypatch, mocker):
+    # Arrange
+    from pycharmdebug.headless import auto_attach
+    monkeypatch.setenv("PYCHARMDEBUG", "wait")
+    monkeypatch.setenv("PYCHARMDEBUG_HOST", "buildbox")
+    monkeypatch.setenv("PYCHARMDEBUG_PORT", "6000")
+    mocker.patch("pycharmdebug.utils.get_debug_egg", return_value="")
+    mocker.patch("pycharmdebug.utils.get_config_value", return_value=5.0)
+    mocker.patch("pycharmdebug.connection.wait_for_server", return_value=0.001)
+    attach = mocker.patch("pycharmdebug.actions.connect.attach", return_value=True)
+
+    # Act
+    worker = auto_attach()
+    worker.join(5)
+
+    # Assert
+    attach.assert_called_once_with("", 6000, host="buildbox", trace_only_current_thread=False)
+
+
+@pytest.mark.parametrize(
+    "name, value", [("PYCHARMDEBUG_PORT", "56xx"), ("PYCHARMDEBUG_TIMEOUT", "soon")]
+)
+def test_auto_attach_invalid_env_expects_error_logged(unreal_classes, monkeypatch, name, value):
+    # Arrange
+    from pycharmdebug.headless import auto_attach
+    monkeypatch.setenv("PYCHARMDEBUG", "strict")
+    monkeypatch.setenv(name, value)
+
+    # Act
+    result = auto_attach()
+
+    # Assert
+    assert result is None
+    assert name in unreal_classes.log_error.call_args[0][0]
+
+
+def test_init_unreal_strict_attach_fails_expects_menu_installed(unreal_classes, monkeypatch, mocker):
+    # Arrange
+    import runpy
+    from pathlib import Path
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+    import pycharmdebug
+    init_unreal = Path(pycharmdebug.__file__).parents[1] / "init_unreal.py"
+    install = mocker.patch("pycharmdebug.menu.install")
+    mocker.patch("pycharmdebug.excepthook.install")
+    mocker.patch("pycharmdebug.watchdog.install")
+    mocker.patch(
+        "pycharmdebug.headless.auto_attach",
+        side_effect=PyCharmDebugRuntimeError("No PyCharm debug server found"),
+    )
+
+    # Act
+    with pytest.raises(PyCharmDebugRuntimeError):
+        runpy.run_path(init_unreal.as_posix())
+
+    # Assert
+    install.assert_called_once()
@@ -0,0 +1,152 @@
+import tracemalloc
+
+import pytest
+
+
+@pytest.fixture
+def tracker():
+    from pycharmdebug.memory import MemoryTracker
+    tracker = MemoryTracker()
+    yield tracker
+    tracker.stop()
+
+
+def _allocate():
+    return [bytearray(1024) for _ in range(200)]
+
+
+def test_start_expects_tracing_and_baseline_snapshot(tracker):
+    # Act
+    result = tracker.start()
+
+    # Assert
+    assert result == "snapshot-1"
+    assert tracemalloc.is_tracing()
+    assert tracker.running
+
+
+def test_stop_expects_tracing_stopped_and_snapshots_dropped(tracker):
+    # Arrange
+    tracker.start()
+
+    # Act
+    tracker.stop()
+
+    # Assert
+    assert tracemalloc.is_tracing() is False
+    assert tracker.snapshots == {}
+
+
+def test_stop_tracing_started_elsewhere_expects_tracing_left_on(tracker):
+    # Arrange
+    tracemalloc.start()
+    tracker.start()
+
+    # Act
+    tracker.stop()
+
+    # Assert
+    assert tracemalloc.is_tracing()
+    tracemalloc.stop()
+
+
+def test_take_snapshot_not_started_expects_raises_PyCharmDebugRuntimeError(tracker):
+    # Arrange
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+
+    # Act
+    with pytest.raises(PyCharmDebugRuntimeError) as _ex:
+        tracker.take_snapshot()
+
+    # Assert
+    assert "not started" in str(_ex)
+
+
+def test_diff_expects_growth_grouped_by_line(tracker):
+    # Arrange
+    tracker.start()
+    kept = _allocate()
+    tracker.take_snapshot("after")
+
+    # Act
+    result = tracker.diff("snapshot-1", "after", limit=5)
+
+    # Assert
+    assert len(result) <= 5
+    top = result[0]
+    assert top.traceback[0].filename == __file__
+    assert top.size_diff >= 200 * 1024
+    del kept
+
+
+def test_diff_unknown_snapshot_expects_raises_PyCharmDebugRuntimeError(tracker):
+    # Arrange
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+    tracker.start()
+
+    # Act
+    with pytest.raises(PyCharmDebugRuntimeError) as _ex:
+        tracker.diff("snapshot-1", "foo")
+
+    # Assert
+    assert "No memory snapshot named foo" in str(_ex)
+
+
+def test_latest_pair_expects_two_newest_names(tracker):
+    # Arrange
+    tracker.start()
+    tracker.take_snapshot("a")
+    tracker.take_snapshot("b")
+
+    # Act
+    result = tracker.latest_pair()
+
+    # Assert
+    assert result == ("a", "b")
+
+
+def test_take_snapshot_over_max_expects_oldest_numbered_dropped(tracker):
+    # Arrange
+    tracker.start()
+    tracker.take_snapshot()
+    tracker.take_snapshot("before load")
+    tracker.take_snapshot()
+
+    # Act
+    result = tracker.take_snapshot()
+
+    # Assert
+    assert result == "snapshot-5"
+    assert list(tracker.snapshots) == [
+        "snapshot-1", "before load", "snapshot-4", "snapshot-5"
+    ]
+
+
+def test_format_diff_and_write_expects_report_file(tracker, tmp_path):
+    # Arrange
+    from pycharmdebug.memory import format_diff, write_diff
+    tracker.start()
+    kept = _allocate()
+    tracker.take_snapshot("after load")
+    stats = tracker.diff("snapshot-1", "after load", limit=3)
+
+    # Act
+    report = format_diff("snapshot-1", "after load", stats)
+    path = write_diff("snapshot-1", "after load", report, directory=tmp_path)
+
+    # Assert
+    assert report.startswith(f"Top {len(stats)} allocation changes from snapshot-1 to after load")
+    assert f"{__file__}:" in report
+    assert path.name.endswith("-snapshot-1-to-after_load.txt")
+    assert path.read_text(encoding="utf-8") == report + "\n"
+    del kept
+
+
+def test_format_size_expects_signed_units():
+    # Arrange
+    from pycharmdebug.memory import format_size
+
+    # Act, Assert
+    assert format_size(512) == "+512.0 B"
+    assert format_size(-1536) == "-1.5 KiB"
+    assert format_size(3 * 1024 ** 3) == "+3.0 GiB"
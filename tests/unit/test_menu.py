@@ -0,0 +1,90 @@
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+
+class FakeToolMenuEntryScript:
+    def __init__(self):
+        self.data = MagicMock()
+
+
+@pytest.fixture
+def unreal_classes(mock_unreal):
+    mock_unreal.uclass.return_value = lambda cls: cls
+    mock_unreal.ufunction.return_value = lambda func: func
+    mock_unreal.ToolMenuEntryScript = FakeToolMenuEntryScript
+    return mock_unreal
+
+
+def test_install_lazy_expects_no_action_modules_imported(unreal_classes):
+    # Arrange
+    from pycharmdebug.menu import install, MENU_ENTRIES
+
+    # Act
+    install()
+
+    # Assert
+    assert not [name for name in sys.modules if name.startswith("pycharmdebug.actions.")]
+    assert "pycharmdebug.utils" not in sys.modules
+    tool_bar = unreal_classes.ToolMenus.get().find_menu()
+    assert tool_bar.add_sub_menu().add_menu_entry.call_count == len(MENU_ENTRIES)
+
+
+def test_menu_entry_execute_expects_action_imported_once_and_executed(unreal_classes):
+    # Arrange
+    from pycharmdebug.menu import PyCharmDebugMenuEntry, get_action
+    stub = PyCharmDebugMenuEntry()
+    stub.data.name = "stop_debugger"
+
+    # Act
+    stub.execute(None)
+    stub.execute(None)
+
+    # Assert
+    assert "pycharmdebug.actions.disconnect" in sys.modules
+    assert "pycharmdebug.actions.connect" not in sys.modules
+    assert get_action("stop_debugger") is get_action("stop_debugger")
+    assert unreal_classes.log_warning.call_count == 2
+    assert "Not connected" in unreal_classes.log_warning.call_args[0][0]
+
+
+def test_install_eager_expects_actions_constructed(unreal_classes):
+    # Arrange
+    from pycharmdebug.menu import install, MENU_ENTRIES
+
+    # Act
+    install(lazy=False)
+
+    # Assert
+    for entry in MENU_ENTRIES:
+        assert f"pycharmdebug.actions.{entry.module}" in sys.modules
+
+
+def test_actions_package_attribute_expects_action_class(unreal_classes):
+    # Arrange
+    import pycharmdebug.actions as actions
+
+    # Act
+    result = actions.PyCharmDebugConfig
+
+    # Assert
+    assert result.__name__ == "PyCharmDebugConfig"
+    with pytest.raises(AttributeError):
+        actions.PyCharmDebugFoo
+
+
+def test_menu_entry_get_label_expects_state_only_once_supervisor_loaded(unreal_classes):
+    # Arrange
+    from pycharmdebug.menu import PyCharmDebugMenuEntry
+    stub = PyCharmDebugMenuEntry()
+    stub.data.name = "start_debugger"
+
+    # Act
+    before = stub.get_label(None)
+    import pycharmdebug.supervisor
+    after = stub.get_label(None)
+
+    # Assert
+    assert before == "Connect"
+    assert after == "Connect (disconnected)"
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def log_dir(mock_unreal, tmp_path):
+    mock_unreal.Paths.project_log_dir.return_value = tmp_path.as_posix()
+    return tmp_path
+
+
+def test_timed_expects_metric_recorded_and_exported(log_dir):
+    # Arrange
+    from pycharmdebug.metrics import METRICS, METRICS_FILE_NAME, timed
+
+    # Act
+    with timed("pydevd_import", backend="settrace"):
+        pass
+
+    # Assert
+    metric = METRICS.last("pydevd_import")
+    assert metric.ok is True
+    assert metric.duration >= 0
+    line = json.loads((log_dir / METRICS_FILE_NAME).read_text(encoding="utf-8"))
+    assert line["name"] == "pydevd_import"
+    assert line["backend"] == "settrace"
+
+
+def test_timed_decorator_raises_expects_failure_recorded(log_dir):
+    # Arrange
+    from pycharmdebug.metrics import METRICS, timed
+
+    @timed("egg_resolve")
+    def resolve():
+        raise ValueError("foo")
+
+    # Act
+    with pytest.raises(ValueError):
+        resolve()
+
+    # Assert
+    assert METRICS.last("egg_resolve").ok is False
+
+
+def test_ring_buffer_full_expects_oldest_dropped():
+    # Arrange
+    from pycharmdebug.metrics import MetricsRecorder
+    recorder = MetricsRecorder(size=3)
+    recorder.export = False
+
+    # Act
+    for index in range(5):
+        recorder.record("settrace", float(index))
+
+    # Assert
+    assert [metric.duration for metric in recorder.records()] == [2.0, 3.0, 4.0]
+
+
+def test_summary_expects_p50_and_p95_per_operation():
+    # Arrange
+    from pycharmdebug.metrics import MetricsRecorder
+    recorder = MetricsRecorder()
+    recorder.export = False
+    for index in range(1, 101):
+        recorder.record("handshake", index / 1000)
+    recorder.record("disconnect", 0.5)
+
+    # Act
+    result = recorder.summary()
+
+    # Assert
+    assert result["handshake"].calls == 100
+    assert result["handshake"].p50 == pytest.approx(0.05)
+    assert result["handshake"].p95 == pytest.approx(0.095)
+    assert result["handshake"].max == pytest.approx(0.1)
+    assert result["disconnect"].p95 == 0.5
+
+
+def test_no_log_dir_expects_buffer_only():
+    # Arrange
+    from pycharmdebug.metrics import METRICS
+
+    # Act
+    METRICS.record("settrace", 0.01)
+
+    # Assert
+    assert len(METRICS.records("settrace")) == 1
+
+
+def test_format_timings_expects_recorded_connect_steps():
+    # Arrange
+    from pycharmdebug.metrics import METRICS, format_timings
+    METRICS.record("pydevd_import", 0.1203)
+    METRICS.record("settrace", 0.041)
+
+    # Act
+    result = format_timings()
+
+    # Assert
+    assert result == "pydevd_import 120.3 ms, settrace 41.0 ms"
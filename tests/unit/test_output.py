@@ -0,0 +1,120 @@
+import io
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def sent():
+    return []
+
+
+def _forwarder(sent, **settings):
+    from pycharmdebug.output import (
+        OutputForwarder,
+        OutputSettings,
+        STDOUT_CONTEXT,
+    )
+    stream = io.StringIO()
+    forwarder = OutputForwarder(
+        stream, STDOUT_CONTEXT, lambda text, context: sent.append((text, context)),
+        OutputSettings(mode="buffered", **settings),
+    )
+    return forwarder, stream
+
+
+def test_write_under_thresholds_expects_tee_and_nothing_sent(sent):
+    # Arrange
+    forwarder, stream = _forwarder(sent, flush_size=100, flush_interval=60.0)
+
+    # Act
+    for _ in range(10):
+        forwarder.write("line\n")
+
+    # Assert
+    assert stream.getvalue() == "line\n" * 10
+    assert sent == []
+
+
+def test_write_flush_size_reached_expects_one_batch_sent(sent):
+    # Arrange
+    forwarder, _ = _forwarder(sent, flush_size=10, flush_interval=60.0)
+
+    # Act
+    forwarder.write("12345")
+    forwarder.write("67890")
+
+    # Assert
+    assert sent == [("1234567890", 1)]
+
+
+def test_flush_remote_over_rate_limit_expects_output_dropped_and_reported(sent):
+    # Arrange
+    forwarder, stream = _forwarder(sent, flush_size=1000, flush_interval=60.0, rate_limit=4)
+
+    # Act
+    forwarder.write("0123456789")
+    forwarder.flush_remote(force=True)
+
+    # Assert
+    assert stream.getvalue() == "0123456789"
+    assert sent[0] == ("0123", 1)
+    assert forwarder.dropped == 6
+    assert "6 bytes of output dropped" in sent[1][0]
+    assert sent[1][1] == 2
+
+
+def test_flush_remote_over_rate_limit_expects_utf8_bytes_counted(sent):
+    # Arrange
+    forwarder, _ = _forwarder(sent, flush_size=1000, flush_interval=60.0, rate_limit=5)
+
+    # Act
+    forwarder.write("\u00e9\u00e9\u00e9")  # two bytes each in UTF-8
+    forwarder.flush_remote(force=True)
+
+    # Assert
+    assert sent[0] == ("\u00e9\u00e9", 1)
+    assert forwarder.dropped == 2
+
+
+def test_flush_remote_flooded_expects_one_drop_notice(sent):
+    # Arrange
+    from pycharmdebug.output import STDERR_CONTEXT
+    forwarder, _ = _forwarder(sent, flush_size=10, flush_interval=60.0, rate_limit=4)
+
+    # Act
+    for _ in range(5):
+        forwarder.write("0123456789")  # every write fills a batch and flushes
+    flooding = [text for text, context in sent if context == STDERR_CONTEXT]
+    forwarder.flush_remote(force=True)
+
+    # Assert
+    notices = [text for text, context in sent if context == STDERR_CONTEXT]
+    assert flooding == []
+    assert len(notices) == 1
+    assert "46 bytes of output dropped" in notices[0]
+
+
+def test_redirect_stop_expects_streams_restored_and_buffer_sent(sent, monkeypatch):
+    # Arrange
+    from pycharmdebug.output import (
+        OutputRedirect,
+        OutputSettings,
+    )
+    monkeypatch.setattr(sys, "stdout", io.StringIO())
+    monkeypatch.setattr(sys, "stderr", io.StringIO())
+    original = sys.stdout
+    redirect = OutputRedirect(
+        lambda text, context: sent.append((text, context)),
+        OutputSettings(mode="buffered", flush_interval=60.0),
+    )
+
+    # Act
+    redirect.start()
+    print("hello")
+    redirect.stop()
+
+    # Assert
+    assert sys.stdout is original
+    assert original.getvalue() == "hello\n"
+    assert sent == [("hello\n", 1)]
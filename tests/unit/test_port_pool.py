@@ -0,0 +1,82 @@
+import json
+import os
+
+import pytest
+
+
+@pytest.fixture
+def registry(mocker, tmp_path):
+    mocker.patch("pycharmdebug.port_pool.get_registry_dir", return_value=tmp_path)
+    yield tmp_path
+    from pycharmdebug.port_pool import release_port
+    release_port()
+
+
+def test_allocate_port_expects_first_port_leased_once(registry):
+    # Arrange
+    from pycharmdebug.port_pool import allocate_port, get_held_port
+
+    # Act
+    first = allocate_port([6000, 6002])
+    second = allocate_port([6000, 6002])
+
+    # Assert
+    assert first == second == 6000
+    assert get_held_port() == 6000
+    assert json.loads((registry / "6000.json").read_text())["pid"] == os.getpid()
+
+
+def test_allocate_port_taken_expects_next_port(registry, mocker):
+    # Arrange
+    from pycharmdebug.port_pool import allocate_port
+    mocker.patch(
+        "pycharmdebug.port_pool.try_lock_file",
+        side_effect=[False, True],
+    )
+
+    # Act
+    result = allocate_port([6000, 6002])
+
+    # Assert
+    assert result == 6001
+
+
+def test_allocate_port_range_full_expects_raises_PyCharmDebugRuntimeError(registry, mocker):
+    # Arrange
+    from pycharmdebug.port_pool import allocate_port
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+    mocker.patch("pycharmdebug.port_pool.try_lock_file", return_value=False)
+
+    # Act
+    with pytest.raises(PyCharmDebugRuntimeError) as _ex:
+        allocate_port([6000, 6001])
+
+    # Assert
+    assert "No free debug port between 6000 and 6001" in str(_ex)
+
+
+def test_list_ports_expects_live_leases_only(registry):
+    # Arrange
+    from pycharmdebug.port_pool import allocate_port, list_ports, PortLease
+    import sys
+    allocate_port([6000, 6000])
+    (registry / "6005.json").write_text(json.dumps({"port": 6005, "pid": 1, "executable": ""}))
+
+    # Act
+    result = list_ports()
+
+    # Assert
+    assert result == [PortLease(6000, os.getpid(), sys.executable)]
+
+
+def test_release_port_expects_lease_removed(registry):
+    # Arrange
+    from pycharmdebug.port_pool import allocate_port, release_port, list_ports
+
+    # Act
+    allocate_port([6000, 6000])
+    release_port()
+
+    # Assert
+    assert list_ports() == []
+    assert (registry / "6000.json").exists() is False
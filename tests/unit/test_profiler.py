@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+
+
+def _busy_worker(stop):
+    while stop.is_set() is False:
+        sum(range(1000))
+
+
+def test_profiler_expects_worker_stack_sampled():
+    # Arrange
+    from pycharmdebug.profiler import SamplingProfiler
+    profiler = SamplingProfiler()
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_worker, args=(stop,), name="Worker")
+    worker.start()
+
+    # Act
+    profiler.start(rate=500)
+    time.sleep(0.1)
+    profile = profiler.stop()
+    stop.set()
+    worker.join()
+
+    # Assert
+    assert profiler.running is False
+    assert profile.sample_count > 0
+    assert profile.duration > 0
+    worker_stacks = [stack for name, stack in profile.samples if name == "Worker"]
+    assert any(stack[-1].name == "_busy_worker" for stack in worker_stacks)
+    assert all(name != "PyCharmDebugProfiler" for name, _ in profile.samples)
+
+
+def test_profiler_start_twice_expects_raises_PyCharmDebugRuntimeError():
+    # Arrange
+    import pytest
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+    from pycharmdebug.profiler import SamplingProfiler
+    profiler = SamplingProfiler()
+    profiler.start()
+
+    # Act
+    try:
+        with pytest.raises(PyCharmDebugRuntimeError) as _ex:
+            profiler.start()
+    finally:
+        profiler.stop()
+
+    # Assert
+    assert "already running" in str(_ex)
+
+
+def test_profiler_stop_not_running_expects_none():
+    # Arrange
+    from pycharmdebug.profiler import SamplingProfiler
+
+    # Act
+    result = SamplingProfiler().stop()
+
+    # Assert
+    assert result is None
+
+
+def _profile():
+    from pycharmdebug.profiler import Profile, StackFrame
+    profile = Profile(interval=0.01)
+    main = StackFrame("main", "/tools/run.py", 1)
+    load = StackFrame("load", "/tools/assets.py", 10)
+    profile.samples[("MainThread", (main, load))] = 3
+    profile.samples[("MainThread", (main,))] = 1
+    profile.duration = 0.04
+    return profile
+
+
+def test_to_collapsed_expects_one_line_per_stack_root_first():
+    # Act
+    result = _profile().to_collapsed()
+
+    # Assert
+    assert result.splitlines() == [
+        "MainThread;main (/tools/run.py:1) 1",
+        "MainThread;main (/tools/run.py:1);load (/tools/assets.py:10) 3",
+    ]
+
+
+def test_to_speedscope_expects_weighted_samples_and_shared_frames():
+    # Act
+    result = _profile().to_speedscope()
+
+    # Assert
+    frames = [frame["name"] for frame in result["shared"]["frames"]]
+    assert frames == ["main", "load"]
+    profile = result["profiles"][0]
+    assert profile["name"] == "MainThread"
+    assert profile["samples"] == [[0], [0, 1]]
+    assert profile["weights"] == [0.01, 0.03]
+
+
+def test_write_profile_expects_file_in_format(tmp_path):
+    # Arrange
+    from pycharmdebug.profiler import FORMAT_COLLAPSED, write_profile
+
+    # Act
+    speedscope = write_profile(_profile(), directory=tmp_path)
+    collapsed = write_profile(_profile(), FORMAT_COLLAPSED, directory=tmp_path)
+
+    # Assert
+    assert speedscope.name.endswith(".speedscope.json")
+    assert json.loads(speedscope.read_text(encoding="utf-8"))["profiles"]
+    assert collapsed.name.endswith(".collapsed.txt")
+    assert "load (/tools/assets.py:10) 3" in collapsed.read_text(encoding="utf-8")
+
+
+def test_profile_actions_expects_profile_written_to_saved_dir(mocker, mock_unreal, tmp_path):
+    # Arrange
+    mock_unreal.uclass.return_value = lambda cls: cls
+    mock_unreal.ufunction.return_value = lambda func: func
+    mock_unreal.ToolMenuEntryScript = type("ToolMenuEntryScript", (), {
+        "__init__": lambda self: setattr(self, "data", mocker.MagicMock())
+    })
+    mock_unreal.Paths.project_saved_dir.return_value = tmp_path.as_posix()
+    mocker.patch("pycharmdebug.utils.get_plugin_config", return_value=None)
+    from pycharmdebug.actions.profile import PyCharmDebugProfileStart, PyCharmDebugProfileStop
+
+    # Act
+    PyCharmDebugProfileStart().execute(None)
+    time.sleep(0.05)
+    PyCharmDebugProfileStop().execute(None)
+
+    # Assert
+    written = list((tmp_path / "PyCharmDebug" / "profiles").glob("*.speedscope.json"))
+    assert len(written) == 1
+    assert "Wrote" in mock_unreal.log.call_args[0][0]
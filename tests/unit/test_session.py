@@ -0,0 +1,257 @@
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def mock_pydevd_pycharm(monkeypatch, mocker):
+    monkeypatch.setenv("PYDEVD_USE_SYS_MONITORING", "")
+    pydevd_pycharm = mocker.MagicMock()
+    monkeypatch.setitem(sys.modules, "pydevd_pycharm", pydevd_pycharm)
+    return pydevd_pycharm
+
+
+@pytest.fixture
+def restore_sys_path(monkeypatch):
+    monkeypatch.setattr(sys, "path", list(sys.path))
+
+
+def test_attach_expects_settrace_called(mock_pydevd_pycharm):
+    # Arrange
+    from pycharmdebug.output import OutputSettings
+    from pycharmdebug.session import DebugSession
+    session = DebugSession()
+
+    # Act
+    result = session.attach("", "localhost", 42, output=OutputSettings(mode="direct"))
+
+    # Assert
+    assert result is True
+    assert session.active is True
+    mock_pydevd_pycharm.settrace.assert_called_once_with(
+        "localhost", port=42, stdoutToServer=True, stderrToServer=True
+    )
+
+
+def test_attach_already_attached_expects_noop(mock_pydevd_pycharm):
+    # Arrange
+    from pycharmdebug.session import DebugSession
+    session = DebugSession()
+    session.attach("", "localhost", 42)
+
+    # Act
+    result = session.attach("", "localhost", 42)
+
+    # Assert
+    assert result is False
+    mock_pydevd_pycharm.settrace.assert_called_once()
+
+
+def test_attach_reconnect_expects_egg_added_to_sys_path_once(mock_pydevd_pycharm, restore_sys_path):
+    # Arrange
+    from pycharmdebug.session import DebugSession
+    session = DebugSession()
+
+    # Act
+    for _ in range(3):
+        session.attach("/foo/bar/pydevd-pycharm.egg", "localhost", 42)
+        session.detach()
+
+    # Assert
+    assert sys.path.count("/foo/bar/pydevd-pycharm.egg") == 1
+    assert mock_pydevd_pycharm.settrace.call_count == 3
+
+
+def test_attach_import_fails_expects_raises_PyCharmDebugRuntimeError(monkeypatch, restore_sys_path):
+    # Arrange
+    from pycharmdebug.session import DebugSession
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+    monkeypatch.setitem(sys.modules, "pydevd_pycharm", None)
+    session = DebugSession()
+
+    # Act
+    with pytest.raises(PyCharmDebugRuntimeError) as _ex:
+        session.attach("", "localhost", 42)
+
+    # Assert
+    assert "Failed to import pydevd_pycharm" in str(_ex)
+    assert session.active is False
+
+
+def test_detach_expects_stoptrace_called_and_state_reset(mock_pydevd_pycharm):
+    # Arrange
+    from pycharmdebug.session import DebugSession
+    session = DebugSession()
+    session.attach("", "localhost", 42)
+
+    # Act
+    result = session.detach()
+
+    # Assert
+    assert result is True
+    assert session.active is False
+    mock_pydevd_pycharm.stoptrace.assert_called_once()
+
+
+def test_detach_not_attached_expects_false(mock_pydevd_pycharm):
+    # Arrange
+    from pycharmdebug.session import DebugSession
+    session = DebugSession()
+
+    # Act
+    result = session.detach()
+
+    # Assert
+    assert result is False
+    mock_pydevd_pycharm.stoptrace.assert_not_called()
+
+
+def test_attach_with_trace_filter_expects_exclude_filters_set(mock_pydevd_pycharm, monkeypatch, mocker):
+    # Arrange
+    from pycharmdebug.session import DebugSession
+    from pycharmdebug.trace_filter import TraceFilter
+    pydevd = mocker.MagicMock()
+    filtering = mocker.MagicMock()
+    filtering.ExcludeFilter = lambda *args: args
+    monkeypatch.setitem(sys.modules, "pydevd", pydevd)
+    monkeypatch.setitem(sys.modules, "_pydevd_bundle", mocker.MagicMock())
+    monkeypatch.setitem(sys.modules, "_pydevd_bundle.pydevd_filtering", filtering)
+    session = DebugSession()
+
+    # Act
+    session.attach("", "localhost", 42, trace_filter=TraceFilter(exclude=["unreal"]))
+
+    # Assert
+    pydevd.get_global_debugger().set_exclude_filters.assert_called_once_with(
+        [("unreal", True, False)]
+    )
+
+
+@pytest.mark.parametrize(
+    "supported, expected_backend, expected_env",
+    [(True, "sys_monitoring", "true"), (False, "settrace", "false")],
+)
+def test_attach_auto_backend_expects_pydevd_configured_before_import(
+    mock_pydevd_pycharm, mocker, supported, expected_backend, expected_env
+):
+    # Arrange
+    import os
+    from pycharmdebug.session import DebugSession
+    mocker.patch("pycharmdebug.backends.supports_monitoring", return_value=supported)
+    session = DebugSession()
+
+    # Act
+    session.attach("", "localhost", 42)
+
+    # Assert
+    assert session.backend == expected_backend
+    assert os.environ["PYDEVD_USE_SYS_MONITORING"] == expected_env
+
+
+def test_attach_pydevd_without_monitoring_expects_actual_backend_recorded(
+    mock_pydevd_pycharm, monkeypatch, mocker, mock_unreal
+):
+    # Arrange
+    import types
+    from pycharmdebug.session import DebugSession
+    mocker.patch("pycharmdebug.backends.supports_monitoring", return_value=True)
+    constants = types.ModuleType("_pydevd_bundle.pydevd_constants")
+    monkeypatch.setitem(sys.modules, "_pydevd_bundle.pydevd_constants", constants)
+    session = DebugSession()
+
+    # Act
+    session.attach("", "localhost", 42)
+
+    # Assert
+    assert session.backend == "settrace"
+    assert "using settrace" in mock_unreal.log_warning.call_args[0][0]
+
+
+def test_get_active_backend_expects_backend_only_while_attached(mock_pydevd_pycharm, mocker):
+    # Arrange
+    from pycharmdebug.session import get_active_backend, SESSION
+    mocker.patch("pycharmdebug.backends.supports_monitoring", return_value=False)
+
+    # Act
+    before = get_active_backend()
+    SESSION.attach("", "localhost", 42)
+    attached = get_active_backend()
+    SESSION.detach()
+
+    # Assert
+    assert before is None
+    assert attached == "settrace"
+    assert get_active_backend() is None
+
+
+def test_suspend_attached_expects_settrace_stops_at_frame(mock_pydevd_pycharm):
+    # Arrange
+    from pycharmdebug.session import DebugSession
+    session = DebugSession()
+    session.attach("", "localhost", 42)
+    frame = sys._getframe()
+
+    # Act
+    result = session.suspend(frame)
+
+    # Assert
+    assert result is True
+    mock_pydevd_pycharm.settrace.assert_called_with(
+        "localhost", port=42, suspend=True, stop_at_frame=frame
+    )
+
+
+def test_suspend_not_attached_expects_false(mock_pydevd_pycharm):
+    # Arrange
+    from pycharmdebug.session import DebugSession
+    session = DebugSession()
+
+    # Act
+    result = session.suspend()
+
+    # Assert
+    assert result is False
+    mock_pydevd_pycharm.settrace.assert_not_called()
+
+
+def test_post_mortem_attached_expects_stop_on_unhandled_exception(mock_pydevd_pycharm, monkeypatch, mocker):
+    # Arrange
+    from pycharmdebug.session import DebugSession
+    pydevd = mocker.MagicMock()
+    breakpoints = mocker.MagicMock()
+    monkeypatch.setitem(sys.modules, "pydevd", pydevd)
+    monkeypatch.setitem(sys.modules, "_pydevd_bundle", mocker.MagicMock())
+    monkeypatch.setitem(sys.modules, "_pydevd_bundle.pydevd_additional_thread_info", mocker.MagicMock())
+    monkeypatch.setitem(sys.modules, "_pydevd_bundle.pydevd_breakpoints", breakpoints)
+    session = DebugSession()
+    session.attach("", "localhost", 42)
+    exc_info = (ValueError, ValueError("boom"), None)
+
+    # Act
+    result = session.post_mortem(exc_info)
+
+    # Assert
+    assert result is True
+    assert breakpoints.stop_on_unhandled_exception.call_args[0][3] == exc_info
+
+
+def test_attach_buffered_output_expects_pydevd_forwarding_off_and_streams_restored(mock_pydevd_pycharm, monkeypatch, mocker):
+    # Arrange
+    from pycharmdebug.output import OutputSettings
+    from pycharmdebug.session import DebugSession
+    pydevd = mocker.MagicMock()
+    monkeypatch.setitem(sys.modules, "pydevd", pydevd)
+    stdout = sys.stdout
+    session = DebugSession()
+
+    # Act
+    session.attach("", "localhost", 42, output=OutputSettings(mode="buffered"))
+    forwarding = sys.stdout is not stdout
+    session.detach()
+
+    # Assert
+    mock_pydevd_pycharm.settrace.assert_called_once_with(
+        "localhost", port=42, stdoutToServer=False, stderrToServer=False
+    )
+    assert forwarding is True
+    assert sys.stdout is stdout
@@ -0,0 +1,241 @@
+import json
+import os
+
+import pytest
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+def _bump(path, data):
+    # rewrite with a different size so the stat key changes
+    _write(path, data)
+    stat = path.stat()
+    os.utime(path.as_posix(), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def layers(mocker, tmp_path, mock_unreal):
+    mock_unreal.Paths.project_saved_dir.return_value = (tmp_path / "Saved").as_posix()
+    paths = {
+        "studio": tmp_path / "studio" / "tool_config.json",
+        "plugin": tmp_path / "Plugin" / "Config" / "tool_config.json",
+        "project": tmp_path / "Saved" / "PyCharmDebug" / "tool_config.json",
+        "user": tmp_path / "home" / ".pycharmdebug" / "tool_config.json",
+    }
+    os.environ["PYCHARMDEBUG_STUDIO_CONFIG"] = paths["studio"].as_posix()
+    mocker.patch("pathlib.Path.home", return_value=tmp_path / "home")
+    yield paths
+    os.environ.pop("PYCHARMDEBUG_STUDIO_CONFIG", None)
+
+
+def _resolver(paths):
+    from pycharmdebug.settings import SettingsResolver
+    return SettingsResolver(lambda: paths["plugin"])
+
+
+def test_settings_no_layers_expects_defaults(layers):
+    # Arrange
+    from pycharmdebug.settings import DEFAULT_CONFIG
+
+    # Act
+    result = _resolver(layers).get()
+
+    # Assert
+    assert result.to_dict() == DEFAULT_CONFIG
+
+
+def test_settings_layers_expects_higher_layers_win(layers, monkeypatch):
+    # Arrange
+    _write(layers["studio"], {"port_number": 1, "host": "studio", "reconnect": True})
+    _write(layers["plugin"], {"port_number": 2, "host": "plugin"})
+    _write(layers["project"], {"port_number": 3})
+    _write(layers["user"], {"port_number": 4, "host": None})
+    monkeypatch.setenv("PYCHARMDEBUG_PORT_NUMBER", "5")
+
+    # Act
+    result = _resolver(layers).get()
+
+    # Assert
+    assert result.port_number == 5
+    assert result.host == "plugin"
+    assert result.reconnect is True
+
+
+def test_settings_shipped_plugin_config_expects_studio_values_kept(layers):
+    # Arrange
+    from pathlib import Path
+    shipped = Path(__file__).parents[2] / "plugin_src/PyCharmDebug/Config/tool_config.json"
+    _write(layers["plugin"], json.loads(shipped.read_text(encoding="utf-8")))
+    _write(layers["studio"], {"port_number": 7000, "host": "buildhost", "reconnect": True})
+
+    # Act
+    result = _resolver(layers).get()
+
+    # Assert
+    assert result.port_number == 5678
+    assert result.host == "buildhost"
+    assert result.reconnect is True
+
+
+def test_settings_env_string_value_expects_unquoted_string(layers, monkeypatch):
+    # Arrange
+    monkeypatch.setenv("PYCHARMDEBUG_TRACE_BACKEND", "settrace")
+    monkeypatch.setenv("PYCHARMDEBUG_TRACE_INCLUDE", '["game/*"]')
+
+    # Act
+    result = _resolver(layers).get()
+
+    # Assert
+    assert result.trace_backend == "settrace"
+    assert result.trace_include == ["game/*"]
+
+
+def test_settings_unchanged_expects_cached_result_and_files_read_once(layers, mocker):
+    # Arrange
+    _write(layers["plugin"], {"port_number": 2})
+    resolver = _resolver(layers)
+    spy_load = mocker.spy(json, "load")
+
+    # Act
+    first = resolver.get()
+    second = resolver.get()
+
+    # Assert
+    assert first is second
+    assert spy_load.call_count == 1
+
+
+def test_settings_layer_changed_expects_only_that_layer_reread(layers, mocker):
+    # Arrange
+    _write(layers["plugin"], {"port_number": 2})
+    _write(layers["user"], {"host": "user"})
+    resolver = _resolver(layers)
+    resolver.get()
+    spy_validate = mocker.spy(__import__("pycharmdebug.settings").settings, "validate_layer")
+
+    # Act
+    _bump(layers["user"], {"host": "someone-else"})
+    result = resolver.get()
+
+    # Assert
+    assert result.host == "someone-else"
+    assert result.port_number == 2
+    assert [call.args[0] for call in spy_validate.call_args_list] == ["user"]
+
+
+def test_settings_invalid_value_expects_dropped_and_recorded(layers):
+    # Arrange
+    _write(layers["studio"], {"port_number": 1234})
+    _write(layers["user"], {"port_number": 70000, "port_range": [9, 1]})
+    resolver = _resolver(layers)
+
+    # Act
+    result = resolver.get()
+
+    # Assert
+    assert result.port_number == 1234
+    assert result.port_range == []
+    assert set(resolver.invalid) == {"port_number", "port_range"}
+
+
+def test_settings_invalid_value_overridden_expects_cleared(layers, monkeypatch):
+    # Arrange
+    _write(layers["project"], {"port_number": "foo"})
+    monkeypatch.setenv("PYCHARMDEBUG_PORT_NUMBER", "42")
+    resolver = _resolver(layers)
+
+    # Act
+    result = resolver.get()
+
+    # Assert
+    assert result.port_number == 42
+    assert resolver.invalid == {}
+
+
+def test_settings_malformed_file_expects_layer_ignored(layers):
+    # Arrange
+    layers["user"].parent.mkdir(parents=True)
+    layers["user"].write_text("{", encoding="utf-8")
+    _write(layers["plugin"], {"port_number": 2})
+
+    # Act
+    result = _resolver(layers).get()
+
+    # Assert
+    assert result.port_number == 2
+
+
+def test_settings_plugin_config_unresolved_expects_layer_skipped(layers):
+    # Arrange
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+    from pycharmdebug.settings import SettingsResolver
+
+    def plugin_config():
+        raise PyCharmDebugRuntimeError("Failed to resolve plugin config")
+
+    # Act
+    result = SettingsResolver(plugin_config).get_layer_paths()
+
+    # Assert
+    assert [name for name, _ in result] == ["studio", "project", "user"]
+
+
+def test_settings_get_twice_expects_layer_paths_resolved_once(layers, mocker):
+    # Arrange
+    from pycharmdebug.settings import SettingsResolver
+    plugin_config = mocker.Mock(return_value=layers["plugin"])
+    resolver = SettingsResolver(plugin_config)
+
+    # Act
+    resolver.get()
+    resolver.get()
+
+    # Assert
+    plugin_config.assert_called_once_with()
+
+
+def test_settings_invalidate_env_expects_environment_reread(layers, monkeypatch):
+    # Arrange
+    resolver = _resolver(layers)
+    resolver.get()
+    monkeypatch.setenv("PYCHARMDEBUG_RECONNECT", "true")
+
+    # Act
+    before = resolver.get().reconnect
+    resolver.invalidate("env")
+    after = resolver.get().reconnect
+
+    # Assert
+    assert before is False
+    assert after is True
+
+
+def test_settings_list_values_expects_copies(layers):
+    # Arrange
+    from pycharmdebug.settings import DEFAULT_CONFIG
+
+    # Act
+    result = _resolver(layers).get()
+    result.trace_include.append("foo")
+
+    # Assert
+    assert DEFAULT_CONFIG["trace_include"] == []
+
+
+def test_get_debug_egg_invalid_in_project_layer_expects_raises(layers, mocker):
+    # Arrange
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+    from pycharmdebug.utils import get_debug_egg
+    mocker.patch("pycharmdebug.utils.get_plugin_config", return_value=layers["plugin"])
+    _write(layers["project"], {"debug_egg": "/foo/bar.egg"})
+
+    # Act
+    with pytest.raises(PyCharmDebugRuntimeError) as _ex:
+        get_debug_egg()
+
+    # Assert
+    assert "No valid debug_egg location" in str(_ex)
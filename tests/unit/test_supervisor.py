@@ -0,0 +1,110 @@
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def attached(monkeypatch, mocker):
+    monkeypatch.setenv("PYDEVD_USE_SYS_MONITORING", "")
+    monkeypatch.setitem(sys.modules, "pydevd_pycharm", mocker.MagicMock())
+    pydevd = mocker.MagicMock()
+    monkeypatch.setitem(sys.modules, "pydevd", pydevd)
+    py_db = pydevd.get_global_debugger()
+    py_db._finish_debugging_session = False
+    py_db.writer.is_alive.return_value = True
+    from pycharmdebug.session import SESSION
+    SESSION.attach("", "localhost", 42)
+    return py_db
+
+
+def _watch(on_reconnect, reconnect=False):
+    from pycharmdebug.supervisor import SUPERVISOR
+    SUPERVISOR.watch(on_reconnect, interval=1.0, reconnect=reconnect, max_delay=8.0)
+    return SUPERVISOR
+
+
+def test_check_connected_expects_still_attached(attached, mocker):
+    # Arrange
+    from pycharmdebug.supervisor import get_connection_state
+    supervisor = _watch(mocker.MagicMock())
+
+    # Act
+    supervisor.check()
+
+    # Assert
+    assert get_connection_state() == "attached"
+    assert supervisor.running is True
+
+
+def test_on_tick_before_interval_expects_no_check(attached, mocker):
+    # Arrange
+    supervisor = _watch(mocker.MagicMock())
+    check = mocker.patch.object(supervisor, "check")
+
+    # Act
+    supervisor._on_tick(0.5)
+
+    # Assert
+    check.assert_not_called()
+
+
+def test_check_connection_dropped_expects_detached_and_lost(attached, mocker, mock_unreal):
+    # Arrange
+    from pycharmdebug.session import SESSION
+    from pycharmdebug.supervisor import get_connection_state
+    supervisor = _watch(mocker.MagicMock())
+    attached.writer.is_alive.return_value = False
+
+    # Act
+    supervisor.check()
+
+    # Assert
+    assert SESSION.active is False
+    assert get_connection_state() == "lost"
+    assert supervisor.running is False
+    sys.modules["pydevd_pycharm"].stoptrace.assert_called_once()
+
+
+def test_check_reconnect_server_back_expects_on_reconnect_called(attached, mocker):
+    # Arrange
+    from pycharmdebug.supervisor import get_connection_state
+    on_reconnect = mocker.MagicMock()
+    supervisor = _watch(on_reconnect, reconnect=True)
+    probe = mocker.patch("pycharmdebug.supervisor.probe_server")
+    attached._finish_debugging_session = True
+    supervisor.check()
+    supervisor._next_attempt = 0.0
+
+    # Act
+    supervisor.check()
+    state = get_connection_state()
+    supervisor._probe.join()
+    supervisor.check()
+
+    # Assert
+    assert state == "connecting"
+    probe.assert_called_once_with("localhost", 42)
+    on_reconnect.assert_called_once()
+
+
+def test_check_reconnect_server_down_expects_backoff_doubled(attached, mocker):
+    # Arrange
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+    on_reconnect = mocker.MagicMock()
+    supervisor = _watch(on_reconnect, reconnect=True)
+    mocker.patch("pycharmdebug.supervisor.probe_server", side_effect=PyCharmDebugRuntimeError)
+    attached._finish_debugging_session = True
+    supervisor.check()
+    delays = []
+
+    # Act
+    for _ in range(4):
+        supervisor._next_attempt = 0.0
+        supervisor.check()
+        supervisor._probe.join()
+        supervisor.check()
+        delays.append(supervisor._delay)
+
+    # Assert
+    assert delays == [2.0, 4.0, 8.0, 8.0]
+    on_reconnect.assert_not_called()
@@ -0,0 +1,179 @@
+import sys
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def threads():
+    from pycharmdebug import threads
+    yield threads
+    threads.clear_selection()
+
+
+@pytest.fixture
+def worker():
+    started = threading.Event()
+    stop = threading.Event()
+
+    def run():
+        started.set()
+        stop.wait()
+
+    thread = threading.Thread(target=run, name="AssetScan-1")
+    thread.start()
+    started.wait()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+@pytest.mark.parametrize(
+    "mode, patterns, expected",
+    [
+        ("all", [], True),
+        ("current", [], False),
+        ("matching", ["Asset*"], True),
+        ("matching", ["IO*"], False),
+    ],
+)
+def test_selects_worker_expects_mode_applied(threads, worker, mode, patterns, expected):
+    # Arrange
+    selection = threads.ThreadSelection(mode, patterns)
+
+    # Act
+    result = selection.selects(worker)
+
+    # Assert
+    assert result is expected
+    assert selection.selects(threading.current_thread()) is (mode != "matching")
+
+
+def test_describe_current_expects_thread_name(threads):
+    # Arrange
+    selection = threads.ThreadSelection("current", owner=threading.main_thread().ident)
+
+    # Act
+    result = selection.describe()
+
+    # Assert
+    assert result == f"current thread ({threading.main_thread().name})"
+
+
+def test_set_selection_expects_running_and_started_threads_marked(threads, worker):
+    # Arrange
+    selection = threads.ThreadSelection("matching", ["IO*"])
+    started = threading.Thread(target=lambda: None, name="IO-1")
+    other = threading.Thread(target=lambda: None, name="Other-1")
+
+    # Act
+    threads.set_selection(selection)
+    for thread in (started, other):
+        thread.start()
+        thread.join()
+
+    # Assert
+    assert worker.pydev_do_not_trace is True
+    assert "pydev_do_not_trace" not in vars(started)
+    assert other.pydev_do_not_trace is True
+    assert hasattr(threading.Thread, "pydev_do_not_trace") is False
+
+
+def test_set_selection_expects_pydevd_threads_keep_own_attribute(threads, worker):
+    # Arrange
+    worker.pydev_do_not_trace = False
+
+    # Act
+    threads.set_selection(threads.ThreadSelection("current"))
+    threads.clear_selection()
+
+    # Assert
+    assert worker.pydev_do_not_trace is False
+
+
+def test_set_selection_excluded_thread_expects_running_frames_untraced(threads, worker):
+    # Arrange
+    frame = sys._current_frames()[worker.ident]
+    frame.f_trace = lambda *args: None
+
+    # Act
+    threads.set_selection(threads.ThreadSelection("current"))
+
+    # Assert
+    assert frame.f_trace is None
+
+
+def test_clear_selection_expects_attributes_and_start_restored(threads, worker, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(threading.Thread, "pydev_do_not_trace", False, raising=False)
+    original_start = threading.Thread.start
+    threads.set_selection(threads.ThreadSelection("current"))
+    wrapped_start = threading.Thread.start
+
+    # Act
+    threads.clear_selection()
+
+    # Assert
+    assert wrapped_start is not original_start
+    assert threading.Thread.start is original_start
+    assert "pydev_do_not_trace" not in vars(worker)
+    assert vars(threading.Thread)["pydev_do_not_trace"] is False
+
+
+def test_get_next_mode_expects_matching_only_with_patterns():
+    # Arrange
+    from pycharmdebug.actions.threads import get_next_mode
+
+    # Act
+    without_patterns = get_next_mode("current", False)
+    with_patterns = get_next_mode("current", True)
+
+    # Assert
+    assert without_patterns == "all"
+    assert with_patterns == "matching"
+
+
+def test_attach_current_thread_expects_only_current_thread_traced(monkeypatch, mocker, threads):
+    # Arrange
+    from pycharmdebug.session import SESSION, get_thread_selection
+    monkeypatch.setenv("PYDEVD_USE_SYS_MONITORING", "")
+    pydevd_pycharm = mocker.MagicMock()
+    monkeypatch.setitem(sys.modules, "pydevd_pycharm", pydevd_pycharm)
+
+    # Act
+    SESSION.attach("", "localhost", 42, threads=threads.ThreadSelection("current"))
+
+    # Assert
+    assert pydevd_pycharm.settrace.call_args.kwargs["trace_only_current_thread"] is True
+    assert get_thread_selection() == f"current thread ({threading.current_thread().name})"
+    assert threads.get_selection() is SESSION.threads
+
+
+def test_trace_threads_attached_expects_untraced_threads_picked_up(monkeypatch, mocker, threads):
+    # Arrange
+    import pycharmdebug
+    from pycharmdebug.session import SESSION
+    monkeypatch.setenv("PYDEVD_USE_SYS_MONITORING", "")
+    monkeypatch.setitem(sys.modules, "pydevd_pycharm", mocker.MagicMock())
+    pydevd = mocker.MagicMock()
+    monkeypatch.setitem(sys.modules, "pydevd", pydevd)
+    SESSION.attach("", "localhost", 42)
+
+    # Act
+    result = pycharmdebug.trace_threads("matching", ["AssetScan*"])
+
+    # Assert
+    assert result is True
+    assert SESSION.threads.patterns == ["AssetScan*"]
+    pydevd.get_global_debugger().patch_threads.assert_called_once()
+    pydevd.get_global_debugger().set_tracing_for_untraced_contexts.assert_called_once()
+
+
+def test_trace_threads_unknown_mode_expects_raises(threads):
+    # Arrange
+    import pycharmdebug
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+
+    # Act / Assert
+    with pytest.raises(PyCharmDebugRuntimeError):
+        pycharmdebug.trace_threads("some")
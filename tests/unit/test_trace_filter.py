@@ -0,0 +1,120 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        ("*/site-packages/*", "**/site-packages/**"),
+        ("*/MyTools/*.py", "**/MyTools/**/*.py"),
+        ("*/mytools/assets.py", "**/mytools/assets.py"),
+        ("*.py", "**/*.py"),
+        ("*/lib/**/*.py", "**/lib/**/*.py"),
+        ("C:\\Python\\Lib\\*", "C:/Python/Lib/**"),
+    ],
+)
+def test_to_pydevd_glob_expects_wildcards_span_directories(pattern, expected):
+    # Arrange
+    from pycharmdebug.trace_filter import to_pydevd_glob
+
+    # Act
+    result = to_pydevd_glob(pattern)
+
+    # Assert
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        ("mytools", "mytools"),
+        ("mytools.*", "mytools"),
+        ("unreal.helpers.*", "unreal.helpers"),
+    ],
+)
+def test_to_pydevd_module_expects_trailing_wildcard_removed(pattern, expected):
+    # Arrange
+    from pycharmdebug.trace_filter import to_pydevd_module
+
+    # Act
+    result = to_pydevd_module(pattern)
+
+    # Assert
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    "filename, module, expected",
+    [
+        ("/project/Content/Python/mytools/assets.py", "mytools.assets", False),
+        ("/project/Content/Python/mytools/ui.py", "mytools.ui", True),
+        ("/engine/Python/unreal_helpers.py", "unreal_helpers", True),
+        ("/python/site-packages/requests/api.py", "requests.api", True),
+        ("/python/site-packages/requests/adapters/ssl.py", "requests.ssl", True),
+    ],
+)
+def test_to_pydevd_filters_expects_pydevd_excludes_expected(filename, module, expected):
+    # Arrange
+    pydevd_filtering = pytest.importorskip("_pydevd_bundle.pydevd_filtering")
+    from pycharmdebug.trace_filter import TraceFilter
+    trace_filter = TraceFilter(
+        include=["mytools.assets", "*/mytools/assets.py"],
+        exclude=["*/site-packages/*", "unreal_helpers"],
+    )
+    files_filtering = pydevd_filtering.FilesFiltering()
+    files_filtering.set_exclude_filters(
+        [pydevd_filtering.ExcludeFilter(*f) for f in trace_filter.to_pydevd_filters()]
+    )
+
+    # Act
+    result = files_filtering.exclude_by_filter(filename, module)
+
+    # Assert
+    assert result is expected
+
+
+def test_to_pydevd_filters_no_patterns_expects_empty_and_filter_falsy():
+    # Arrange
+    from pycharmdebug.trace_filter import TraceFilter
+    trace_filter = TraceFilter()
+
+    # Act
+    result = trace_filter.to_pydevd_filters()
+
+    # Assert
+    assert result == []
+    assert not trace_filter
+
+
+def test_to_pydevd_filters_expects_excludes_then_includes_then_catch_all():
+    # Arrange
+    from pycharmdebug.trace_filter import TraceFilter
+    trace_filter = TraceFilter(include=["mytools.*"], exclude=["C:\\Python\\Lib\\*"])
+
+    # Act
+    result = trace_filter.to_pydevd_filters()
+
+    # Assert
+    assert result == [
+        ("C:/Python/Lib/**", True, True),
+        ("mytools", False, False),
+        ("**", True, True),
+    ]
+
+
+def test_get_trace_filter_expects_config_patterns(mocker, tmp_path):
+    # Arrange
+    import json
+    from pycharmdebug.utils import get_trace_filter
+    plugin_config = tmp_path / "tool_config.json"
+    plugin_config.write_text(
+        json.dumps({"trace_include": ["mytools"], "trace_exclude": ["unreal"]}),
+        encoding="utf-8",
+    )
+    mocker.patch("pycharmdebug.utils.get_plugin_config", return_value=plugin_config)
+
+    # Act
+    result = get_trace_filter()
+
+    # Assert
+    assert result.include == ["mytools"]
+    assert result.exclude == ["unreal"]
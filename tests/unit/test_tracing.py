@@ -0,0 +1,84 @@
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def mock_pydevd(monkeypatch, mocker):
+    monkeypatch.setenv("PYDEVD_USE_SYS_MONITORING", "")
+    pydevd_pycharm = mocker.MagicMock()
+    pydevd = mocker.MagicMock()
+    monkeypatch.setitem(sys.modules, "pydevd_pycharm", pydevd_pycharm)
+    monkeypatch.setitem(sys.modules, "pydevd", pydevd)
+    return pydevd_pycharm, pydevd.get_global_debugger()
+
+
+def test_traced_not_attached_expects_session_not_imported():
+    # Arrange
+    import pycharmdebug
+
+    # Act
+    with pycharmdebug.traced():
+        pass
+
+    # Assert
+    assert "pycharmdebug.session" not in sys.modules
+
+
+def test_traced_scoped_connection_expects_tracing_only_inside_block(mock_pydevd):
+    # Arrange
+    import pycharmdebug
+    from pycharmdebug.session import SESSION
+    pydevd_pycharm, py_db = mock_pydevd
+    SESSION.attach("", "localhost", 42, trace_on_connect=False)
+
+    # Act
+    with pycharmdebug.traced():
+        inside = SESSION.is_tracing()
+
+    # Assert
+    assert inside is True
+    assert SESSION.is_tracing() is False
+    assert pydevd_pycharm.settrace.call_args[1]["suspend"] is False
+    assert py_db.disable_tracing.call_count == 2
+
+
+def test_traced_decorator_nested_expects_previous_state_restored(mock_pydevd):
+    # Arrange
+    import pycharmdebug
+    from pycharmdebug.session import SESSION
+    SESSION.attach("", "localhost", 42, trace_on_connect=False)
+    states = []
+
+    @pycharmdebug.traced
+    def inner():
+        states.append(SESSION.is_tracing())
+
+    @pycharmdebug.traced()
+    def outer():
+        inner()
+        states.append(SESSION.is_tracing())
+
+    # Act
+    outer()
+    states.append(SESSION.is_tracing())
+
+    # Assert
+    assert states == [True, True, False]
+
+
+def test_traced_global_connection_expects_tracing_left_on(mock_pydevd):
+    # Arrange
+    import pycharmdebug
+    from pycharmdebug.session import SESSION
+    pydevd_pycharm, py_db = mock_pydevd
+    SESSION.attach("", "localhost", 42)
+
+    # Act
+    with pycharmdebug.traced():
+        pass
+
+    # Assert
+    assert SESSION.is_tracing() is True
+    pydevd_pycharm.settrace.assert_called_once()
+    py_db.disable_tracing.assert_not_called()
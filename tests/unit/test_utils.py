@@ -1,6 +1,25 @@
+import json
+
 import pytest
 
 
+def _write_plugin_config(mocker, tmp_path, data):
+    plugin_config = tmp_path / "tool_config.json"
+    plugin_config.write_text(json.dumps(data), encoding="utf-8")
+    mocker.patch("pycharmdebug.utils.get_plugin_config", return_value=plugin_config)
+    return plugin_config
+
+
+def _read_plugin_config(plugin_config):
+    return json.loads(plugin_config.read_text(encoding="utf-8"))
+
+
+def _write_egg(tmp_path):
+    egg = tmp_path / "pydevd-pycharm.egg"
+    egg.touch()
+    return egg.as_posix()
+
+
 def test_get_plugin_config_expects_plugin_config_path(mocker):
     # Arrange
     from pycharmdebug.utils import get_plugin_config
@@ -119,45 +138,35 @@ def test_get_debug_port_config_entry_is_none_expects_fallback_to_default_port(mo
     assert result == DEFAULT_PORT_NUMBER
 
 
-def test_set_debug_port_expects_42_dumped_true_returned(mocker):
+def test_set_debug_port_expects_42_dumped_true_returned(mocker, tmp_path):
     # Arrange
-    from pycharmdebug.utils import (
-        set_debug_port,
-        DEFAULT_PORT_NUMBER,
-    )
-    mocker.patch("builtins.open")
-    mocker.patch("json.load", return_value={"port_number": DEFAULT_PORT_NUMBER})
-    mock_dump = mocker.patch("json.dump")
-    mocker.patch("pycharmdebug.utils.get_plugin_config")
+    from pycharmdebug.utils import set_debug_port
+    plugin_config = _write_plugin_config(mocker, tmp_path, {"port_number": 5678})
 
     # Act
     result = set_debug_port(42)
 
     # Assert
-    mock_dump.assert_called_once_with(
-        {"port_number": 42}, mocker.ANY, indent=4
-    )
+    assert _read_plugin_config(plugin_config) == {"port_number": 42}
     assert result is True
 
 
-def test_set_debug_port_existing_data_in_config_expects_existing_data_maintained(mocker):
+def test_set_debug_port_existing_data_in_config_expects_existing_data_maintained(mocker, tmp_path):
     # Arrange
-    from pycharmdebug.utils import (
-        set_debug_port,
-        DEFAULT_PORT_NUMBER,
+    from pycharmdebug.utils import set_debug_port
+    plugin_config = _write_plugin_config(
+        mocker, tmp_path, {"port_number": 5678, "debug_egg": "", "foo": "bar"}
     )
-    mocker.patch("builtins.open")
-    mocker.patch("json.load", return_value={"port_number": DEFAULT_PORT_NUMBER, "foo": "bar"})
-    mock_dump = mocker.patch("json.dump")
-    mocker.patch("pycharmdebug.utils.get_plugin_config")
 
     # Act
     result = set_debug_port(42)
 
     # Assert
-    mock_dump.assert_called_once_with(
-        {"port_number": 42,  "foo": "bar"}, mocker.ANY, indent=4
-    )
+    assert _read_plugin_config(plugin_config).items() >= {
+        "port_number": 42,
+        "debug_egg": "",
+        "foo": "bar",
+    }.items()
     assert result is True
 
 
@@ -224,39 +233,38 @@ def test_set_debug_port_lower_than_min_expects_raises_PyCharmDebugRuntimeError(m
 
 
 
-def test_set_debug_port_no_plugin_config_exists_expects_true_42_dumped_and_file_created(mocker):
+def test_set_debug_port_no_plugin_config_exists_expects_true_42_dumped_and_file_created(mocker, tmp_path):
     # Arrange
-    from pycharmdebug.utils import set_debug_port
-    mocker.patch("builtins.open")
-    mocker.patch("json.load", return_value={})
-    mocked_dump = mocker.patch("json.dump")
-    mocked_path_touch = mocker.patch("pathlib.Path.touch")
+    from pycharmdebug.utils import set_debug_port, RELATIVE_CONFIG_PATH
+    mocker.patch(
+        "pycharmdebug.utils.PluginBlueprintLibrary.get_plugin_base_dir",
+        return_value=tmp_path.as_posix()
+    )
+    (tmp_path / "Config").mkdir()
+    plugin_config = tmp_path / RELATIVE_CONFIG_PATH
 
     # Act
     result = set_debug_port(42)
 
     # Assert
-    mocked_dump.assert_called_once_with({"port_number": 42}, mocker.ANY, indent=4)
-    mocked_path_touch.assert_called_once()
+    assert _read_plugin_config(plugin_config) == {"port_number": 42}
     assert result is True
 
 
-def test_set_debug_port_plugin_config_is_none_and_fails_to_create_expects_false(mocker):
+def test_set_debug_port_plugin_root_unresolved_expects_PyCharmDebugRuntimeError(mocker):
     # Arrange
-    from pycharmdebug.utils import (
-        set_debug_port,
-        DEFAULT_PORT_NUMBER,
+    from pycharmdebug.utils import set_debug_port
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+    mocker.patch(
+        "unreal.PluginBlueprintLibrary.get_plugin_base_dir", return_value=None
     )
-    mocker.patch("builtins.open")
-    mocker.patch("json.load", return_value={"port_number": DEFAULT_PORT_NUMBER})
-    mock_dump = mocker.patch("json.dump")
-    mocker.patch("pycharmdebug.utils.get_plugin_config", return_value=None)
 
     # Act
-    result = set_debug_port(42)
+    with pytest.raises(PyCharmDebugRuntimeError) as _ex:
+        set_debug_port(42)
 
     # Assert
-    assert result is False
+    assert "Failed to resolve plugin root directory" in str(_ex)
 
 
 def test_find_system_dbg_egg_expects_path_to_egg(mocker):
@@ -373,22 +381,18 @@ def test_get_debug_egg_serialized_data_is_invalid_expects_PyCharmDebugRuntimeErr
 
 
 
-def test_set_debug_egg_expects_path_dumped_and_returns_true(mocker):
+def test_set_debug_egg_expects_path_dumped_and_returns_true(mocker, tmp_path):
     # Arrange
     from pycharmdebug.utils import set_debug_egg
-    mocker.patch("pycharmdebug.utils.get_plugin_config")
-    mocker.patch("builtins.open")
-    mocker.patch("json.load", return_value={})
-    mocker.patch("pathlib.Path.is_file", return_value=True)
-    mocked_dump = mocker.patch("json.dump")
+    plugin_config = _write_plugin_config(mocker, tmp_path, {})
+    egg = _write_egg(tmp_path)
 
     # Act
-    result = set_debug_egg("/foo/bar/pydevd-pycharm.egg")
+    result = set_debug_egg(egg)
 
     # Assert
     assert result is True
-    mocked_dump.assert_called_once_with(
-        {"debug_egg": "/foo/bar/pydevd-pycharm.egg"}, mocker.ANY, indent=4)
+    assert _read_plugin_config(plugin_config) == {"debug_egg": egg}
 
 
 def test_set_debug_egg_invalid_egg_file_expects_raises_PyCharmDebugTypeError(mocker):
@@ -408,77 +412,190 @@ def test_set_debug_egg_invalid_egg_file_expects_raises_PyCharmDebugTypeError(moc
     assert "Invalid egg file" in str(_ex)
 
 
-def test_set_debug_egg_config_doesnt_exist_gets_created_and_value_dumped_returns_true(mocker):
+def test_set_debug_egg_config_doesnt_exist_gets_created_and_value_dumped_returns_true(mocker, tmp_path):
     # Arrange
-    from pycharmdebug.utils import set_debug_egg
-    mocker.patch("builtins.open")
-    mocker.patch("json.load", return_value={})
-    mocker.patch("pathlib.Path.is_file", return_value=True)
-    mocker.patch("pathlib.Path.exists", return_value=False)
-    mocked_path_touch = mocker.patch("pathlib.Path.touch")
-    mocked_dump = mocker.patch("json.dump")
+    from pycharmdebug.utils import set_debug_egg, RELATIVE_CONFIG_PATH
+    mocker.patch(
+        "pycharmdebug.utils.PluginBlueprintLibrary.get_plugin_base_dir",
+        return_value=tmp_path.as_posix()
+    )
+    (tmp_path / "Config").mkdir()
+    plugin_config = tmp_path / RELATIVE_CONFIG_PATH
+    egg = _write_egg(tmp_path)
 
     # Act
-    result = set_debug_egg("/foo/bar/pydevd-pycharm.egg")
+    result = set_debug_egg(egg)
 
     # Assert
     assert result is True
-    mocked_dump.assert_called_once_with(
-        {"debug_egg": "/foo/bar/pydevd-pycharm.egg"}, mocker.ANY, indent=4)
-    mocked_path_touch.assert_called_once()
+    assert _read_plugin_config(plugin_config) == {"debug_egg": egg}
 
 
 
-def test_set_debug_egg_config_has_other_data_expects_other_data_maintained(mocker):
+def test_set_debug_egg_config_has_other_data_expects_other_data_maintained(mocker, tmp_path):
     # Arrange
     from pycharmdebug.utils import set_debug_egg
-    mocker.patch("pycharmdebug.utils.get_plugin_config")
-    mocker.patch("builtins.open")
-    mocker.patch("json.load", return_value={"foo": "bar"})
-    mocker.patch("pathlib.Path.is_file", return_value=True)
-    mocked_dump = mocker.patch("json.dump")
+    plugin_config = _write_plugin_config(mocker, tmp_path, {"foo": "bar"})
+    egg = _write_egg(tmp_path)
 
     # Act
-    result = set_debug_egg("/foo/bar/pydevd-pycharm.egg")
+    result = set_debug_egg(egg)
 
     # Assert
     assert result is True
-    mocked_dump.assert_called_once_with(
-        {
-            "foo": "bar",
-            "debug_egg": "/foo/bar/pydevd-pycharm.egg"
-        },
-        mocker.ANY,
-        indent=4
-    )
+    assert _read_plugin_config(plugin_config) == {"foo": "bar", "debug_egg": egg}
 
 
-def test_set_debug_egg_empty_string_set_expects_empty_string_serialized(mocker):
+def test_set_debug_egg_empty_string_set_expects_empty_string_serialized(mocker, tmp_path):
     # Arrange
     from pycharmdebug.utils import set_debug_egg
-    mocker.patch("pycharmdebug.utils.get_plugin_config")
-    mocker.patch("builtins.open")
-    mocker.patch("json.load", return_value={"debug_egg": "foo"})
-    mocked_dump = mocker.patch("json.dump")
+    plugin_config = _write_plugin_config(mocker, tmp_path, {"debug_egg": "foo"})
 
     # Act
     result = set_debug_egg("")
 
     # Assert
     assert result is True
-    mocked_dump.assert_called_once_with({"debug_egg": ""}, mocker.ANY,indent=4)
+    assert json.loads(plugin_config.read_text(encoding="utf-8"))["debug_egg"] == ""
 
 
-def test_set_debug_egg_no_config_found_expects_PyCharmDebugRuntimeError(mocker):
+def test_set_debug_egg_plugin_root_unresolved_expects_PyCharmDebugRuntimeError(mocker, tmp_path):
     # Arrange
     from pycharmdebug.utils import set_debug_egg
     from pycharmdebug.exceptions import PyCharmDebugRuntimeError
 
-    mocker.patch("pycharmdebug.utils.get_plugin_config", return_value=None)
+    mocker.patch(
+        "unreal.PluginBlueprintLibrary.get_plugin_base_dir", return_value=None
+    )
+
+    # Act
+    with pytest.raises(PyCharmDebugRuntimeError) as _ex:
+        set_debug_egg(_write_egg(tmp_path))
+
+    # Assert
+    assert "Failed to resolve plugin root directory" in str(_ex)
+
+
+def test_update_debug_config_multiple_keys_expects_single_write(mocker, tmp_path):
+    # Arrange
+    from pycharmdebug.utils import update_debug_config
+    plugin_config = _write_plugin_config(mocker, tmp_path, {"foo": "bar"})
+    egg = _write_egg(tmp_path)
+    spy_fsync = mocker.spy(__import__("os"), "fsync")
+
+    # Act
+    result = update_debug_config(port_number=42, debug_egg=egg)
+
+    # Assert
+    assert result is True
+    assert spy_fsync.call_count == 1
+    assert _read_plugin_config(plugin_config).items() >= {
+        "port_number": 42,
+        "debug_egg": egg,
+        "foo": "bar",
+    }.items()
+
+
+def test_update_debug_config_expects_only_changed_keys_written(mocker, tmp_path):
+    # Arrange
+    from pycharmdebug.utils import update_debug_config
+    plugin_config = _write_plugin_config(mocker, tmp_path, {"port_number": 5678})
+
+    # Act
+    update_debug_config(reconnect=True)
+
+    # Assert
+    assert _read_plugin_config(plugin_config) == {"port_number": 5678, "reconnect": True}
+
+
+def test_update_debug_config_unknown_key_expects_raises_PyCharmDebugRuntimeError(mocker, tmp_path):
+    # Arrange
+    from pycharmdebug.utils import update_debug_config
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+    _write_plugin_config(mocker, tmp_path, {})
+
+    # Act
+    with pytest.raises(PyCharmDebugRuntimeError) as _ex:
+        update_debug_config(foo="bar")
+
+    # Assert
+    assert "Unknown config key" in str(_ex)
+
+
+def test_update_debug_config_invalid_value_expects_file_untouched(mocker, tmp_path):
+    # Arrange
+    from pycharmdebug.utils import update_debug_config
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+    plugin_config = _write_plugin_config(mocker, tmp_path, {"port_number": 5678})
+
+    # Act
+    with pytest.raises(PyCharmDebugRuntimeError):
+        update_debug_config(port_number=42, debug_egg="", foo="bar")
+
+    # Assert
+    assert json.loads(plugin_config.read_text(encoding="utf-8")) == {"port_number": 5678}
+
+
+def test_get_debug_port_empty_config_file_expects_fallback_to_default_port(mocker, tmp_path):
+    # Arrange
+    from pycharmdebug.utils import get_debug_port, DEFAULT_PORT_NUMBER
+    plugin_config = tmp_path / "tool_config.json"
+    plugin_config.touch()
+    mocker.patch("pycharmdebug.utils.get_plugin_config", return_value=plugin_config)
+
+    # Act
+    result = get_debug_port()
+
+    # Assert
+    assert result == DEFAULT_PORT_NUMBER
+
+
+def test_get_config_value_missing_key_expects_default(mocker, tmp_path):
+    # Arrange
+    from pycharmdebug.utils import get_config_value, DEFAULT_CONNECT_TIMEOUT
+    _write_plugin_config(mocker, tmp_path, {"port_number": 42})
+
+    # Act
+    result = get_config_value("connect_timeout")
+
+    # Assert
+    assert result == DEFAULT_CONNECT_TIMEOUT
+
+
+def test_get_config_value_unknown_key_expects_raises_PyCharmDebugRuntimeError(mocker, tmp_path):
+    # Arrange
+    from pycharmdebug.utils import get_config_value
+    from pycharmdebug.exceptions import PyCharmDebugRuntimeError
+    _write_plugin_config(mocker, tmp_path, {})
 
     # Act
     with pytest.raises(PyCharmDebugRuntimeError) as _ex:
-        set_debug_egg("foo")
+        get_config_value("foo")
+
+    # Assert
+    assert "Unknown config key" in str(_ex)
+
+
+def test_get_debug_port_port_range_set_expects_leased_port(mocker, tmp_path):
+    # Arrange
+    from pycharmdebug.utils import get_debug_port
+    _write_plugin_config(mocker, tmp_path, {"port_number": 42, "port_range": [6000, 6010]})
+    allocate_port = mocker.patch("pycharmdebug.utils.allocate_port", return_value=6003)
+
+    # Act
+    result = get_debug_port()
 
     # Assert
-    assert "Failed to find or create plugin config" in str(_ex)
+    assert result == 6003
+    allocate_port.assert_called_once_with([6000, 6010])
+
+
+@pytest.mark.parametrize("port_range", [[6010, 6000], [6000], "6000-6010"])
+def test_update_debug_config_invalid_port_range_expects_raises(mocker, tmp_path, port_range):
+    # Arrange
+    from pycharmdebug.utils import update_debug_config
+    _write_plugin_config(mocker, tmp_path, {})
+
+    # Act
+    with pytest.raises((TypeError, RuntimeError)):
+        update_debug_config(port_range=port_range)
@@ -0,0 +1,205 @@
+import threading
+import time
+
+import pytest
+
+
+def _blocking_worker(started, stop):
+    started.set()
+    while stop.is_set() is False:
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def worker():
+    started = threading.Event()
+    stop = threading.Event()
+    thread = threading.Thread(target=_blocking_worker, args=(started, stop))
+    thread.start()
+    started.wait()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+@pytest.fixture
+def on_tick(mock_unreal):
+    def tick(delta_time=0.0):
+        mock_unreal.register_slate_post_tick_callback.call_args[0][0](delta_time)
+    return tick
+
+
+@pytest.fixture
+def watchdog():
+    from pycharmdebug.watchdog import SlowCallWatchdog
+    watchdog = SlowCallWatchdog()
+    yield watchdog
+    watchdog.stop()
+
+
+def test_check_within_threshold_expects_no_stall(watchdog, worker, on_tick):
+    # Arrange
+    watchdog.start(threshold=60.0, thread=worker)
+    on_tick()
+
+    # Act
+    result = watchdog.check()
+
+    # Assert
+    assert result is None
+
+
+def test_check_before_first_tick_expects_no_stall(watchdog, worker):
+    # Arrange
+    watchdog.start(threshold=0.01, thread=worker)
+    time.sleep(0.05)
+
+    # Act
+    result = watchdog.check()
+
+    # Assert
+    assert result is None
+
+
+def test_check_blocked_expects_stack_sampled_once(watchdog, worker, on_tick):
+    # Arrange
+    watchdog.start(threshold=0.01, thread=worker)
+    on_tick()
+    time.sleep(0.05)
+
+    # Act
+    first = watchdog.check()
+    second = watchdog.check()
+
+    # Assert
+    assert first is second
+    assert "_blocking_worker" in "".join(first.stack)
+
+
+def test_check_native_code_expects_no_stall(watchdog, on_tick):
+    # Arrange
+    watchdog.start(threshold=0.01, thread=threading.Thread(target=print))  # no frames
+    on_tick()
+    time.sleep(0.05)
+
+    # Act
+    result = watchdog.check()
+
+    # Assert
+    assert result is None
+
+
+def test_tick_after_stall_expects_stall_reported_with_duration(watchdog, worker, on_tick, mock_unreal):
+    # Arrange
+    from pycharmdebug.metrics import METRICS
+    watchdog.start(threshold=0.01, thread=worker)
+    on_tick()
+    time.sleep(0.05)
+    watchdog.check()
+
+    # Act
+    on_tick(0.05)
+
+    # Assert
+    assert watchdog.stalls == 1
+    message = mock_unreal.log_warning.call_args[0][0]
+    assert "Python blocked the editor main thread for" in message
+    assert "_blocking_worker" in message
+    assert METRICS.last("main_thread_stall").duration >= 0.05
+
+
+def test_stall_past_connect_threshold_expects_connect_called_once_on_tick(watchdog, worker, on_tick, mocker):
+    # Arrange
+    on_connect = mocker.Mock()
+    watchdog.start(
+        threshold=0.01, connect_threshold=0.05, on_connect=on_connect, thread=worker
+    )
+    on_tick()
+    time.sleep(0.1)
+    watchdog.check()
+    during_stall = on_connect.call_count
+
+    # Act
+    on_tick(0.1)
+    on_tick(0.0)
+
+    # Assert
+    assert during_stall == 0
+    on_connect.assert_called_once_with()
+
+
+def test_check_under_connect_threshold_expects_no_connect(watchdog, worker, on_tick, mocker):
+    # Arrange
+    on_connect = mocker.Mock()
+    watchdog.start(
+        threshold=0.01, connect_threshold=60.0, on_connect=on_connect, thread=worker
+    )
+    on_tick()
+    time.sleep(0.05)
+
+    # Act
+    watchdog.check()
+    on_tick()
+
+    # Assert
+    on_connect.assert_not_called()
+
+
+def test_start_stop_expects_tick_registered_and_thread_stopped(watchdog, mock_unreal):
+    # Act
+    watchdog.start(threshold=0.05)
+    running = watchdog.running
+    watchdog.stop()
+
+    # Assert
+    assert running is True
+    assert watchdog.running is False
+    mock_unreal.register_slate_post_tick_callback.assert_called_once()
+    mock_unreal.unregister_slate_post_tick_callback.assert_called_once()
+
+
+def test_install_disabled_expects_not_started(mocker):
+    # Arrange
+    from pycharmdebug.watchdog import WATCHDOG, install
+    mocker.patch("pycharmdebug.utils.get_plugin_config", return_value=None)
+
+    # Act
+    result = install()
+
+    # Assert
+    assert result is False
+    assert WATCHDOG.running is False
+
+
+def test_install_commandlet_expects_not_started_and_settings_not_read(monkeypatch, mocker, mock_unreal):
+    # Arrange
+    from pycharmdebug.watchdog import WATCHDOG, install
+    monkeypatch.setenv("PYCHARMDEBUG_WATCHDOG_ENABLED", "true")
+    mock_unreal.SystemLibrary.get_command_line.return_value = (
+        "Project.uproject -run=ResavePackages -unattended"
+    )
+    get_settings = mocker.patch("pycharmdebug.utils.get_settings")
+
+    # Act
+    result = install()
+
+    # Assert
+    assert result is False
+    assert WATCHDOG.running is False
+    get_settings.assert_not_called()
+
+
+def test_install_enabled_expects_started(monkeypatch, mocker):
+    # Arrange
+    from pycharmdebug.watchdog import WATCHDOG, install
+    monkeypatch.setenv("PYCHARMDEBUG_WATCHDOG_ENABLED", "true")
+    mocker.patch("pycharmdebug.utils.get_plugin_config", return_value=None)
+
+    # Act
+    result = install()
+    running = WATCHDOG.running
+    WATCHDOG.stop()
+
+    # Assert
+    assert result is True
+    assert running is True